@@ -0,0 +1,68 @@
+"""
+Correção de uma carteira sintética de posições a % do CDI (sanida.accrual):
+vetorizada contra o laço dia a dia em Python (este só numa amostra, por
+ser lento).
+
+Uso (a partir da raiz do repositório):
+
+    python benchmarks/bench_accrual.py [--positions 100000] [--sample 200]
+"""
+import os
+import sys
+import time
+import argparse
+import datetime as dt
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from sanida import accrual, holidays  # noqa: E402
+
+
+def main(argv: List[str]) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--positions", type=int, default=100_000)
+    ap.add_argument("--sample", type=int, default=200, help="posições corrigidas pelo laço de referência")
+    args = ap.parse_args(argv)
+
+    rng = np.random.default_rng(1)
+    days = [d.toordinal() for d in holidays.anbima_days(dt.date(2012, 1, 2), dt.date(2025, 7, 1))]
+    t0 = time.perf_counter()
+    curve = accrual.DailyCurve.from_series(days, rng.uniform(2.0, 14.25, len(days)).round(2), annual=True)
+    print(f"curva: {len(curve.dates)} dias úteis em {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+    n = args.positions
+    pct = rng.choice([95.0, 100.0, 102.5, 105.0, 110.0, 120.0], n)
+    start = rng.integers(days[0], days[-1], n)
+    end = np.minimum(start + rng.integers(30, 2000, n), curve.end)
+    principal = rng.uniform(1e3, 1e6, n)
+
+    t0 = time.perf_counter()
+    values = accrual.revalue(curve, principal, pct, start, end)
+    cold = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    accrual.revalue(curve, principal, pct, start, end)
+    warm = time.perf_counter() - t0
+    print(f"vetorizado: {n} posições em {cold * 1000:.1f} ms (prefixos prontos: {warm * 1000:.1f} ms)")
+
+    dates = curve.dates.tolist()
+    daily = curve.daily.tolist()
+    k = min(args.sample, n)
+    t0 = time.perf_counter()
+    worst = 0.0
+    for i in range(k):
+        factor = 1.0
+        for d, r in zip(dates, daily):
+            if start[i] <= d < end[i]:
+                factor *= 1.0 + r * pct[i] / 100.0
+        worst = max(worst, abs(principal[i] * factor / values[i] - 1.0))
+    loop = (time.perf_counter() - t0) / k
+    print(f"laço dia a dia: {loop * 1000:.2f} ms/posição (~{loop * n:.0f} s para a carteira toda)")
+    print(f"maior diferença relativa na amostra: {worst:.2e}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,66 @@
+"""
+Consultas por data (sanida.asof) sobre uma série SGS sintética de dias úteis
+desde 1999, gravada num diretório temporário no formato de sanida.sgs_store.
+
+Uso (a partir da raiz do repositório):
+
+    python benchmarks/bench_asof.py [--lookups 2000000] [--repeat 5]
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import datetime as dt
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from sanida import asof, holidays, sgs_store  # noqa: E402
+
+
+def main(argv: List[str]) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--lookups", type=int, default=2_000_000, help="datas por chamada de as_of_many")
+    ap.add_argument("--single", type=int, default=200_000, help="chamadas de as_of (uma data por vez)")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="sanida-asof-")
+    try:
+        days = list(holidays.business_days(dt.date(1999, 3, 5), dt.date.today()))
+        store = sgs_store.SeriesStore(asof.RATE_SERIES["selic"], workdir)
+        store.append((d, 10.0 + (i % 700) / 100.0) for i, d in enumerate(days))
+
+        t0 = time.perf_counter()
+        index = asof.AsOf(sgs_dir=workdir).series("selic")
+        print(f"pontos: {len(index)}  abrir + índice: {(time.perf_counter() - t0) * 1000:.2f} ms")
+
+        rng = np.random.default_rng(1)
+        lo, hi = days[0].toordinal() - 30, days[-1].toordinal()
+        queries = rng.integers(lo, hi, args.lookups).astype(np.uint32)
+        singles = [dt.date.fromordinal(int(o)) for o in queries[: args.single]]
+
+        best_many = best_single = float("inf")
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            index.as_of_many(queries)
+            best_many = min(best_many, time.perf_counter() - t0)
+
+            t0 = time.perf_counter()
+            for day in singles:
+                index.as_of(day)
+            best_single = min(best_single, time.perf_counter() - t0)
+
+        print(f"as_of_many: {args.lookups} datas em {best_many * 1000:.1f} ms ({best_many / args.lookups * 1e9:.0f} ns/data)")
+        print(f"as_of:      {best_single / len(singles) * 1e6:.2f} us/chamada")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
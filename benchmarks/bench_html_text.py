@@ -0,0 +1,139 @@
+"""
+Compara a extração de texto antiga (BeautifulSoup do documento inteiro +
+get_text + re.sub) com o parser incremental de sanida.html_text, em cópias
+salvas das páginas da Receita e do INSS. Sem cópias salvas, usa as páginas
+sintéticas de benchmarks/standins.py (a partir de dados_fiscais.json), mais
+uma variante com um <article> de barra lateral antes do conteúdo, que força
+o fallback de sanida.fiscais.extract_page para o documento inteiro.
+
+Uso (a partir da raiz do repositório):
+
+    python benchmarks/bench_html_text.py --save           # baixa as páginas do ano
+    python benchmarks/bench_html_text.py [arquivos.html]  # padrão: benchmarks/pages/*.html
+    python benchmarks/bench_html_text.py --synthetic      # só as páginas sintéticas
+"""
+import os
+import sys
+import glob
+import time
+import argparse
+import datetime as dt
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import standins  # noqa: E402
+from sanida import fiscais as scraper  # noqa: E402
+from sanida import html_text  # noqa: E402
+
+
+PAGES_DIR = os.path.join(BENCH_DIR, "pages")
+SIDEBAR = "<article class=\"sidebar\"><h2>Veja também</h2><p>Serviços relacionados</p></article>"
+
+
+def save_pages(year: int) -> None:
+    os.makedirs(PAGES_DIR, exist_ok=True)
+    targets = {
+        f"irrf_{year}.html": f"https://www.gov.br/receitafederal/pt-br/assuntos/meu-imposto-de-renda/tabelas/{year}",
+        f"inss_{year}.html": scraper.find_inss_article_url(year),
+    }
+    for name, url in targets.items():
+        ok, code, html = scraper.fetch(url)
+        if not ok:
+            print(f"falha ao baixar {url} (status={code})")
+            continue
+        with open(os.path.join(PAGES_DIR, name), "w", encoding="utf-8") as f:
+            f.write(html)
+        print(f"salvo {name} ({len(html)} chars)")
+
+
+def synthetic_pages(year: int) -> Dict[str, str]:
+    dados = standins._load("dados_fiscais.json")
+    if not dados:
+        return {}
+    irrf, inss = standins.irrf_html(year, dados), standins.inss_html(year, dados)
+    # barra lateral no começo e menus suficientes para o conteúdo cair depois do
+    # primeiro bloco de FEED_CHUNK: a região de conteúdo achada é a lateral
+    sidebar = SIDEBAR + standins._filler(html_text.FEED_CHUNK // 1024 + 16)
+    return {
+        f"irrf_{year}.html (sint.)": irrf,
+        f"inss_{year}.html (sint.)": inss,
+        f"irrf_{year}.html (lateral)": irrf.replace("<body>", "<body>" + sidebar, 1),
+        f"inss_{year}.html (lateral)": inss.replace("<body>", "<body>" + sidebar, 1),
+    }
+
+
+def extracted_fields(extract: Callable[[Callable[[str], Dict[str, Any]]], Dict[str, Any]]) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    for name, fn in (("irrf", scraper.extract_irrf), ("inss", scraper.extract_inss)):
+        try:
+            out[name] = extract(fn)
+        except RuntimeError as e:
+            out[name] = f"erro: {e}"
+    return out
+
+
+def measure(fn: Callable[[str], str], html: str, repeat: int) -> Tuple[float, int, str]:
+    text = fn(html)
+
+    tracemalloc.start()
+    fn(html)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(html)
+        best = min(best, time.perf_counter() - t0)
+
+    return best, peak, text
+
+
+def main(argv: List[str]) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("files", nargs="*")
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--save", action="store_true", help="baixa e salva as páginas do ano em benchmarks/pages/")
+    ap.add_argument("--synthetic", action="store_true", help="ignora benchmarks/pages/ e usa as páginas sintéticas")
+    ap.add_argument("--year", type=int, default=dt.datetime.now(dt.timezone.utc).year)
+    args = ap.parse_args(argv)
+
+    if args.save:
+        save_pages(args.year)
+        return 0
+
+    pages: Dict[str, str] = {}
+    files = [] if args.synthetic else (args.files or sorted(glob.glob(os.path.join(PAGES_DIR, "*.html"))))
+    for path in files:
+        with open(path, "r", encoding="utf-8") as f:
+            pages[os.path.basename(path)] = f.read()
+    if not pages:
+        pages = synthetic_pages(args.year)
+    if not pages:
+        print("nenhuma página salva nem dados_fiscais.json para as sintéticas")
+        return 1
+
+    differ = 0
+    print(f"{'arquivo':<28} {'caminho':<6} {'tempo (ms)':>11} {'pico (KiB)':>11} {'texto':>8}")
+    for name, html in pages.items():
+        t_old, m_old, text_old = measure(scraper.page_text_bs4, html, args.repeat)
+        t_new, m_new, text_new = measure(html_text.extract_text, html, args.repeat)
+
+        print(f"{name:<28} {'bs4':<6} {t_old * 1000:>11.2f} {m_old / 1024:>11.0f} {len(text_old):>8}")
+        print(f"{'':<28} {'fast':<6} {t_new * 1000:>11.2f} {m_new / 1024:>11.0f} {len(text_new):>8}")
+
+        # o caminho novo como o coletor usa: região de conteúdo e, se falhar, o documento inteiro
+        same = extracted_fields(lambda fn: fn(text_old)) == extracted_fields(lambda fn: scraper.extract_page(html, fn))
+        differ += not same
+        print(f"{'':<28} speedup {t_old / t_new:.1f}x, memória {m_old / max(m_new, 1):.1f}x, "
+              f"mesmos campos extraídos: {'sim' if same else 'NÃO'}")
+
+    return 1 if differ else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,132 @@
+"""
+Tempo de importação/partida, medido com `python -X importtime` em processos
+novos: o que cada ponto de entrada (CLI e módulos usados por consumidores)
+importa e quanto isso custa, descontado o interpretador vazio.
+
+Uso (a partir da raiz do repositório):
+
+    python benchmarks/bench_import.py [--repeat 15] [--top 8]
+        [--json resultado.json] [--baseline anterior.json]
+
+A coluna "pesados" mostra quais dependências caras (requests, bs4, ftplib,
+numpy) cada alvo acabou carregando.
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from typing import Any, Dict, List, Optional, Tuple
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+
+HEAVY = ("requests", "bs4", "ftplib", "numpy")
+
+TARGETS: Dict[str, List[str]] = {
+    "python (vazio)": ["-c", "pass"],
+    "sanida.tables": ["-c", "import sanida.tables"],
+    "sanida.calc": ["-c", "import sanida.calc"],
+    "sanida.taxas": ["-c", "import sanida.taxas"],
+    "sanida.fiscais": ["-c", "import sanida.fiscais"],
+    "cli --help": ["-m", "sanida", "--help"],
+    "cli validate": ["-m", "sanida", "validate"],
+}
+
+
+def parse_importtime(stderr: str) -> Tuple[float, Dict[str, float]]:
+    """
+    Total (soma dos cumulativos de nível superior, ms) e cumulativo por módulo.
+    """
+    total = 0.0
+    modules: Dict[str, float] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue  # cabeçalho
+        ms = int(cumulative) / 1000.0
+        modules[name.strip()] = ms
+        if not name.startswith("  "):
+            total += ms
+    return total, modules
+
+
+def measure(args: List[str], repeat: int) -> Tuple[List[float], Dict[str, float]]:
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    totals: List[float] = []
+    modules: Dict[str, float] = {}
+    for _ in range(repeat):
+        r = subprocess.run(
+            [sys.executable, "-X", "importtime"] + args,
+            cwd=ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        total, modules = parse_importtime(r.stderr)
+        totals.append(total)
+    return totals, modules
+
+
+def main(argv: List[str]) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--repeat", type=int, default=15)
+    ap.add_argument("--top", type=int, default=0, help="lista os N módulos mais caros de cada alvo")
+    ap.add_argument("--json", help="grava os resultados neste arquivo")
+    ap.add_argument("--baseline", help="JSON de uma rodada anterior para comparar a mediana")
+    args = ap.parse_args(argv)
+
+    baseline: Dict[str, Any] = {}
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f).get("results", {})
+
+    # uma rodada de aquecimento: bytecode em __pycache__ e cache de disco
+    for target in TARGETS.values():
+        measure(target, 1)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    empty: Optional[float] = None
+    print(f"{'alvo':<16} {'mediana':>9} {'mín':>9} {'líquido':>9}  {'pesados':<28} vs base")
+    for name, target in TARGETS.items():
+        totals, modules = measure(target, args.repeat)
+        median = statistics.median(totals)
+        if empty is None:
+            empty = median
+        heavy = [h for h in HEAVY if h in modules]
+        r = {
+            "median_ms": median,
+            "min_ms": min(totals),
+            "net_ms": max(median - empty, 0.0),
+            "heavy": heavy,
+            "top": sorted(modules.items(), key=lambda kv: -kv[1])[: max(args.top, 0)],
+        }
+        results[name] = r
+
+        delta = ""
+        base: Optional[Dict[str, Any]] = baseline.get(name)
+        if base and base.get("median_ms"):
+            delta = f"{(median / base['median_ms'] - 1) * 100:+.1f}%"
+        print(
+            f"{name:<16} {median:>9.1f} {min(totals):>9.1f} {r['net_ms']:>9.1f}  "
+            f"{','.join(heavy) or '-':<28} {delta}"
+        )
+        for mod, ms in r["top"]:
+            print(f"{'':<16}   {ms:>8.1f} ms  {mod.strip()}")
+
+    if args.json:
+        out = {
+            "settings": {k: v for k, v in vars(args).items() if k not in ("json", "baseline")},
+            "results": results,
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(out, f, indent=2, ensure_ascii=False)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
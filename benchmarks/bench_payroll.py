@@ -0,0 +1,67 @@
+"""
+Vazão de `python -m sanida folha` (sanida.payroll) num CSV sintético, para
+várias combinações de workers e tamanho de bloco.
+
+Uso (a partir da raiz do repositório):
+
+    python benchmarks/bench_payroll.py [--rows 2000000] [--workers 1,2,4]
+        [--chunks 20000,50000,200000] [--dados dados_fiscais.json]
+
+Entrada e saída ficam num diretório temporário.
+"""
+import os
+import sys
+import random
+import shutil
+import argparse
+import tempfile
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sanida import payroll  # noqa: E402
+from sanida.common import read_json  # noqa: E402
+
+
+def _ints(text: str) -> List[int]:
+    return [int(v) for v in text.split(",") if v.strip()]
+
+
+def main(argv: List[str]) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rows", type=int, default=2_000_000)
+    ap.add_argument("--workers", default=f"1,{os.cpu_count() or 1}")
+    ap.add_argument("--chunks", default="20000,50000,200000")
+    ap.add_argument("--dados", default=payroll.DADOS_FILE)
+    args = ap.parse_args(argv)
+
+    dados = read_json(args.dados)
+    if not isinstance(dados, dict):
+        print(f"ERRO: {args.dados} ausente")
+        return 1
+
+    workdir = tempfile.mkdtemp(prefix="sanida-folha-")
+    try:
+        src_path = os.path.join(workdir, "folha.csv")
+        rng = random.Random(1)
+        with open(src_path, "w", encoding="utf-8") as f:
+            f.write("matricula,salario,dependentes\n")
+            for i in range(args.rows):
+                f.write(f"{i},{rng.uniform(1000, 40000):.2f},{rng.randint(0, 3)}\n")
+        print(f"entrada: {args.rows} linhas, {os.path.getsize(src_path) / 1e6:.1f} MB")
+
+        print(f"{'workers':>7} {'bloco':>8} {'s':>8} {'linhas/s':>12}")
+        for workers in sorted(set(_ints(args.workers))):
+            for chunk in _ints(args.chunks):
+                with open(src_path, "r", encoding="utf-8") as src, open(
+                    os.path.join(workdir, "saida.csv"), "w", encoding="utf-8", newline=""
+                ) as dst:
+                    stats = payroll.run(src, dst, dados, workers=workers, chunk_rows=chunk)
+                print(f"{stats['workers']:>7} {chunk:>8} {stats['seconds']:>8.2f} {stats['rows_per_s'] or 0:>12,}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
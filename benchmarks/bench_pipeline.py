@@ -0,0 +1,183 @@
+"""
+Benchmark de ponta a ponta, sem rede: sobe os stand-ins de benchmarks/standins.py
+(HTTP para gov.br/SGS/raw GitHub e FTP para /MediaCDI), aponta scraper.py e
+update_taxas.py para eles e mede cada etapa N vezes, reportando percentis.
+
+Uso (a partir da raiz do repositório):
+
+    python benchmarks/bench_pipeline.py [--repeat 20] [--latency-ms 40]
+        [--error-rate 0.05] [--missing-rate 0.0] [--missing-cdi-days 2]
+        [--json resultado.json] [--baseline anterior.json]
+
+As escritas (dados_fiscais.json, taxas_bacen.json, caches, histórico SGS)
+acontecem num diretório temporário; os arquivos do repositório não são tocados.
+"""
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import contextlib
+from typing import Any, Callable, Dict, List, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCH_DIR)
+
+import standins  # noqa: E402
+from sanida import policy  # noqa: E402
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    if not sorted_values:
+        return float("nan")
+    k = max(0, min(len(sorted_values) - 1, int(round(p / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[k]
+
+
+def run_case(fn: Callable[[], Any], repeat: int, warmup: int, counter: standins.Counter) -> Dict[str, Any]:
+    for _ in range(warmup):
+        policy.start_run()
+        with contextlib.redirect_stdout(io.StringIO()):
+            try:
+                fn()
+            except Exception:
+                pass
+
+    before = counter.snapshot()
+    times: List[float] = []
+    errors: List[str] = []
+    for _ in range(repeat):
+        # prazo e disjuntores novos a cada chamada, como numa execução nova
+        policy.start_run()
+        t0 = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                fn()
+        except Exception as e:
+            errors.append(f"{type(e).__name__}: {e}")
+        times.append((time.perf_counter() - t0) * 1000.0)
+    after = counter.snapshot()
+
+    times.sort()
+    requests_made = sum(after.get(k, 0) - before.get(k, 0) for k in after)
+    return {
+        "n": len(times),
+        "p50_ms": percentile(times, 50),
+        "p90_ms": percentile(times, 90),
+        "p99_ms": percentile(times, 99),
+        "max_ms": times[-1],
+        "mean_ms": sum(times) / len(times),
+        "requests_per_call": requests_made / max(repeat, 1),
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+    }
+
+
+def main(argv: List[str]) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--warmup", type=int, default=1)
+    ap.add_argument("--latency-ms", type=float, default=0.0, help="atraso por resposta/comando nos stand-ins")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="fração de respostas 5xx (HTTP) / 451 (FTP RETR)")
+    ap.add_argument("--missing-rate", type=float, default=0.0, help="fração de páginas/dados respondidos com 404")
+    ap.add_argument("--missing-cdi-days", type=int, default=0, help="dias úteis mais recentes sem arquivo em /MediaCDI")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--cases", help="lista separada por vírgulas; padrão: todas")
+    ap.add_argument("--json", help="grava os resultados neste arquivo")
+    ap.add_argument("--baseline", help="JSON de uma rodada anterior para comparar o p50")
+    args = ap.parse_args(argv)
+
+    fixtures = standins.Fixtures()
+    faults = standins.Faults(args.latency_ms, args.error_rate, args.missing_rate, args.seed)
+    counter = standins.Counter()
+    http_server = standins.start_http(fixtures, faults, counter)
+    ftp_server = standins.start_ftp(fixtures, faults, counter, missing_days=args.missing_cdi_days)
+
+    workdir = tempfile.mkdtemp(prefix="sanida-bench-")
+    os.environ.update(standins.environment(http_server, ftp_server))
+    os.environ.update(
+        {
+            "SFA_HTTP_CACHE": "0",
+            "SFA_CACHE_DIR": os.path.join(workdir, ".cache"),
+            "SFA_SGS_DIR": os.path.join(workdir, "historico", "sgs"),
+            "SFA_FISCAIS_DIR": os.path.join(workdir, "historico", "fiscais"),
+        }
+    )
+    cwd = os.getcwd()
+    os.chdir(workdir)
+
+    # só agora: os módulos leem o ambiente na importação
+    from sanida import b3_cdi
+    from sanida import fiscais as scraper
+    from sanida import taxas as update_taxas
+
+    year = fixtures.today.year
+
+    def load_taxas_remote() -> Any:
+        # sem arquivo local, load_taxas_payload vai ao raw GitHub (stand-in)
+        if os.path.exists(scraper.TAXAS_FILE_LOCAL):
+            os.remove(scraper.TAXAS_FILE_LOCAL)
+        return scraper.load_taxas_payload()
+
+    cases: Dict[str, Callable[[], Any]] = {
+        "parse_irrf_receita": lambda: scraper.parse_irrf_receita(year),
+        "parse_inss_gov": lambda: scraper.parse_inss_gov(year),
+        "fetch_b3_cdi_ftp": b3_cdi.fetch_b3_cdi_ftp,
+        "load_taxas_payload": load_taxas_remote,
+        "update_taxas.main": lambda: update_taxas.main([]),
+        "scraper.main": lambda: scraper.main([]),
+    }
+    if args.cases:
+        wanted = [c.strip() for c in args.cases.split(",") if c.strip()]
+        unknown = [c for c in wanted if c not in cases]
+        if unknown:
+            print(f"casos desconhecidos: {unknown}; disponíveis: {list(cases)}")
+            return 2
+        cases = {c: cases[c] for c in wanted}
+
+    baseline: Dict[str, Any] = {}
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f).get("results", {})
+
+    results: Dict[str, Dict[str, Any]] = {}
+    try:
+        print(f"{'caso':<20} {'p50':>9} {'p90':>9} {'p99':>9} {'máx':>9} {'req/run':>8} {'erros':>6}  vs base")
+        for name, fn in cases.items():
+            r = run_case(fn, args.repeat, args.warmup, counter)
+            results[name] = r
+
+            delta = ""
+            base: Optional[Dict[str, Any]] = baseline.get(name)
+            if base and base.get("p50_ms"):
+                delta = f"{(r['p50_ms'] / base['p50_ms'] - 1) * 100:+.1f}%"
+            print(
+                f"{name:<20} {r['p50_ms']:>9.2f} {r['p90_ms']:>9.2f} {r['p99_ms']:>9.2f} {r['max_ms']:>9.2f} "
+                f"{r['requests_per_call']:>8.1f} {r['errors']:>6}  {delta}"
+            )
+            if r["first_error"]:
+                print(f"{'':<20} primeiro erro: {r['first_error'][:160]}")
+    finally:
+        os.chdir(cwd)
+        http_server.shutdown()
+        ftp_server.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json:
+        out = {
+            "settings": {k: v for k, v in vars(args).items() if k not in ("json", "baseline")},
+            "results": results,
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(out, f, indent=2, ensure_ascii=False)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
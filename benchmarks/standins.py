@@ -0,0 +1,482 @@
+"""
+Servidores locais que fazem o papel de gov.br (Receita e INSS), api.bcb.gov.br
+(SGS), raw.githubusercontent.com (taxas_bacen.json) e ftp.cetip.com.br
+(/MediaCDI), para medir o pipeline sem rede.
+
+As respostas vêm de cópias gravadas quando existem (benchmarks/pages/irrf_<ano>.html
+e inss_<ano>.html, salvas por bench_html_text.py --save) e, na falta delas, de
+páginas sintéticas montadas a partir de dados_fiscais.json / taxas_bacen.json,
+no mesmo formato de texto que as regexes do scraper esperam.
+
+`Faults` injeta latência, respostas 5xx e arquivos/páginas ausentes, com um
+gerador aleatório semeado para que duas rodadas sejam comparáveis.
+"""
+import os
+import re
+import json
+import time
+import random
+import socket
+import threading
+import socketserver
+import datetime as dt
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pages")
+
+# Hosts reais atendidos pelo servidor HTTP local (via SFA_HOST_OVERRIDES).
+HTTP_HOSTS = [
+    "https://www.gov.br",
+    "https://api.bcb.gov.br",
+    "https://raw.githubusercontent.com",
+]
+
+
+class Faults:
+    def __init__(self, latency_ms: float = 0.0, error_rate: float = 0.0, missing_rate: float = 0.0, seed: int = 1) -> None:
+        self.latency = max(latency_ms, 0.0) / 1000.0
+        self.error_rate = error_rate
+        self.missing_rate = missing_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _roll(self, rate: float) -> bool:
+        if rate <= 0:
+            return False
+        with self._lock:
+            return self._rng.random() < rate
+
+    def delay(self) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+
+    def error(self) -> bool:
+        return self._roll(self.error_rate)
+
+    def missing(self) -> bool:
+        return self._roll(self.missing_rate)
+
+
+class Counter:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = {}
+
+    def add(self, key: str) -> None:
+        with self._lock:
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counts)
+
+
+# ----------------------------------------------------------------------------
+# Fixtures
+
+
+def _money(v: float) -> str:
+    return f"{v:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
+
+
+def _pct(rate: float) -> str:
+    return f"{rate * 100:g}".replace(".", ",") + "%"
+
+
+def _load(name: str) -> Dict[str, Any]:
+    try:
+        with open(os.path.join(ROOT, name), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _filler(kb: int) -> str:
+    """
+    Cabeçalho, menus e scripts fora da região de conteúdo, para que a página
+    sintética tenha um tamanho parecido com o das páginas reais do gov.br.
+    """
+    item = '<li class="nav-item"><a href="https://www.gov.br/pt-br/servicos/{i}">Serviço {i}</a></li>'
+    nav = "".join(item.format(i=i) for i in range(kb * 8))
+    script = "<script>var govbr = {};" + ("govbr.x = (govbr.x || 0) + 1;" * (kb * 8)) + "</script>"
+    return f"<header><nav><ul>{nav}</ul></nav></header>{script}"
+
+
+def _page(title: str, body: str) -> str:
+    return (
+        f"<!DOCTYPE html><html lang=\"pt-br\"><head><title>{title}</title></head><body>"
+        f"{_filler(60)}<div id=\"content-core\"><h1>{title}</h1>{body}</div>"
+        f"<footer>{_filler(20)}</footer></body></html>"
+    )
+
+
+def irrf_html(year: int, dados: Dict[str, Any]) -> str:
+    irrf = dados.get("irrf") or {}
+    rows: List[str] = []
+    lower = 0.0
+    for i, row in enumerate(irrf.get("tabela") or []):
+        lim, rate, ded = row["limite"], row["aliquota"], row["deducao"]
+        if i == 0:
+            rows.append(f"<tr><td>Até R$ {_money(lim)}</td><td>-</td><td>-</td></tr>")
+        elif lim >= 1e9:
+            rows.append(f"<tr><td>Acima de R$ {_money(lower)}</td><td>{_pct(rate)}</td><td>R$ {_money(ded)}</td></tr>")
+        else:
+            rows.append(
+                f"<tr><td>De R$ {_money(lower + 0.01)} até R$ {_money(lim)}</td>"
+                f"<td>{_pct(rate)}</td><td>R$ {_money(ded)}</td></tr>"
+            )
+        lower = lim
+
+    red = irrf.get("reducao_mensal") or {}
+    reducao = ""
+    if red.get("max_reducao_ate_5000") is not None:
+        reducao += f"<tr><td>até R$ 5.000,00</td><td>até R$ {_money(red['max_reducao_ate_5000'])}</td></tr>"
+    if red.get("a") is not None and red.get("b") is not None:
+        b = f"{red['b']:.6f}".replace(".", ",")
+        reducao += (
+            f"<tr><td>de R$ 5.000,01 até R$ {_money(red.get('reduz_ate') or 7350)}</td>"
+            f"<td>R$ {_money(red['a'])} - ({b} x rendimentos tributáveis)</td></tr>"
+        )
+
+    body = (
+        f"<h2>Tabela de incidência mensal {year}</h2>"
+        "<table><tr><th>Base de cálculo</th><th>Alíquota</th><th>Parcela a deduzir</th></tr>"
+        + "".join(rows)
+        + "</table>"
+        f"<p>Dedução mensal por dependente: R$ {_money(dados.get('dep') or 0)}</p>"
+        f"<p>Limite mensal de desconto simplificado: R$ {_money(irrf.get('simplificado') or 0)}</p>"
+        f"<table>{reducao}</table>"
+    )
+    return _page(f"Tabelas {year}", body)
+
+
+def inss_html(year: int, dados: Dict[str, Any]) -> str:
+    items: List[str] = []
+    tabela = dados.get("inss") or []
+    lower = 0.0
+    for i, row in enumerate(tabela):
+        lim, rate = row["limite"], row["aliquota"]
+        if i == 0:
+            items.append(f"<li>{_pct(rate)} para quem ganha até R$ {_money(lim)};</li>")
+        elif i == len(tabela) - 1:
+            items.append(f"<li>{_pct(rate)} para quem ganha de R$ {_money(lower + 0.01)} até R$ {_money(lim)}.</li>")
+        else:
+            items.append(f"<li>{_pct(rate)} para quem ganha entre R$ {_money(lower + 0.01)} e R$ {_money(lim)};</li>")
+        lower = lim
+    body = f"<p>As alíquotas de contribuição em {year} ficam assim:</p><ul>{''.join(items)}</ul>"
+    return _page(f"Teto do INSS em {year}", body)
+
+
+def _recorded(name: str) -> Optional[str]:
+    path = os.path.join(PAGES_DIR, name)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+class Fixtures:
+    """
+    Conteúdo servido pelos stand-ins. SGS: um valor fixo por série, repetido
+    em todo dia útil de qualquer janela pedida.
+    """
+
+    def __init__(self, today: Optional[dt.date] = None) -> None:
+        self.today = today or dt.datetime.now(dt.timezone.utc).date()
+        self.dados = _load("dados_fiscais.json")
+        self.taxas_doc = _load("taxas_bacen.json")
+        taxas = self.taxas_doc.get("taxas") or {}
+        self.sgs_values = {
+            432: taxas.get("selic", 15.0),
+            11: taxas.get("selic_diaria", 0.055131),
+            12: taxas.get("cdi_diario", 0.055131),
+            1178: taxas.get("selic_aa", 14.9),
+            4389: taxas.get("cdi_aa", 14.9),
+            433: taxas.get("ipca_mensal", 0.48),
+            13522: taxas.get("ipca_12m", 4.8),
+        }
+        self.cdi = float(taxas.get("cdi", 14.9))
+        self._pages: Dict[Tuple[str, int], str] = {}
+        self._lock = threading.Lock()
+
+    def page(self, kind: str, year: int) -> str:
+        key = (kind, year)
+        with self._lock:
+            html = self._pages.get(key)
+        if html is None:
+            html = _recorded(f"{kind}_{year}.html")
+            if html is None:
+                html = irrf_html(year, self.dados) if kind == "irrf" else inss_html(year, self.dados)
+            with self._lock:
+                self._pages[key] = html
+        return html
+
+    def sgs_last(self, code: int) -> List[Dict[str, str]]:
+        day = self.today - dt.timedelta(days=1)
+        while day.weekday() >= 5:
+            day -= dt.timedelta(days=1)
+        return [{"data": day.strftime("%d/%m/%Y"), "valor": str(self.sgs_values.get(code, 1.0))}]
+
+    def sgs_window(self, code: int, start: dt.date, end: dt.date) -> List[Dict[str, str]]:
+        end = min(end, self.today)
+        value = str(self.sgs_values.get(code, 1.0))
+        out: List[Dict[str, str]] = []
+        day = start
+        while day <= end:
+            if day.weekday() < 5:
+                out.append({"data": day.strftime("%d/%m/%Y"), "valor": value})
+            day += dt.timedelta(days=1)
+        return out
+
+    def cdi_files(self, days: int = 15, missing_days: int = 0) -> Dict[str, bytes]:
+        """
+        YYYYMMDD.txt dos dias úteis da janela; os `missing_days` mais recentes
+        ficam de fora (arquivo do dia ainda não publicado).
+        """
+        files: Dict[str, bytes] = {}
+        raw = f"{int(round(self.cdi * 100)):09d}\r\n".encode("ascii")
+        skipped = 0
+        for back in range(days):
+            day = self.today - dt.timedelta(days=back)
+            if day.weekday() >= 5:
+                continue
+            if skipped < missing_days:
+                skipped += 1
+                continue
+            files[day.strftime("%Y%m%d") + ".txt"] = raw
+        return files
+
+
+# ----------------------------------------------------------------------------
+# HTTP
+
+
+_SGS_PATH = re.compile(r"^/dados/serie/bcdata\.sgs\.(\d+)/dados(/ultimos/1)?$")
+_YEAR = re.compile(r"(19|20)\d\d")
+
+
+def _year_in(text: str, default: int) -> int:
+    m = _YEAR.search(text)
+    return int(m.group(0)) if m else default
+
+
+class StandinHTTPHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # cabeçalho e corpo saem em writes separados; sem isso o ACK atrasado do
+    # cliente soma ~40 ms a cada resposta e domina a medição
+    disable_nagle_algorithm = True
+    fixtures: Fixtures
+    faults: Faults
+    counter: Counter
+
+    def _reply(self, code: int, body: bytes, content_type: str = "text/html; charset=utf-8") -> None:
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _route(self, path: str, query: Dict[str, List[str]]) -> Tuple[str, Optional[bytes], str]:
+        fx = self.fixtures
+        year = fx.today.year
+
+        if path.startswith("/receitafederal/pt-br/assuntos/meu-imposto-de-renda/tabelas/"):
+            return "irrf", fx.page("irrf", _year_in(path, year)).encode("utf-8"), "text/html; charset=utf-8"
+
+        if path == "/inss/@@search":
+            y = _year_in(" ".join(query.get("SearchableText", [])), year)
+            link = f"https://www.gov.br/inss/pt-br/assuntos/teto-do-inss-em-{y}"
+            body = f'<html><body><ul class="searchResults"><li><a href="{link}">Teto do INSS {y}</a></li></ul></body></html>'
+            return "inss_search", body.encode("utf-8"), "text/html; charset=utf-8"
+
+        if path.startswith("/inss/pt-br/"):
+            return "inss", fx.page("inss", _year_in(path, year)).encode("utf-8"), "text/html; charset=utf-8"
+
+        m = _SGS_PATH.match(path)
+        if m:
+            code = int(m.group(1))
+            if m.group(2):
+                data = fx.sgs_last(code)
+            else:
+                start = dt.datetime.strptime(query["dataInicial"][0], "%d/%m/%Y").date()
+                end = dt.datetime.strptime(query["dataFinal"][0], "%d/%m/%Y").date()
+                data = fx.sgs_window(code, start, end)
+                if not data:
+                    # o SGS responde 404 para janelas sem nenhum ponto
+                    return "sgs", None, "application/json"
+            return "sgs", json.dumps(data).encode("utf-8"), "application/json"
+
+        if path.endswith("/taxas_bacen.json"):
+            return "taxas_json", json.dumps(fx.taxas_doc).encode("utf-8"), "application/json"
+
+        return "other", None, "text/plain"
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        route, body, content_type = self._route(unquote(parts.path), parse_qs(parts.query))
+        self.counter.add(route)
+
+        self.faults.delay()
+        if self.faults.error():
+            self._reply(503, b"Service Unavailable", "text/plain")
+            return
+        if body is None or (route != "inss_search" and self.faults.missing()):
+            self._reply(404, b"Not Found", "text/plain")
+            return
+        self._reply(200, body, content_type)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_http(fixtures: Fixtures, faults: Faults, counter: Counter) -> ThreadingHTTPServer:
+    handler = type(
+        "Handler",
+        (StandinHTTPHandler,),
+        {"fixtures": fixtures, "faults": faults, "counter": counter},
+    )
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="standin-http", daemon=True).start()
+    return server
+
+
+# ----------------------------------------------------------------------------
+# FTP (só o necessário para ftplib: login anônimo, CWD, PASV, MLSD/NLST, RETR)
+
+
+class StandinFTPHandler(socketserver.StreamRequestHandler):
+    disable_nagle_algorithm = True
+    tree: Dict[str, Dict[str, bytes]]
+    faults: Faults
+    counter: Counter
+
+    def _send(self, line: str) -> None:
+        self.wfile.write((line + "\r\n").encode("latin-1"))
+
+    def _open_pasv(self) -> socket.socket:
+        if self._data is not None:
+            self._data.close()
+        self._data = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._data.bind(("127.0.0.1", 0))
+        self._data.listen(1)
+        self._data.settimeout(10)
+        return self._data
+
+    def _transfer(self, payload: bytes) -> None:
+        if self._data is None:
+            self._send("425 Use PASV first")
+            return
+        self._send("150 Opening data connection")
+        conn, _ = self._data.accept()
+        with conn:
+            conn.sendall(payload)
+        self._data.close()
+        self._data = None
+        self._send("226 Transfer complete")
+
+    def _dir(self, arg: str) -> Optional[str]:
+        path = arg.strip() or self._cwd
+        if not path.startswith("/"):
+            path = self._cwd.rstrip("/") + "/" + path
+        path = "/" + path.strip("/")
+        return path if path in self.tree else None
+
+    def handle(self):
+        self._cwd = "/"
+        self._data: Optional[socket.socket] = None
+        self.counter.add("ftp_session")
+        self._send("220 stand-in FTP")
+
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                break
+            line = raw.decode("latin-1").rstrip("\r\n")
+            cmd, _, arg = line.partition(" ")
+            cmd = cmd.upper()
+            self.counter.add(f"ftp_{cmd.lower()}")
+            self.faults.delay()
+
+            if cmd == "USER":
+                self._send("331 Password required")
+            elif cmd == "PASS":
+                self._send("230 Logged in")
+            elif cmd in ("SYST",):
+                self._send("215 UNIX Type: L8")
+            elif cmd in ("TYPE", "OPTS", "NOOP", "MODE", "STRU"):
+                self._send("200 OK")
+            elif cmd == "PWD":
+                self._send(f'257 "{self._cwd}"')
+            elif cmd == "CWD":
+                path = self._dir(arg)
+                if path is None:
+                    self._send("550 No such directory")
+                else:
+                    self._cwd = path
+                    self._send("250 OK")
+            elif cmd == "PASV":
+                port = self._open_pasv().getsockname()[1]
+                self._send(f"227 Entering Passive Mode (127,0,0,1,{port >> 8},{port & 0xFF})")
+            elif cmd == "EPSV":
+                port = self._open_pasv().getsockname()[1]
+                self._send(f"229 Entering Extended Passive Mode (|||{port}|)")
+            elif cmd in ("MLSD", "NLST", "LIST"):
+                path = self._dir(arg)
+                if path is None:
+                    self._send("550 No such directory")
+                    continue
+                names = sorted(self.tree[path])
+                if cmd == "MLSD":
+                    listing = "".join(f"type=file;size={len(self.tree[path][n])}; {n}\r\n" for n in names)
+                else:
+                    listing = "".join(f"{n}\r\n" for n in names)
+                self._transfer(listing.encode("latin-1"))
+            elif cmd == "RETR":
+                name = arg.strip().rsplit("/", 1)[-1]
+                files = self.tree.get(self._cwd, {})
+                if self.faults.error():
+                    self._send("451 Requested action aborted: local error")
+                elif name not in files:
+                    self._send("550 File not found")
+                else:
+                    self._transfer(files[name])
+            elif cmd == "QUIT":
+                self._send("221 Bye")
+                break
+            else:
+                self._send("502 Command not implemented")
+
+        if self._data is not None:
+            self._data.close()
+
+
+class _ThreadingTCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def start_ftp(fixtures: Fixtures, faults: Faults, counter: Counter, missing_days: int = 0) -> socketserver.TCPServer:
+    tree = {"/": {}, "/MediaCDI": fixtures.cdi_files(missing_days=missing_days)}
+    handler = type("Handler", (StandinFTPHandler,), {"tree": tree, "faults": faults, "counter": counter})
+    server = _ThreadingTCPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, name="standin-ftp", daemon=True).start()
+    return server
+
+
+def environment(http_server: ThreadingHTTPServer, ftp_server: socketserver.TCPServer) -> Dict[str, str]:
+    """
+    Variáveis SFA_* que apontam scraper.py e update_taxas.py para os stand-ins.
+    Precisam estar no ambiente antes de importar os módulos.
+    """
+    http_base = f"http://127.0.0.1:{http_server.server_address[1]}"
+    return {
+        "SFA_HOST_OVERRIDES": ",".join(f"{host}={http_base}" for host in HTTP_HOSTS),
+        "SFA_B3_FTP_HOST": "127.0.0.1",
+        "SFA_B3_FTP_PORT": str(ftp_server.server_address[1]),
+    }
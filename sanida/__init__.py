@@ -0,0 +1,6 @@
+"""
+Coletores e utilitários de dados_fiscais.json (sanida.fiscais) e
+taxas_bacen.json (sanida.taxas); linha de comando em `python -m sanida`.
+Os módulos pesados (requests, bs4, ftplib, numpy) só são importados por quem
+os usa.
+"""
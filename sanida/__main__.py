@@ -0,0 +1,139 @@
+"""
+Ponto de entrada único:
+
+    python -m sanida taxas   [--daemon]                 atualiza taxas_bacen.json
+    python -m sanida fiscais [--anos 2024-2026] [--daemon]  atualiza dados_fiscais.json
+    python -m sanida all                                 taxas e depois fiscais
+    python -m sanida validate [arquivo.json ...]          valida os JSON publicados
+    python -m sanida history <documento> [--since N | --version N]  delta/versão do histórico
+    python -m sanida folha entrada.csv saida.csv [--workers N]  INSS/IRRF de um CSV de folha
+    python -m sanida serve [--host H] [--port N] [--dir .]  serve os JSON por HTTP (só leitura)
+
+Cada subcomando importa só o que usa: `validate` não carrega requests, bs4 nem
+ftplib; `taxas` não carrega bs4; ftplib só entra quando o CDI é buscado;
+`folha` carrega só numpy e as tabelas; `serve` só a biblioteca padrão.
+"""
+import os
+import sys
+import glob
+from typing import Any, Dict, List, Optional, Tuple
+
+USAGE = __doc__.strip().splitlines()[2:9]
+COMMANDS = ("taxas", "fiscais", "all", "validate", "history", "folha", "serve")
+
+
+def _usage() -> str:
+    return "uso:\n" + "\n".join(USAGE)
+
+
+def validate_file(path: str) -> Tuple[bool, List[str]]:
+    """
+    Valida um documento publicado pelo tipo que ele tem: taxas_bacen.json
+    (sem "irrf"), dados_fiscais.json ou um ano de historico/fiscais/.
+    """
+    from sanida.common import read_json
+
+    doc = read_json(path)
+    if not isinstance(doc, dict):
+        return False, ["arquivo ausente ou JSON inválido"]
+    if "irrf" not in doc:
+        from sanida import taxas
+
+        return taxas.validate_payload(doc)
+
+    from sanida import fiscais
+
+    meta: Dict[str, Any] = doc.get("meta") or {}
+    # documentos por ano não carregam taxas (são do dia, não do ano)
+    return fiscais.validate_payload(doc, require_taxas="final" not in meta)
+
+
+def validate(paths: List[str]) -> int:
+    if not paths:
+        from sanida.fiscais import FISCAIS_DIR, OUTPUT_FILE as FISCAIS_FILE
+        from sanida.taxas import OUTPUT_FILE as TAXAS_FILE
+
+        paths = [p for p in (TAXAS_FILE, FISCAIS_FILE) if os.path.exists(p)]
+        paths += sorted(glob.glob(os.path.join(FISCAIS_DIR, "*.json")))
+    if not paths:
+        print("nada para validar")
+        return 1
+
+    failed = 0
+    for path in paths:
+        ok, errs = validate_file(path)
+        print(f"{'OK  ' if ok else 'ERRO'} {path}" + ("" if ok else f": {errs}"))
+        failed += not ok
+    return 1 if failed else 0
+
+
+def show_history(args: List[str]) -> int:
+    """
+    --since N: entradas posteriores a N, uma por linha (NDJSON); --version N
+    (ou nada): parte de dados da versão reconstruída a partir do log local.
+    """
+    import argparse
+    import json
+
+    from sanida import history
+
+    ap = argparse.ArgumentParser(prog="python -m sanida history")
+    ap.add_argument("documento", help="dados_fiscais ou taxas_bacen")
+    group = ap.add_mutually_exclusive_group()
+    group.add_argument("--since", type=int)
+    group.add_argument("--version", type=int)
+    ns = ap.parse_args(args)
+
+    if ns.since is not None:
+        for entry in history.since(ns.documento, ns.since):
+            print(json.dumps(entry, ensure_ascii=False, separators=(",", ":")))
+        return 0
+    try:
+        doc = history.reconstruct(ns.documento, ns.version)
+    except RuntimeError as e:
+        print(f"ERRO: {e}")
+        return 1
+    print(json.dumps(doc, ensure_ascii=False, indent=2))
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = list(sys.argv[1:] if argv is None else argv)
+    if not args or args[0] in ("-h", "--help") or args[0] not in COMMANDS:
+        print(_usage())
+        return 0 if args and args[0] in ("-h", "--help") else 2
+
+    command, rest = args[0], args[1:]
+    if command == "validate":
+        return validate(rest)
+    if command == "history":
+        return show_history(rest)
+    if command == "folha":
+        from sanida import payroll
+
+        return payroll.main(rest)
+    if command == "serve":
+        from sanida import server
+
+        return server.main(rest)
+    if command == "taxas":
+        from sanida import taxas
+
+        return taxas.main(rest) or 0
+    if command == "fiscais":
+        from sanida import fiscais
+
+        return fiscais.main(rest) or 0
+
+    if rest:
+        print(_usage())
+        return 2
+    from sanida import fiscais, taxas
+
+    # fiscais lê o taxas_bacen.json local; por isso taxas vem antes
+    taxas.main([])
+    return fiscais.main([]) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""
+Correção de posições pós-fixadas (% do CDI ou da Selic), vetorizada.
+
+A curva diária (`DailyCurve`) cobre todos os dias com Taxa DI (calendário
+ANBIMA de sanida.holidays, que inclui 24/12 e 31/12) entre a primeira e a
+última data da série. Dias sem publicação repetem a taxa
+anterior. A taxa de cada dia vem pronta em % a.d. (séries 11/12 do SGS). Se
+vier em % a.a. (1178/4389, ou taxas.cdi), é convertida na base de 252 dias
+úteis: (1 + r/100) ** (1/252) - 1. Como na B3, a taxa diária é arredondada
+em DAILY_DECIMALS casas.
+
+Uma posição a p% do CDI rende, em cada dia útil, 1 + d × p (não (1 + d) ** p).
+Por isso guardamos um prefixo de log1p(d × p) por percentual distinto da
+carteira, que costuma ter poucos percentuais. O fator de [início, fim) é
+exp(P[fim] - P[início]), com os índices obtidos por searchsorted nas datas.
+Corrigir a carteira toda custa O(dias × percentuais distintos), para montar
+os prefixos, mais O(posições × log dias), sem laço em Python por posição ou
+por dia.
+
+    from sanida.accrual import DailyCurve, revalue
+    curva = DailyCurve.from_index(AsOf().series("cdi_diario"))
+    valores = revalue(curva, principal, pct_cdi, inicio, vencimento, data_base="2025-06-30")
+"""
+import datetime as dt
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from sanida import holidays
+from sanida.asof import DateLike, SeriesIndex, to_date, to_ordinals
+
+
+BUSINESS_DAYS_PER_YEAR = 252
+DAILY_DECIMALS = 8
+
+
+def annual_to_daily(rate_aa: Any) -> np.ndarray:
+    """
+    % a.a. (base 252) -> taxa diária em fração (0.0005 = 0,05% a.d.).
+    """
+    r = np.asarray(rate_aa, dtype=np.float64)
+    return np.power(1.0 + r / 100.0, 1.0 / BUSINESS_DAYS_PER_YEAR) - 1.0
+
+
+class DailyCurve:
+    """
+    Taxas diárias (fração) indexadas pelos dias úteis, em ordinais uint32
+    contíguos no calendário ANBIMA.
+    """
+
+    def __init__(self, dates: np.ndarray, daily: np.ndarray) -> None:
+        if len(dates) == 0 or len(dates) != len(daily):
+            raise RuntimeError("curva: datas e taxas vazias ou de tamanhos diferentes")
+        self.dates = np.ascontiguousarray(dates, dtype=np.uint32)
+        self.daily = np.ascontiguousarray(daily, dtype=np.float64)
+        # próximo dia útil depois da última taxa: até ele (exclusivo) há cobertura
+        last = dt.date.fromordinal(int(self.dates[-1])) + dt.timedelta(days=1)
+        while not holidays.is_anbima_day(last):
+            last += dt.timedelta(days=1)
+        self.end = last.toordinal()
+        self._prefix: Dict[float, np.ndarray] = {}
+
+    @classmethod
+    def from_series(cls, dates: Any, rates: Any, annual: bool = False) -> "DailyCurve":
+        """
+        Série como publicada (% a.d., ou % a.a. com `annual`), em qualquer
+        ordem e com buracos. Ela é reindexada nos dias ANBIMA e as lacunas
+        repetem a taxa anterior.
+        """
+        ords = to_ordinals(dates).ravel()
+        vals = np.asarray(rates, dtype=np.float64).ravel()
+        if len(ords) == 0:
+            raise RuntimeError("curva: série vazia")
+        order = np.argsort(ords, kind="stable")
+        ords, vals = ords[order], vals[order]
+
+        first, last = dt.date.fromordinal(int(ords[0])), dt.date.fromordinal(int(ords[-1]))
+        days = np.fromiter(
+            (d.toordinal() for d in holidays.anbima_days(first, last + dt.timedelta(days=1))), dtype=np.uint32
+        )
+        if len(days) == 0:
+            raise RuntimeError("curva: nenhum dia útil na série")
+        idx = np.searchsorted(ords, days, side="right") - 1
+        fill = vals[np.maximum(idx, 0)]
+
+        daily = annual_to_daily(fill) if annual else fill / 100.0
+        return cls(days, np.round(daily, DAILY_DECIMALS))
+
+    @classmethod
+    def from_index(cls, index: SeriesIndex, annual: Optional[bool] = None) -> "DailyCurve":
+        """
+        Curva a partir de uma série do histórico local (sanida.asof). Sem
+        `annual`, séries 1178/4389 são tratadas como % a.a. e as demais como % a.d.
+        """
+        if annual is None:
+            annual = index.code in (1178, 4389)
+        return cls.from_series(index.records["date"], index.records["value"], annual=annual)
+
+    def prefix(self, pct: float) -> np.ndarray:
+        """
+        P[k] = soma de log1p(d × pct/100) dos k primeiros dias (P[0] = 0).
+        """
+        key = float(pct)
+        p = self._prefix.get(key)
+        if p is None:
+            p = np.empty(len(self.daily) + 1)
+            p[0] = 0.0
+            np.cumsum(np.log1p(self.daily * (key / 100.0)), out=p[1:])
+            self._prefix[key] = p
+        return p
+
+    def positions(self, start: Any, end: Any) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Índices no prefixo de [start, end), conferindo a cobertura da curva.
+        """
+        s = to_ordinals(start).astype(np.int64)
+        e = to_ordinals(end).astype(np.int64)
+        if np.any(e < s):
+            raise RuntimeError("curva: posição com fim antes do início")
+        live = e > s  # períodos vazios não precisam de taxa
+        if np.any(live) and (np.min(s[live]) < int(self.dates[0]) or np.max(e[live]) > self.end):
+            raise RuntimeError(
+                f"curva: cobre {dt.date.fromordinal(int(self.dates[0]))} até "
+                f"{dt.date.fromordinal(self.end)} (exclusivo); há posições fora disso"
+            )
+        return np.searchsorted(self.dates, s, side="left"), np.searchsorted(self.dates, e, side="left")
+
+
+def accrual_factors(curve: DailyCurve, pct: Any, start: Any, end: Any) -> np.ndarray:
+    """
+    Fator acumulado de cada posição: produto de (1 + d × pct/100) nos dias
+    úteis em [start, end). `pct` é o percentual do índice (100 = 100% do CDI).
+    """
+    pct = np.asarray(pct, dtype=np.float64)
+    i0, i1 = curve.positions(start, end)
+    pct, i0, i1 = np.broadcast_arrays(pct, i0, i1)
+
+    levels, which = np.unique(pct, return_inverse=True)
+    table = np.stack([curve.prefix(level) for level in levels])  # [percentuais, dias + 1]
+    which = which.reshape(pct.shape)
+    return np.exp(table[which, i1] - table[which, i0])
+
+
+def revalue(
+    curve: DailyCurve,
+    principal: Any,
+    pct: Any,
+    start: Any,
+    end: Any,
+    data_base: Optional[DateLike] = None,
+) -> np.ndarray:
+    """
+    Valor corrigido de cada posição. Com `data_base`, o período de cada uma
+    termina em min(fim, data_base), ou seja, a marcação da carteira naquela
+    data. Posições que começam depois dela ficam pelo principal.
+    """
+    principal = np.asarray(principal, dtype=np.float64)
+    s = to_ordinals(start).astype(np.int64)
+    e = to_ordinals(end).astype(np.int64)
+    if data_base is not None:
+        e = np.minimum(e, to_date(data_base).toordinal())
+        e = np.maximum(e, s)
+    return principal * accrual_factors(curve, pct, s, e)
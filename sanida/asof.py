@@ -0,0 +1,203 @@
+"""
+Consultas "qual era o valor na data D" sobre o histórico local.
+
+- Taxas: os arquivos de sanida.sgs_store (historico/sgs/<código>.bin) são
+  mapeados em memória e vistos como um array NumPy estruturado (data como
+  ordinal uint32, valor float64) sem cópia; só a coluna de datas é copiada,
+  uma vez, para um índice contíguo. `as_of` é uma busca binária nesse índice:
+  O(log n), poucos microssegundos, sem carregar a série em objetos Python;
+  `as_of_many` responde um vetor de datas de uma vez (np.searchsorted).
+- Tabelas fiscais: historico/fiscais/<ano>.json (sanida.fiscais --anos) e o
+  dados_fiscais.json corrente, compilados uma vez por ano em FiscalTables
+  (sanida.tables) e guardados em memória.
+
+    from sanida.asof import AsOf
+    h = AsOf()
+    h.as_of("2024-03-15")["taxas"]["selic"]      # {"data": date(2024, 3, 15), "valor": 11.25}
+    h.series("selic").as_of_many(ordinais)       # np.ndarray de valores
+    h.range("2024-01-01", "2024-06-30")
+
+As tabelas valem para o ano-calendário inteiro: mudanças no meio do ano
+aparecem só quando o documento daquele ano for regravado.
+"""
+import os
+import mmap
+import datetime as dt
+from bisect import bisect_right
+from typing import Any, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from sanida import sgs_store
+from sanida.common import read_json
+from sanida.tables import FiscalTables, compile_tables
+
+
+FISCAIS_DIR = os.getenv("SFA_FISCAIS_DIR", os.path.join("historico", "fiscais")).strip()
+CURRENT_FISCAIS_FILE = "dados_fiscais.json"
+
+# Chave de `taxas` -> série SGS guardada em sgs_store. Todas estão no padrão
+# de SFA_SGS_HISTORY_SERIES (sanida.taxas); quem restringir essa lista fica
+# com as séries de fora vazias aqui.
+RATE_SERIES = {
+    "selic": 432,
+    "selic_diaria": 11,
+    "cdi_diario": 12,
+    "selic_aa": 1178,
+    "cdi_aa": 4389,
+}
+
+RECORD_DTYPE = np.dtype([("date", "<u4"), ("value", "<f8")])
+_EPOCH_ORDINAL = dt.date(1970, 1, 1).toordinal()
+
+DateLike = Union[dt.date, str]
+
+
+def to_date(value: DateLike) -> dt.date:
+    """
+    date, datetime ou texto ISO (só os 10 primeiros caracteres) -> date.
+    """
+    if isinstance(value, dt.datetime):
+        return value.date()
+    if isinstance(value, dt.date):
+        return value
+    return dt.date.fromisoformat(str(value)[:10])
+
+
+def to_ordinals(days: Any) -> np.ndarray:
+    """
+    Vetor de datas (datetime64, date/str ou ordinais) como ordinais uint32.
+    """
+    arr = np.asarray(days)
+    if np.issubdtype(arr.dtype, np.datetime64):
+        return (arr.astype("datetime64[D]").astype(np.int64) + _EPOCH_ORDINAL).astype(np.uint32)
+    if np.issubdtype(arr.dtype, np.integer):
+        return arr.astype(np.uint32, copy=False)
+    return np.fromiter((to_date(d).toordinal() for d in arr.ravel()), dtype=np.uint32, count=arr.size).reshape(arr.shape)
+
+
+class SeriesIndex:
+    """
+    Uma série do sgs_store mapeada em memória. O arquivo só cresce no fim;
+    `refresh()` remapeia se ele cresceu desde a abertura.
+    """
+
+    def __init__(self, code: int, directory: str = sgs_store.SGS_DIR) -> None:
+        self.store = sgs_store.SeriesStore(code, directory)
+        self.code = self.store.code
+        self._mm: Optional[mmap.mmap] = None
+        self._size = -1
+        self.records = np.empty(0, dtype=RECORD_DTYPE)
+        self.dates = np.empty(0, dtype=np.uint32)
+        self._dates_view = memoryview(self.dates)
+        self.refresh()
+
+    def refresh(self) -> None:
+        try:
+            size = os.path.getsize(self.store.path)
+        except OSError:
+            size = 0
+        if size == self._size:
+            return
+        n = max(size - sgs_store.HEADER.size, 0) // sgs_store.RECORD.size
+        if n == 0:
+            self.records = np.empty(0, dtype=RECORD_DTYPE)
+        else:
+            with open(self.store.path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.store._check_header(mm[: sgs_store.HEADER.size])
+            self.records = np.frombuffer(mm, dtype=RECORD_DTYPE, count=n, offset=sgs_store.HEADER.size)
+            self._mm = mm
+        # índice de datas contíguo (4 bytes por ponto), montado uma vez; os
+        # valores continuam sendo lidos direto do mmap
+        self.dates = np.ascontiguousarray(self.records["date"])
+        self._dates_view = memoryview(self.dates)
+        self._size = size
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def as_of(self, day: DateLike) -> Optional[Tuple[dt.date, float]]:
+        """
+        Último ponto com data <= `day`; None se a série começa depois.
+        """
+        # bisect do módulo padrão sobre a memoryview: sem o custo fixo de uma
+        # chamada NumPy para uma data só
+        i = bisect_right(self._dates_view, to_date(day).toordinal()) - 1
+        if i < 0:
+            return None
+        rec = self.records[i]
+        return dt.date.fromordinal(int(rec["date"])), float(rec["value"])
+
+    def as_of_many(self, days: Any) -> np.ndarray:
+        """
+        Valores vigentes em cada data do vetor (NaN antes do início da série).
+        """
+        idx = np.searchsorted(self.dates, to_ordinals(days), side="right") - 1
+        out = np.full(idx.shape, np.nan)
+        ok = idx >= 0
+        out[ok] = self.records["value"][idx[ok]]
+        return out
+
+    def range(self, start: DateLike, end: DateLike) -> np.ndarray:
+        """
+        Pontos com data em [start, end], como fatia (view) do array estruturado.
+        """
+        lo = int(np.searchsorted(self.dates, to_date(start).toordinal(), side="left"))
+        hi = int(np.searchsorted(self.dates, to_date(end).toordinal(), side="right"))
+        return self.records[lo:hi]
+
+
+class AsOf:
+    def __init__(
+        self,
+        sgs_dir: str = sgs_store.SGS_DIR,
+        fiscais_dir: str = FISCAIS_DIR,
+        current_file: str = CURRENT_FISCAIS_FILE,
+    ) -> None:
+        self.sgs_dir = sgs_dir
+        self.fiscais_dir = fiscais_dir
+        self.current_file = current_file
+        self._series: Dict[str, SeriesIndex] = {}
+        self._tables: Dict[int, Optional[FiscalTables]] = {}
+
+    def series(self, key: str) -> SeriesIndex:
+        s = self._series.get(key)
+        if s is None:
+            if key not in RATE_SERIES:
+                raise KeyError(f"série desconhecida: {key}")
+            s = self._series[key] = SeriesIndex(RATE_SERIES[key], self.sgs_dir)
+        return s
+
+    def tables(self, year: int) -> Optional[FiscalTables]:
+        """
+        Tabelas do ano: historico/fiscais/<ano>.json ou, na falta, o
+        dados_fiscais.json corrente se for do mesmo ano.
+        """
+        if year not in self._tables:
+            found: Optional[FiscalTables] = None
+            for path in (os.path.join(self.fiscais_dir, f"{year}.json"), self.current_file):
+                doc = read_json(path)
+                if isinstance(doc, dict) and doc.get("ano") == year:
+                    found = compile_tables(doc)
+                    break
+            self._tables[year] = found
+        return self._tables[year]
+
+    def as_of(self, day: DateLike) -> Dict[str, Any]:
+        day = to_date(day)
+        taxas: Dict[str, Any] = {}
+        for key in RATE_SERIES:
+            point = self.series(key).as_of(day)
+            if point is not None:
+                taxas[key] = {"data": point[0], "valor": point[1]}
+        return {"data": day, "taxas": taxas, "fiscais": self.tables(day.year)}
+
+    def range(self, start: DateLike, end: DateLike) -> Dict[str, Any]:
+        start, end = to_date(start), to_date(end)
+        if end < start:
+            raise RuntimeError(f"intervalo invertido: {start} > {end}")
+        return {
+            "taxas": {key: self.series(key).range(start, end) for key in RATE_SERIES},
+            "fiscais": {year: self.tables(year) for year in range(start.year, end.year + 1)},
+        }
@@ -0,0 +1,244 @@
+"""
+Taxa DI (CDI) da B3, lida do FTP público de /MediaCDI (arquivos YYYYMMDD.txt).
+
+Só sanida.taxas usa este módulo, e o importa sob demanda: ftplib não entra nos
+demais comandos.
+"""
+import os
+import re
+import datetime as dt
+from ftplib import FTP, error_perm, error_temp
+from typing import Any, Dict, List, Optional
+
+from sanida import cassette, metrics, policy
+from sanida.common import RETRIES, TIMEOUT
+
+
+B3_FTP_HOST = os.getenv("SFA_B3_FTP_HOST", "ftp.cetip.com.br").strip()
+B3_FTP_PORT = int(os.getenv("SFA_B3_FTP_PORT", "21").strip())
+B3_FTP_PATHS = ["/", "/MediaCDI"]
+B3_FTP_LOOKBACK_DAYS = 15
+# "listing": uma sessão, lista /MediaCDI e lê o arquivo mais recente (padrão)
+# "probe": comportamento antigo, uma conexão por caminho × data × tentativa
+B3_FTP_MODE = os.getenv("SFA_B3_FTP_MODE", "listing").strip().lower()
+
+
+def parse_b3_numeric_rate(raw: str) -> float:
+    """
+    Exemplo esperado:
+    000002320  -> 23,20%
+    000001465  -> 14,65%
+    """
+    text = (raw or "").strip()
+    m = re.search(r"(\d{7,9})", text)
+    if not m:
+        raise RuntimeError(f"B3 FTP: formato inesperado: {text[:120]!r}")
+
+    value = int(m.group(1)) / 100.0
+    if not (0 <= value <= 60):
+        raise RuntimeError(f"B3 FTP: CDI fora de faixa: {value}")
+
+    return round(value, 2)
+
+
+def ftp_connect(host: str) -> FTP:
+    """
+    Sessão anônima autenticada. Com o disjuntor do host aberto ou o prazo
+    esgotado, levanta RuntimeError sem tocar a rede.
+    """
+    if not policy.BREAKER.allow(host):
+        raise RuntimeError(f"B3 FTP: circuito aberto para {host}")
+    timeout = policy.current().timeout(TIMEOUT)
+    if timeout is None:
+        raise RuntimeError("B3 FTP: prazo da execução esgotado")
+
+    def connect() -> FTP:
+        ftp = FTP()
+        ftp.connect(host=host, port=B3_FTP_PORT, timeout=timeout)
+        ftp.login()
+        return ftp
+
+    # com SFA_RECORD/SFA_REPLAY a sessão é gravada ou reproduzida (sanida.cassette)
+    with metrics.stage("ftp.connect", host):
+        try:
+            ftp = cassette.ftp_session(host, connect)
+        except Exception:
+            policy.BREAKER.failure(host)
+            raise
+    policy.BREAKER.success(host)
+    return ftp
+
+
+def ftp_close(ftp: Optional[FTP]) -> None:
+    if ftp is None:
+        return
+    if policy.current().expired():
+        # sem prazo para esperar a resposta do QUIT
+        ftp.close()
+        return
+    try:
+        ftp.quit()
+    except Exception:
+        ftp.close()
+
+
+def ftp_budget(ftp: FTP) -> None:
+    """
+    Antes de cada operação da sessão: desiste se o prazo acabou e limita o
+    timeout do socket (controle e dados) ao que resta dele.
+    """
+    timeout = policy.current().timeout(TIMEOUT)
+    if timeout is None:
+        raise RuntimeError("B3 FTP: prazo da execução esgotado")
+    ftp.timeout = timeout
+    sock = getattr(ftp, "sock", None)
+    if sock is not None:
+        sock.settimeout(timeout)
+
+
+def ftp_retr_text(ftp: FTP, path: str, filename: str) -> str:
+    ftp_budget(ftp)
+    with metrics.stage("ftp.retr", B3_FTP_HOST) as rec:
+        ftp.cwd(path)
+        chunks: List[bytes] = []
+        ftp.retrbinary(f"RETR {filename}", chunks.append)
+        data = b"".join(chunks)
+        rec.bytes = len(data)
+    return data.decode("latin-1", errors="ignore").strip()
+
+
+def ftp_list_names(ftp: FTP, path: str) -> List[str]:
+    """
+    Lista os arquivos de `path` com MLSD; se o servidor não suportar, cai para NLST.
+    """
+    ftp_budget(ftp)
+    with metrics.stage("ftp.list", B3_FTP_HOST) as rec:
+        try:
+            return [name for name, facts in ftp.mlsd(path, facts=["type"]) if facts.get("type", "file") == "file"]
+        except error_perm:
+            rec.retries = 1
+        return [name.rsplit("/", 1)[-1] for name in ftp.nlst(path)]
+
+
+def b3_candidate_files(days: int = B3_FTP_LOOKBACK_DAYS) -> List[str]:
+    today = cassette.today()
+    return [(today - dt.timedelta(days=days_back)).strftime("%Y%m%d") + ".txt" for days_back in range(0, days)]
+
+
+def b3_read_cdi(ftp: FTP, host: str, path: str, filename: str) -> Dict[str, Any]:
+    raw = ftp_retr_text(ftp, path, filename)
+    if not raw:
+        raise RuntimeError(f"B3 FTP: arquivo vazio em {path}{filename}")
+
+    value = parse_b3_numeric_rate(raw)
+
+    return {
+        "value": value,
+        "ftp_host": host,
+        "ftp_path": path,
+        "ftp_filename": filename,
+        "raw_sample": raw[:120],
+    }
+
+
+def b3_latest_cdi(ftp: FTP, host: str) -> Dict[str, Any]:
+    """
+    Com uma única sessão autenticada:
+    1) lista /MediaCDI uma vez e lê o YYYYMMDD.txt mais recente da janela;
+    2) só se a listagem falhar (ou não trouxer arquivo válido) sonda por nome.
+    """
+    candidate_files = b3_candidate_files()
+    last_exc: Optional[Exception] = None
+
+    listed_path = "/MediaCDI"
+    listed: Optional[List[str]] = None
+    try:
+        names = set(ftp_list_names(ftp, listed_path))
+        listed = [f for f in candidate_files if f in names]
+    except error_perm as e:
+        last_exc = e
+
+    for filename in listed or []:
+        try:
+            return b3_read_cdi(ftp, host, listed_path, filename)
+        except (error_perm, error_temp, RuntimeError) as e:
+            last_exc = e
+
+    for path in B3_FTP_PATHS:
+        if path == listed_path and listed is not None:
+            # a listagem já disse o que existe ali; não há o que sondar
+            continue
+        for filename in candidate_files:
+            try:
+                return b3_read_cdi(ftp, host, path, filename)
+            except (error_perm, error_temp, RuntimeError) as e:
+                last_exc = e
+
+    raise RuntimeError(f"B3 FTP: nenhum arquivo de Taxa DI válido nos últimos {B3_FTP_LOOKBACK_DAYS} dias ({last_exc})")
+
+
+def fetch_b3_cdi_ftp() -> Dict[str, Any]:
+    if B3_FTP_MODE == "probe":
+        return fetch_b3_cdi_ftp_probe()
+
+    host = B3_FTP_HOST
+    last_exc = None
+
+    deadline = policy.current()
+
+    with metrics.stage("b3.cdi", host) as rec:
+        for i in range(1, RETRIES + 1):
+            ftp = None
+            rec.retries = i - 1
+            try:
+                ftp = ftp_connect(host)
+                return b3_latest_cdi(ftp, host)
+            except RuntimeError:
+                # sem arquivo válido, circuito aberto ou prazo esgotado: repetir não muda nada
+                raise
+            except Exception as e:
+                last_exc = e
+            finally:
+                ftp_close(ftp)
+
+            if i == RETRIES:
+                break
+            delay = policy.backoff(i)
+            if not deadline.can_wait(delay):
+                break
+            rec.sleep += delay
+            cassette.sleep(delay)
+
+    raise RuntimeError(f"B3 FTP: não consegui obter a Taxa DI Over ({last_exc})")
+
+
+def fetch_b3_cdi_ftp_probe() -> Dict[str, Any]:
+    """
+    Modo legado (SFA_B3_FTP_MODE=probe): uma conexão nova por caminho × data × tentativa.
+    """
+    host = B3_FTP_HOST
+    last_exc = None
+
+    deadline = policy.current()
+
+    with metrics.stage("b3.cdi", host) as rec:
+        for path in B3_FTP_PATHS:
+            for filename in b3_candidate_files():
+                for i in range(1, RETRIES + 1):
+                    if deadline.expired() or not policy.BREAKER.allow(host):
+                        raise RuntimeError(f"B3 FTP: desisti (prazo/circuito) ({last_exc})")
+                    ftp = None
+                    try:
+                        ftp = ftp_connect(host)
+                        return b3_read_cdi(ftp, host, path, filename)
+                    except Exception as e:
+                        last_exc = e
+                        rec.retries += 1
+                    finally:
+                        ftp_close(ftp)
+                    delay = policy.backoff(i)
+                    if deadline.can_wait(delay):
+                        rec.sleep += delay
+                        cassette.sleep(delay)
+
+    raise RuntimeError(f"B3 FTP: não consegui obter a Taxa DI Over ({last_exc})")
@@ -0,0 +1,143 @@
+"""
+Cálculo em lote de INSS e IRRF mensais a partir de dados_fiscais.json.
+
+Tudo é feito com operações vetorizadas do NumPy sobre arrays de salários e de
+dependentes: o custo é um punhado de passadas pelos arrays, independente do
+número de funcionários. Os limites, alíquotas e acumulados vêm das tabelas
+compiladas de sanida.tables, lidas sem cópia via np.frombuffer.
+
+Os valores são devolvidos sem arredondamento; o arredondamento em centavos
+fica a cargo de quem consome.
+"""
+import json
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+
+from sanida.tables import TaxTable, compile_tables
+
+
+OUTPUT_FILE = "dados_fiscais.json"
+
+
+def load_dados_fiscais(path: str = OUTPUT_FILE) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _as_table(tabela: Union[TaxTable, Any]) -> TaxTable:
+    return tabela if isinstance(tabela, TaxTable) else TaxTable.from_rows(tabela)
+
+
+def _arrays(table: TaxTable):
+    return (
+        np.frombuffer(table.limits, dtype=np.float64),
+        np.frombuffer(table.rates, dtype=np.float64),
+        np.frombuffer(table.deductions, dtype=np.float64),
+        np.frombuffer(table.cumulative, dtype=np.float64),
+    )
+
+
+def inss_mensal(salarios: np.ndarray, tabela: Union[TaxTable, Any]) -> np.ndarray:
+    """
+    INSS progressivo: cada faixa incide só sobre a parcela do salário que cai
+    dentro dela; acima do teto (último limite) a contribuição não cresce.
+    Uma busca por faixa + acumulado da faixa anterior, sem laço por faixa.
+    """
+    s = np.asarray(salarios, dtype=np.float64)
+    limites, aliquotas, _deducoes, acumulado = _arrays(_as_table(tabela))
+    n = len(limites)
+
+    idx = np.searchsorted(limites, s, side="left")
+    faixa = np.minimum(idx, n - 1)
+    anterior = faixa - 1
+    piso = np.where(anterior >= 0, limites[anterior], 0.0)
+    base = np.where(anterior >= 0, acumulado[anterior], 0.0)
+
+    total = base + aliquotas[faixa] * (s - piso)
+    total = np.where(idx >= n, acumulado[-1], total)
+    return np.maximum(total, 0.0)
+
+
+def irrf_tabela(base: np.ndarray, tabela: Union[TaxTable, Any]) -> np.ndarray:
+    """
+    Imposto pela tabela progressiva mensal: base × alíquota − parcela a deduzir
+    da faixa em que a base cai (limite superior inclusivo).
+    """
+    b = np.asarray(base, dtype=np.float64)
+    limites, aliquotas, deducoes, _acumulado = _arrays(_as_table(tabela))
+
+    idx = np.minimum(np.searchsorted(limites, b, side="left"), len(limites) - 1)
+    return np.maximum(b * aliquotas[idx] - deducoes[idx], 0.0)
+
+
+def reducao_mensal(rendimentos: np.ndarray, imposto: np.ndarray, regra: Optional[Dict[str, Any]]) -> np.ndarray:
+    """
+    Redução do IRRF mensal (regra de 2026), sobre os rendimentos tributáveis:
+    - até `isenta_ate`: reduz até `max_reducao_ate_5000` (sem valor: zera o imposto);
+    - até `reduz_ate`: reduz `a - b × rendimentos`;
+    - acima disso, nada.
+    A redução nunca passa do imposto calculado.
+    """
+    r = np.asarray(rendimentos, dtype=np.float64)
+    imp = np.asarray(imposto, dtype=np.float64)
+    red = np.zeros_like(imp)
+    if not regra:
+        return red
+
+    isenta_ate = regra.get("isenta_ate")
+    reduz_ate = regra.get("reduz_ate")
+    if isenta_ate is None:
+        return red
+
+    faixa_isenta = r <= float(isenta_ate)
+    teto = regra.get("max_reducao_ate_5000")
+    red = np.where(faixa_isenta, imp if teto is None else np.minimum(imp, float(teto)), red)
+
+    a, b = regra.get("a"), regra.get("b")
+    if reduz_ate is not None and a is not None and b is not None:
+        faixa_parcial = (~faixa_isenta) & (r <= float(reduz_ate))
+        parcial = np.clip(float(a) - float(b) * r, 0.0, imp)
+        red = np.where(faixa_parcial, parcial, red)
+
+    return red
+
+
+def calcular_folha(
+    salarios: Any,
+    dependentes: Any = 0,
+    dados: Optional[Dict[str, Any]] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    INSS, IRRF e líquido para um array de salários brutos e de dependentes.
+
+    O IRRF usa a maior dedução entre a legal (INSS + dependentes) e o desconto
+    simplificado mensal, e depois aplica a redução mensal, quando houver.
+    """
+    if dados is None:
+        dados = load_dados_fiscais()
+
+    s = np.asarray(salarios, dtype=np.float64)
+    n_dep = np.broadcast_to(np.asarray(dependentes, dtype=np.float64), s.shape)
+
+    tabelas = compile_tables(dados)
+
+    inss = inss_mensal(s, tabelas.inss)
+
+    deducao_legal = inss + n_dep * tabelas.dep
+    usa_simplificado = tabelas.simplificado > deducao_legal
+    base = np.maximum(s - np.maximum(deducao_legal, tabelas.simplificado), 0.0)
+
+    imposto = irrf_tabela(base, tabelas.irrf)
+    reducao = reducao_mensal(s, imposto, dados["irrf"].get("reducao_mensal"))
+    irrf = imposto - reducao
+
+    return {
+        "inss": inss,
+        "base_irrf": base,
+        "usa_simplificado": usa_simplificado,
+        "irrf_tabela": imposto,
+        "reducao": reducao,
+        "irrf": irrf,
+        "liquido": s - inss - irrf,
+    }
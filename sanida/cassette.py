@@ -0,0 +1,328 @@
+"""
+Gravação e reprodução ("cassete") do que os coletores trocam com a rede.
+
+    SFA_RECORD=run.json.gz python scraper.py     # executa normalmente e grava tudo
+    SFA_REPLAY=run.json.gz python scraper.py     # reproduz, sem rede e sem esperas
+
+Entram no cassete o resultado final de cada http_client.fetch (ok, status,
+corpo) e cada operação FTP de update_taxas (connect, cwd, MLSD/NLST, RETR),
+inclusive os erros (do ftplib e de socket, como timeout), que a reprodução
+levanta de novo com a mesma classe, além do instante da gravação: na reprodução,
+`today()`/`now_utc()` devolvem esse instante, para que nomes de arquivo e janelas
+de datas calculados a partir de "hoje" batam com o que foi gravado.
+
+Requisições repetidas à mesma URL (ou a mesma operação FTP) são reproduzidas
+na ordem em que aconteceram; esgotada a sequência, repete-se a última.
+"""
+import os
+import gzip
+import json
+import time
+import atexit
+import base64
+import socket
+import builtins
+import datetime as dt
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+RECORD_PATH = os.getenv("SFA_RECORD", "").strip()
+REPLAY_PATH = os.getenv("SFA_REPLAY", "").strip()
+
+FORMAT_VERSION = 1
+
+
+def _ftp_errors() -> Tuple[type, ...]:
+    # ftplib só entra quando há sessão FTP (update_taxas), não em todo import
+    from ftplib import error_perm, error_reply, error_temp
+
+    return error_perm, error_temp, error_reply
+
+
+def _recorded_errors() -> Tuple[type, ...]:
+    # além das respostas do servidor, as falhas de rede/socket (timeout, conexão
+    # recusada ou derrubada, EOF do ftplib) também entram no cassete
+    return _ftp_errors() + (OSError, EOFError)
+
+
+def _ftp_error(name: str, message: str) -> BaseException:
+    """
+    Reconstrói o erro gravado pelo nome da classe: ftplib, socket ou as
+    exceções de E/S do Python (TimeoutError, ConnectionResetError...).
+    """
+    known = {cls.__name__: cls for cls in _ftp_errors() + (socket.gaierror, socket.herror)}
+    cls = known.get(name) or getattr(builtins, name, None)
+    if not (isinstance(cls, type) and issubclass(cls, (OSError, EOFError) + _ftp_errors())):
+        cls = OSError
+    return cls(message)
+
+
+class CassetteMiss(RuntimeError):
+    pass
+
+
+class Cassette:
+    def __init__(self, path: str, mode: str) -> None:
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._positions: Dict[str, int] = {}
+        self.http: Dict[str, List[List[Any]]] = {}
+        self.ftp: Dict[str, List[Dict[str, Any]]] = {}
+        self.recorded_at = dt.datetime.now(dt.timezone.utc).replace(microsecond=0)
+
+        if mode == "replay":
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != FORMAT_VERSION:
+                raise RuntimeError(f"cassete: versão não suportada em {path}")
+            self.http = data.get("http", {})
+            self.ftp = data.get("ftp", {})
+            self.recorded_at = dt.datetime.fromisoformat(data["recorded_at_utc"].replace("Z", "+00:00"))
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def _next(self, table: Dict[str, List[Any]], key: str) -> Any:
+        with self._lock:
+            entries = table.get(key)
+            if not entries:
+                raise CassetteMiss(f"cassete: nada gravado para {key}")
+            i = self._positions.get(key, 0)
+            self._positions[key] = i + 1
+            return entries[min(i, len(entries) - 1)]
+
+    def _append(self, table: Dict[str, List[Any]], key: str, entry: Any) -> None:
+        with self._lock:
+            table.setdefault(key, []).append(entry)
+
+    # HTTP
+
+    def record_http(self, url: str, result: Tuple[bool, int, str]) -> None:
+        self._append(self.http, url, list(result))
+
+    def replay_http(self, url: str) -> Tuple[bool, int, str]:
+        ok, code, body = self._next(self.http, url)
+        return bool(ok), int(code), body
+
+    # FTP
+
+    def record_ftp(self, key: str, value: Any = None, error: Optional[BaseException] = None) -> None:
+        entry: Dict[str, Any] = {"value": value}
+        if error is not None:
+            entry["error"] = [type(error).__name__, str(error)]
+        self._append(self.ftp, key, entry)
+
+    def replay_ftp(self, key: str) -> Any:
+        entry = self._next(self.ftp, key)
+        if "error" in entry:
+            raise _ftp_error(*entry["error"])
+        return entry.get("value")
+
+    def save(self) -> None:
+        if self.mode != "record":
+            return
+        with self._lock:
+            data = {
+                "version": FORMAT_VERSION,
+                "recorded_at_utc": self.recorded_at.isoformat().replace("+00:00", "Z"),
+                "http": self.http,
+                "ftp": self.ftp,
+            }
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6, mtime=0) as f:
+                f.write(json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        os.replace(tmp, self.path)
+
+
+_CASSETTE: Optional[Cassette] = None
+_LOADED = False
+_CASSETTE_LOCK = threading.Lock()
+
+
+def get_cassette() -> Optional[Cassette]:
+    global _CASSETTE, _LOADED
+    with _CASSETTE_LOCK:
+        if not _LOADED:
+            _LOADED = True
+            if REPLAY_PATH:
+                _CASSETTE = Cassette(REPLAY_PATH, "replay")
+            elif RECORD_PATH:
+                _CASSETTE = Cassette(RECORD_PATH, "record")
+                atexit.register(_CASSETTE.save)
+        return _CASSETTE
+
+
+def replaying() -> bool:
+    cas = get_cassette()
+    return cas is not None and cas.replaying
+
+
+def now_utc() -> dt.datetime:
+    cas = get_cassette()
+    if cas is not None and cas.replaying:
+        return cas.recorded_at
+    return dt.datetime.now(dt.timezone.utc)
+
+
+def today() -> dt.date:
+    """
+    Data de hoje no horário de Brasília: depois das 21:00 BRT a data UTC já
+    é a do dia seguinte, e as fontes (SGS, B3, gov.br) datam tudo em BRT.
+    """
+    from sanida.holidays import BRT
+
+    return now_utc().astimezone(BRT).date()
+
+
+def sleep(seconds: float) -> None:
+    """
+    time.sleep que não espera nada durante a reprodução.
+    """
+    if not replaying():
+        time.sleep(seconds)
+
+
+def http(url: str, live: Callable[[], Tuple[bool, int, str]]) -> Tuple[bool, int, str]:
+    """
+    Resultado de um fetch: do cassete (reprodução), ou da rede, gravado (gravação).
+    """
+    cas = get_cassette()
+    if cas is None:
+        return live()
+    if cas.replaying:
+        try:
+            return cas.replay_http(url)
+        except CassetteMiss:
+            return False, 0, "cassette_miss"
+    result = live()
+    cas.record_http(url, result)
+    return result
+
+
+class RecordingFTP:
+    """
+    Envolve um ftplib.FTP já autenticado e grava cada operação usada pelo coletor.
+    """
+
+    def __init__(self, ftp: Any, cas: Cassette, host: str) -> None:
+        self._ftp = ftp
+        self._cas = cas
+        self._host = host
+        self._cwd = "/"
+
+    def _call(self, key: str, fn: Callable[[], Any], encode: Callable[[Any], Any] = lambda v: v) -> Any:
+        try:
+            value = fn()
+        except _recorded_errors() as e:
+            self._cas.record_ftp(f"{self._host} {key}", error=e)
+            raise
+        self._cas.record_ftp(f"{self._host} {key}", encode(value))
+        return value
+
+    def cwd(self, path: str) -> str:
+        out = self._call(f"CWD {path}", lambda: self._ftp.cwd(path))
+        self._cwd = path
+        return out
+
+    def retrbinary(self, cmd: str, callback: Callable[[bytes], Any], *args, **kwargs) -> str:
+        chunks: List[bytes] = []
+        resp = self._call(
+            f"{cmd} @{self._cwd}",
+            lambda: self._ftp.retrbinary(cmd, chunks.append, *args, **kwargs),
+            lambda r: {"resp": r, "data": base64.b64encode(b"".join(chunks)).decode("ascii")},
+        )
+        for chunk in chunks:
+            callback(chunk)
+        return resp
+
+    def mlsd(self, path: str = "", facts: Any = ()) -> Iterator[Tuple[str, Dict[str, str]]]:
+        return iter(self._call(f"MLSD {path}", lambda: list(self._ftp.mlsd(path, facts=facts))))
+
+    def nlst(self, *args: str) -> List[str]:
+        return self._call(f"NLST {' '.join(args)}", lambda: self._ftp.nlst(*args))
+
+    def quit(self) -> str:
+        return self._ftp.quit()
+
+    def __getattr__(self, name: str) -> Any:
+        # atributos não interceptados (sock, timeout...) vêm da sessão real
+        return getattr(self._ftp, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # e são gravados nela: o timeout de b3_cdi.ftp_budget precisa chegar ao socket real
+        if name.startswith("_"):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._ftp, name, value)
+
+    def close(self) -> None:
+        self._ftp.close()
+
+
+class ReplayFTP:
+    """
+    Mesma interface de RecordingFTP, servida do cassete.
+    """
+
+    def __init__(self, cas: Cassette, host: str) -> None:
+        self._cas = cas
+        self._host = host
+        self._cwd = "/"
+
+    def _get(self, key: str) -> Any:
+        try:
+            return self._cas.replay_ftp(f"{self._host} {key}")
+        except CassetteMiss as e:
+            raise _ftp_error("error_perm", f"550 {e}")
+
+    def cwd(self, path: str) -> str:
+        out = self._get(f"CWD {path}")
+        self._cwd = path
+        return out
+
+    def retrbinary(self, cmd: str, callback: Callable[[bytes], Any], *args, **kwargs) -> str:
+        value = self._get(f"{cmd} @{self._cwd}")
+        callback(base64.b64decode(value["data"]))
+        return value["resp"]
+
+    def mlsd(self, path: str = "", facts: Any = ()) -> Iterator[Tuple[str, Dict[str, str]]]:
+        return iter([tuple(item) for item in self._get(f"MLSD {path}")])
+
+    def nlst(self, *args: str) -> List[str]:
+        return self._get(f"NLST {' '.join(args)}")
+
+    def quit(self) -> str:
+        return "221"
+
+    def close(self) -> None:
+        pass
+
+
+def ftp_session(host: str, connect: Callable[[], Any]) -> Any:
+    """
+    Abre a sessão FTP de acordo com o modo: real, real + gravação, ou reproduzida.
+    O resultado do connect/login (inclusive falha) também vai para o cassete.
+    """
+    cas = get_cassette()
+    if cas is None:
+        return connect()
+
+    key = f"{host} CONNECT"
+    if cas.replaying:
+        entry = cas._next(cas.ftp, key) if key in cas.ftp else {"error": ["OSError", "cassette_miss"]}
+        if "error" in entry:
+            raise _ftp_error(*entry["error"])
+        return ReplayFTP(cas, host)
+
+    try:
+        ftp = connect()
+    except Exception as e:
+        cas.record_ftp(key, error=e)
+        raise
+    cas.record_ftp(key)
+    return RecordingFTP(ftp, cas, host)
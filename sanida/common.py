@@ -0,0 +1,62 @@
+"""
+Utilitários compartilhados por sanida.fiscais e sanida.taxas: configuração de
+rede via ambiente, horário UTC, arredondamento dos payloads, leitura/gravação
+atômica de JSON e fetch com os cabeçalhos de cada coletor.
+"""
+import os
+import json
+import threading
+import datetime as dt
+from typing import Any, Dict, Optional, Tuple
+
+from sanida import http_client
+
+
+SSLVERIFY = os.getenv("SFA_SSLVERIFY", "1").strip() not in ("0", "false", "False")
+TIMEOUT = int(os.getenv("SFA_TIMEOUT", "25").strip())
+RETRIES = int(os.getenv("SFA_RETRIES", "3").strip())
+
+
+def now_utc_iso() -> str:
+    return dt.datetime.now(dt.timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def round_tree(obj):
+    if isinstance(obj, dict):
+        return {k: round_tree(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [round_tree(v) for v in obj]
+    if isinstance(obj, float):
+        return round(obj, 6)
+    return obj
+
+
+def read_json(path: str) -> Optional[Any]:
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+def write_json_atomic(data: Dict[str, Any], path: str) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def fetch(url: str, headers: Dict[str, str], cancel: Optional[threading.Event] = None) -> Tuple[bool, int, str]:
+    return http_client.fetch(url, headers=headers, timeout=TIMEOUT, retries=RETRIES, verify=SSLVERIFY, cancel=cancel)
+
+
+def fetch_json(url: str, headers: Dict[str, str]) -> Tuple[bool, int, Any]:
+    ok, code, body = fetch(url, headers)
+    if not ok:
+        return False, code, body
+    try:
+        return True, code, json.loads(body)
+    except Exception:
+        return False, code, {"error": "invalid_json", "body_sample": body[:200]}
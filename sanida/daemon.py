@@ -0,0 +1,162 @@
+"""
+Modo residente (--daemon) de update_taxas.py e scraper.py.
+
+Em vez de um processo novo a cada disparo do cron, o mesmo processo roda o
+main() em laço: sessões HTTP keep-alive, cache HTTP, regexes compiladas e
+tabelas ficam quentes entre uma coleta e outra. O intervalo até a próxima
+coleta vem de um perfil de agenda:
+
+- "taxas": curto nas janelas em que os dados mudam (decisão do COPOM no fim da
+  tarde até a manhã seguinte; publicação da Taxa DI pela B3; atualização
+  matinal das séries diárias do SGS), médio no resto do horário comercial,
+  longo à noite, em fins de semana e feriados.
+- "fiscais": tabelas anuais; de hora em hora na primeira quinzena de janeiro,
+  algumas vezes por dia no resto do ano.
+
+Quando a coleta de uma janela quente já trouxe dado novo, o resto da janela
+volta ao intervalo normal. SIGTERM/SIGINT encerram o laço depois da coleta em
+andamento (ou na hora, se estiver dormindo).
+"""
+import os
+import signal
+import threading
+import datetime as dt
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sanida import digest, holidays
+
+
+def _minutes(name: str, default: float) -> float:
+    return float(os.getenv(name, str(default)).strip()) * 60.0
+
+
+HOT_INTERVAL = _minutes("SFA_DAEMON_HOT_MIN", 5)
+BUSINESS_INTERVAL = _minutes("SFA_DAEMON_BUSINESS_MIN", 30)
+NIGHT_INTERVAL = _minutes("SFA_DAEMON_NIGHT_MIN", 120)
+IDLE_INTERVAL = _minutes("SFA_DAEMON_IDLE_MIN", 360)
+RETRY_INTERVAL = _minutes("SFA_DAEMON_RETRY_MIN", 10)
+
+# Horários em BRT (hora cheia, [início, fim)).
+BUSINESS_HOURS = (8, 20)
+DI_WINDOW = tuple(int(h) for h in os.getenv("SFA_DI_WINDOW", "17-22").split("-"))
+SGS_MORNING_WINDOW = (8, 11)
+COPOM_EVENING = 18
+
+
+Window = Tuple[dt.datetime, dt.datetime]
+
+
+def _at(day: dt.date, hour: int) -> dt.datetime:
+    return dt.datetime.combine(day, dt.time(hour), tzinfo=holidays.BRT)
+
+
+def taxas_hot_window(now: dt.datetime) -> Optional[Window]:
+    """
+    Janela quente que contém `now` (BRT), se houver.
+    """
+    local = now.astimezone(holidays.BRT)
+    today = local.date()
+
+    if holidays.is_copom_decision(today) and local.hour >= COPOM_EVENING:
+        return _at(today, COPOM_EVENING), _at(today + dt.timedelta(days=1), 12)
+    yesterday = today - dt.timedelta(days=1)
+    if holidays.is_copom_decision(yesterday) and local.hour < 12:
+        return _at(yesterday, COPOM_EVENING), _at(today, 12)
+
+    if holidays.is_business_day(today):
+        for start, end in (DI_WINDOW, SGS_MORNING_WINDOW):
+            if start <= local.hour < end:
+                return _at(today, start), _at(today, end)
+    return None
+
+
+def taxas_interval(now: dt.datetime, last_change: Optional[dt.datetime]) -> float:
+    local = now.astimezone(holidays.BRT)
+    window = taxas_hot_window(now)
+    if window is not None and not (last_change is not None and last_change >= window[0]):
+        return HOT_INTERVAL
+    if not holidays.is_business_day(local.date()):
+        return IDLE_INTERVAL
+    if BUSINESS_HOURS[0] <= local.hour < BUSINESS_HOURS[1]:
+        return BUSINESS_INTERVAL
+    return NIGHT_INTERVAL
+
+
+def fiscais_interval(now: dt.datetime, last_change: Optional[dt.datetime]) -> float:
+    local = now.astimezone(holidays.BRT)
+    if local.month == 1 and local.day <= 15 and holidays.is_business_day(local.date()):
+        return 60 * 60.0
+    if holidays.is_business_day(local.date()):
+        return 6 * 60 * 60.0
+    return 24 * 60 * 60.0
+
+
+PROFILES: Dict[str, Callable[[dt.datetime, Optional[dt.datetime]], float]] = {
+    "taxas": taxas_interval,
+    "fiscais": fiscais_interval,
+}
+
+
+def _next_wake(now: dt.datetime, delay: float) -> dt.datetime:
+    """
+    `now + delay`, antecipado para o início da próxima janela quente se ela
+    abrir antes disso (as janelas começam em hora cheia).
+    """
+    wake = now + dt.timedelta(seconds=delay)
+    if taxas_hot_window(now) is not None:
+        return wake
+    probe = now.replace(minute=0, second=0, microsecond=0) + dt.timedelta(hours=1)
+    while probe < wake:
+        if taxas_hot_window(probe) is not None:
+            return probe
+        probe += dt.timedelta(hours=1)
+    return wake
+
+
+def run_forever(
+    job: Callable[[], Any],
+    output_file: str,
+    profile: str,
+    stop: Optional[threading.Event] = None,
+    now: Callable[[], dt.datetime] = lambda: dt.datetime.now(dt.timezone.utc),
+) -> int:
+    """
+    Roda `job` em laço até SIGTERM/SIGINT (ou `stop`). A cada rodada compara a
+    parte de dados de `output_file` (tudo menos meta) antes e depois para saber
+    se houve mudança.
+    """
+    interval = PROFILES[profile]
+    stop = stop or threading.Event()
+
+    def handle(signum, _frame) -> None:
+        print(f"daemon: sinal {signum}, encerrando após a coleta em andamento")
+        stop.set()
+
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, handle)
+        signal.signal(signal.SIGINT, handle)
+
+    last_change: Optional[dt.datetime] = None
+    runs = 0
+    while not stop.is_set():
+        before = digest.file_digest(output_file)
+        started = now()
+        failed = False
+        try:
+            job()
+        except Exception as e:
+            failed = True
+            print(f"daemon: coleta falhou: {type(e).__name__}: {e}")
+        runs += 1
+
+        if digest.file_digest(output_file) != before:
+            last_change = started
+
+        delay = RETRY_INTERVAL if failed else interval(now(), last_change)
+        if profile == "taxas" and not failed:
+            wake = _next_wake(now(), delay)
+            delay = max((wake - now()).total_seconds(), 1.0)
+        print(f"daemon[{profile}]: rodada {runs}, próxima em {delay / 60:.1f} min")
+        stop.wait(delay)
+
+    return 0
@@ -0,0 +1,86 @@
+"""
+Digest canônico da parte de dados dos payloads e gravação só quando ela muda.
+
+Todo payload publicado tem a forma {"schema_version", "meta", <dados>...}; o
+meta muda a cada execução (generated_at_utc, timings, fontes, estatísticas de
+conexão), os dados quase nunca. O digest cobre tudo menos "meta", serializado
+de forma canônica (chaves ordenadas, separadores compactos, UTF-8), e vai
+também para meta.data_digest.
+
+Quando o digest do payload novo é igual ao do arquivo em disco, o arquivo não
+é regravado: o git não vê mudança, o workflow não commita e ETags/caches dos
+consumidores continuam válidos. O "verifiquei agora" vai para um arquivo de
+heartbeat à parte (SFA_HEARTBEAT_DIR/<arquivo>), pequeno e fora do git.
+"""
+import os
+import json
+import hashlib
+import datetime as dt
+from typing import Any, Callable, Dict, Optional
+
+
+HEARTBEAT_DIR = os.getenv("SFA_HEARTBEAT_DIR", "heartbeat").strip()
+
+
+def data_part(doc: Any) -> Any:
+    if isinstance(doc, dict):
+        return {k: v for k, v in doc.items() if k != "meta"}
+    return doc
+
+
+def data_digest(doc: Any) -> str:
+    canonical = json.dumps(data_part(doc), ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return "sha256:" + hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def file_digest(path: str) -> Optional[str]:
+    """
+    Digest do documento em disco, recalculado (não confia em meta.data_digest).
+    None se o arquivo não existe ou não é JSON.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return data_digest(json.load(f))
+    except (OSError, ValueError):
+        return None
+
+
+def heartbeat_path(path: str) -> str:
+    return os.path.join(HEARTBEAT_DIR, os.path.basename(path))
+
+
+def write_heartbeat(path: str, digest: str, changed: bool, success: bool = True) -> None:
+    record = {
+        "file": os.path.basename(path),
+        "checked_at_utc": dt.datetime.now(dt.timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z"),
+        "data_digest": digest,
+        "changed": changed,
+        "success": success,
+    }
+    target = heartbeat_path(path)
+    os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+    tmp = target + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(record, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, target)
+
+
+def write_if_changed(
+    path: str,
+    payload: Dict[str, Any],
+    write: Callable[[Dict[str, Any]], None],
+    success: bool = True,
+    force: bool = False,
+) -> bool:
+    """
+    Chama `write(payload)` só se a parte de dados difere da que está em `path`
+    (ou se `force`, para mudanças de meta que importam, como meta.final).
+    Atualiza o heartbeat em qualquer caso. Devolve True se gravou.
+    """
+    digest = data_digest(payload)
+    payload.setdefault("meta", {})["data_digest"] = digest
+    changed = force or file_digest(path) != digest
+    if changed:
+        write(payload)
+    write_heartbeat(path, digest, changed, success)
+    return changed
@@ -0,0 +1,103 @@
+import re
+import threading
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+
+class Hit(NamedTuple):
+    field: str
+    start: int
+    end: int
+    groups: Tuple[Optional[str], ...]
+
+
+class Extractor:
+    """
+    Junta os padrões de um tipo de documento num único regex pré-compilado
+    (alternância de grupos nomeados, um por campo) e varre o texto uma única vez,
+    devolvendo todas as ocorrências de cada campo com seus offsets.
+
+    Os padrões de campo usam só grupos numerados; `Hit.groups` traz os grupos do
+    próprio campo, na mesma numeração que teriam num re.search isolado.
+
+    Quando todos os campos declaram com que caracteres podem começar (`first`, um
+    trecho de classe de caracteres como r"\\d.," ou "A"), a alternância ganha um
+    lookahead com a união dessas classes, e o motor descarta as demais posições
+    sem testar campo por campo. Basta um campo sem `first` para não haver filtro.
+
+    A varredura é única e não tem sobreposição: um trecho consumido por um campo
+    não é mais testado pelos outros (ver `register`).
+    """
+
+    def __init__(self, fields: Sequence[Tuple[str, str, Optional[str]]], flags: int = re.IGNORECASE) -> None:
+        parts: List[str] = []
+        self._slices: Dict[str, Tuple[int, int]] = {}
+        self.fields = [name for name, _pattern, _first in fields]
+
+        gate: Optional[str] = ""
+        index = 1
+        for name, pattern, first in fields:
+            n_groups = re.compile(pattern, flags).groups
+            parts.append(f"(?P<{name}>{pattern})")
+            # m.groups()[k] é o grupo k+1: os grupos internos do campo vêm logo após o externo
+            self._slices[name] = (index, index + n_groups)
+            index += 1 + n_groups
+            if gate is not None and first:
+                gate += first if first not in gate else ""
+            else:
+                gate = None
+
+        body = "|".join(parts)
+        if gate:
+            body = f"(?=[{gate}])(?:{body})"
+        self.regex = re.compile(body, flags)
+
+    def scan(self, text: str) -> Dict[str, List[Hit]]:
+        hits: Dict[str, List[Hit]] = {name: [] for name in self.fields}
+        slices = self._slices
+        for m in self.regex.finditer(text):
+            name = m.lastgroup
+            lo, hi = slices[name]
+            hits[name].append(Hit(name, m.start(), m.end(), m.groups()[lo:hi]))
+        return hits
+
+
+_REGISTRY: Dict[str, List[Tuple[str, str, Optional[str]]]] = {}
+_COMPILED: Dict[str, Extractor] = {}
+_LOCK = threading.Lock()
+
+
+def register(doc_type: str, field: str, pattern: str, first: Optional[str] = None) -> None:
+    """
+    Registra um campo para `doc_type`. `first` é a classe (sem colchetes) dos
+    caracteres que podem iniciar o padrão; sem ela, o tipo fica sem filtro.
+
+    Os campos de um tipo são casados numa só alternância, da esquerda para a
+    direita: ocorrências de campos diferentes não se sobrepõem. Se um campo
+    começa dentro do trecho casado por outro, ele não é encontrado ali; os
+    padrões de um mesmo tipo devem casar trechos disjuntos do texto. A ordem de
+    registro desempata padrões que casam na mesma posição.
+    """
+    with _LOCK:
+        fields = _REGISTRY.setdefault(doc_type, [])
+        if any(name == field for name, _pattern, _first in fields):
+            raise ValueError(f"campo já registrado: {doc_type}.{field}")
+        fields.append((field, pattern, first))
+        _COMPILED.pop(doc_type, None)
+
+
+def extractor(doc_type: str) -> Extractor:
+    with _LOCK:
+        ex = _COMPILED.get(doc_type)
+        if ex is None:
+            ex = Extractor(_REGISTRY[doc_type])
+            _COMPILED[doc_type] = ex
+        return ex
+
+
+def scan(doc_type: str, text: str) -> Dict[str, List[Hit]]:
+    return extractor(doc_type).scan(text)
+
+
+def first(hits: Dict[str, List[Hit]], field: str) -> Optional[Hit]:
+    found = hits.get(field)
+    return found[0] if found else None
@@ -0,0 +1,895 @@
+"""
+Coletor de dados_fiscais.json: tabelas de IRRF (Receita) e INSS (gov.br) do ano
+e as taxas publicadas por sanida.taxas; com --anos, um documento por ano em
+historico/fiscais/.
+
+    python -m sanida fiscais [--anos 2024-2026] [--daemon]
+"""
+import os
+import re
+import json
+import argparse
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from sanida import cassette, common, digest, extract, html_text, http_cache, http_client, metrics, policy, publish
+from sanida.common import now_utc_iso, read_json, round_tree, write_json_atomic
+from sanida.tables import TaxTable
+
+
+OUTPUT_FILE = "dados_fiscais.json"
+TAXAS_FILE_LOCAL = "taxas_bacen.json"
+TAXAS_JSON_URL_DEFAULT = "https://raw.githubusercontent.com/Rafael-Tinelli/sanida-dados-fiscais/main/taxas_bacen.json"
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; SanidaFiscaisBot/2.2; +https://sanida.com.br)",
+    "Accept": "text/html,application/xhtml+xml,application/xml,application/json;q=0.9,*/*;q=0.8",
+    "Accept-Language": "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
+    "Connection": "keep-alive",
+}
+
+# "fast": parser incremental só da região de conteúdo (sanida.html_text)
+# "bs4": árvore BeautifulSoup do documento inteiro (caminho antigo)
+HTML_PARSER = os.getenv("SFA_HTML_PARSER", "fast").strip().lower()
+
+# Buscas @@search do INSS disparadas em paralelo (no máximo N em voo).
+INSS_SEARCH_CONCURRENCY = int(os.getenv("SFA_INSS_SEARCH_CONCURRENCY", "3").strip())
+
+CACHE_DIR = os.getenv("SFA_CACHE_DIR", ".cache").strip()
+INSS_URL_CACHE_FILE = os.path.join(CACHE_DIR, "inss_urls.json")
+
+# Modo multi-ano (--anos): um documento por ano em historico/fiscais/<ano>.json.
+# Anos já encerrados que validaram ficam marcados como finais e não são buscados de novo.
+FISCAIS_DIR = os.getenv("SFA_FISCAIS_DIR", os.path.join("historico", "fiscais")).strip()
+YEARS_CONCURRENCY = int(os.getenv("SFA_YEARS_CONCURRENCY", "4").strip())
+
+# Primeiro ano com a redução mensal do IRRF (Lei 15.270/2025).
+REDUCAO_MENSAL_DESDE = 2026
+
+# Fração do prazo da execução (SFA_DEADLINE) que cada coletor pode consumir;
+# os coletores rodam em paralelo, então as frações não precisam somar 1.
+STAGE_SHARES = {
+    "irrf": 0.8,
+    "inss": 0.8,
+    "taxas": 0.5,
+}
+
+PINNED_INSS_URLS = {
+    2026: "https://www.gov.br/inss/pt-br/assuntos/com-reajuste-de-3-9-teto-do-inss-chega-a-r-8-475-55-em-2026",
+}
+
+
+_NON_NUMERIC = re.compile(r"[^0-9\.]")
+
+
+def br_money_to_float(s: str) -> float:
+    s = (s or "").strip()
+    s = s.replace("\xa0", " ")
+    s = s.replace("R$", "").strip()
+    s = s.replace(".", "").replace(",", ".")
+    s = _NON_NUMERIC.sub("", s)
+    return float(s) if s else 0.0
+
+
+def br_percent_to_rate(s: str) -> float:
+    s = (s or "").strip()
+    s = s.replace(",", ".")
+    s = _NON_NUMERIC.sub("", s)
+    v = float(s) if s else 0.0
+    return v / 100.0
+
+
+def taxas_json_url() -> str:
+    return os.getenv("SFA_TAXAS_JSON_URL", TAXAS_JSON_URL_DEFAULT).strip()
+
+
+def fetch(url: str, cancel: Optional[threading.Event] = None) -> Tuple[bool, int, str]:
+    return common.fetch(url, HEADERS, cancel=cancel)
+
+
+def fetch_json(url: str) -> Tuple[bool, int, Any]:
+    return common.fetch_json(url, HEADERS)
+
+
+def read_json_file(path: str) -> Optional[Dict[str, Any]]:
+    data = read_json(path)
+    return data if isinstance(data, dict) else None
+
+
+def validate_taxas_payload(d: Dict[str, Any]) -> Tuple[bool, List[str]]:
+    errs: List[str] = []
+
+    if not isinstance(d, dict):
+        return False, ["taxas_payload:not_dict"]
+
+    taxas = d.get("taxas")
+    if not isinstance(taxas, dict):
+        errs.append("taxas:missing_or_bad")
+    else:
+        if not isinstance(taxas.get("selic"), (int, float)):
+            errs.append("taxas.selic:missing_or_bad")
+        if not isinstance(taxas.get("cdi"), (int, float)):
+            errs.append("taxas.cdi:missing_or_bad")
+
+        if isinstance(taxas.get("selic"), (int, float)) and not (0 <= taxas["selic"] <= 60):
+            errs.append("taxas.selic:out_of_range")
+        if isinstance(taxas.get("cdi"), (int, float)) and not (0 <= taxas["cdi"] <= 60):
+            errs.append("taxas.cdi:out_of_range")
+
+    meta = d.get("meta")
+    if meta is not None and not isinstance(meta, dict):
+        errs.append("meta:bad_shape")
+
+    return (len(errs) == 0), errs
+
+
+def load_taxas_payload() -> Tuple[Dict[str, Any], str, str]:
+    """
+    Fonte prioritária:
+    1) arquivo local taxas_bacen.json (commitado no repo)
+    2) raw GitHub do mesmo arquivo
+    """
+    local = read_json_file(TAXAS_FILE_LOCAL)
+    ok_local, errs_local = validate_taxas_payload(local) if isinstance(local, dict) else (False, ["local:not_found_or_bad"])
+    if ok_local:
+        return local, "local_file", TAXAS_FILE_LOCAL
+
+    remote_url = taxas_json_url()
+    ok_remote, http_code, remote_data = fetch_json(remote_url)
+    if ok_remote and isinstance(remote_data, dict):
+        ok_payload, errs_payload = validate_taxas_payload(remote_data)
+        if ok_payload:
+            return remote_data, "remote_url", remote_url
+        raise RuntimeError(f"taxas remoto inválido: {errs_payload}")
+
+    raise RuntimeError(f"taxas indisponível: local={errs_local}; remote_status={http_code}; remote_error={remote_data}")
+
+
+def page_text(html: str) -> str:
+    """
+    Texto da página com espaços colapsados, pronto para as regexes de extração.
+    """
+    with metrics.stage("html.parse", HTML_PARSER) as rec:
+        rec.bytes = len(html)
+        if HTML_PARSER == "bs4":
+            return page_text_bs4(html)
+        return html_text.extract_text(html)
+
+
+def extract_page(
+    html: str,
+    extractor: Callable[[str], Dict[str, Any]],
+    complete: Optional[Callable[[Dict[str, Any]], bool]] = None,
+) -> Dict[str, Any]:
+    """
+    `extractor` sobre o texto da região de conteúdo; se ele falhar ali, ou se
+    o resultado não passar em `complete` (campos opcionais esperados no ano),
+    de novo sobre o documento inteiro: a primeira região pode não ser a das
+    tabelas, ou ter só parte delas. Se o documento inteiro não completar o
+    resultado, fica o da região.
+    """
+    try:
+        found: Optional[Dict[str, Any]] = extractor(page_text(html))
+    except RuntimeError:
+        if HTML_PARSER == "bs4":
+            raise
+        found = None
+    else:
+        if HTML_PARSER == "bs4" or complete is None or complete(found):
+            return found
+    with metrics.stage("html.parse", "full") as rec:
+        rec.bytes = len(html)
+        text = html_text.extract_full_text(html)
+    if found is None:
+        return extractor(text)
+    try:
+        full = extractor(text)
+    except RuntimeError:
+        return found
+    return full if complete(full) else found
+
+
+def page_text_bs4(html: str) -> str:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    text = soup.get_text(" ", strip=True)
+    return re.sub(r"\s+", " ", text)
+
+
+def parse_irrf_receita(year: int) -> Dict[str, Any]:
+    url = f"https://www.gov.br/receitafederal/pt-br/assuntos/meu-imposto-de-renda/tabelas/{year}"
+    ok, code, html = fetch(url)
+    if not ok:
+        raise RuntimeError(f"IRRF: falha ao buscar {url} (status={code})")
+
+    return {
+        "url": url,
+        "http_code": code,
+        **extract_page(html, lambda text: extract_irrf(text, year), lambda d: irrf_complete(d, year)),
+    }
+
+
+extract.register("irrf", "faixa_isenta", r"Até\s*R\$\s*([\d\.\,]+)\s*-\s*-", first="A")
+extract.register("irrf", "faixa", r"De\s*R\$\s*([\d\.\,]+)\s*até\s*R\$\s*([\d\.\,]+)\s*([\d\.\,]+)%\s*R\$\s*([\d\.\,]+)", first="D")
+extract.register("irrf", "faixa_topo", r"Acima\s*de\s*R\$\s*([\d\.\,]+)\s*([\d\.\,]+)%\s*R\$\s*([\d\.\,]+)", first="A")
+extract.register("irrf", "dependente", r"Dedução\s+mensal\s+por\s+dependente:\s*R\$\s*([\d\.\,]+)", first="D")
+extract.register("irrf", "simplificado", r"Limite\s+mensal\s+de\s+desconto\s+simplificado:\s*R\$\s*([\d\.\,]+)", first="L")
+extract.register("irrf", "reducao_max", r"até\s*R\$\s*5\.000,00\s*até\s*R\$\s*([\d\.\,]+)", first="a")
+extract.register("irrf", "reducao_formula", r"R\$\s*([\d\.\,]+)\s*-\s*\(\s*([\d\.\,]+)\s*x\s*rendimentos", first="R")
+
+
+def extract_irrf(text: str, year: Optional[int] = None) -> Dict[str, Any]:
+    with metrics.stage("regex.extract", "irrf") as rec:
+        rec.bytes = len(text)
+        hits = extract.scan("irrf", text)
+
+    brackets: List[Dict[str, float]] = []
+
+    m0 = extract.first(hits, "faixa_isenta")
+    if m0:
+        brackets.append({"limite": br_money_to_float(m0.groups[0]), "aliquota": 0.0, "deducao": 0.0})
+
+    for m in hits["faixa"]:
+        upper = br_money_to_float(m.groups[1])
+        rate = br_percent_to_rate(m.groups[2])
+        ded = br_money_to_float(m.groups[3])
+        brackets.append({"limite": upper, "aliquota": rate, "deducao": ded})
+
+    m_last = extract.first(hits, "faixa_topo")
+    if m_last:
+        rate = br_percent_to_rate(m_last.groups[1])
+        ded = br_money_to_float(m_last.groups[2])
+        brackets.append({"limite": 9e9, "aliquota": rate, "deducao": ded})
+
+    if len(brackets) < 4:
+        raise RuntimeError("IRRF: não consegui extrair as faixas de incidência mensal")
+
+    brackets = sorted(brackets, key=lambda x: x["limite"])
+
+    monthly = [b for b in brackets if (b["limite"] <= 10000) or (b["limite"] >= 1e9)]
+    monthly = sorted(monthly, key=lambda x: x["limite"])
+
+    if len(monthly) < 5:
+        raise RuntimeError(f"IRRF: tabela mensal inválida após filtro (len={len(monthly)})")
+
+    has_top = any(abs(b.get("aliquota", 0) - 0.275) < 1e-9 and b.get("limite", 0) >= 1e9 for b in monthly)
+    if not has_top:
+        raise RuntimeError("IRRF: não encontrei a faixa final 27,5% (infinita) na tabela mensal")
+
+    brackets = monthly
+
+    dep = None
+    simpl = None
+
+    md = extract.first(hits, "dependente")
+    if md:
+        dep = br_money_to_float(md.groups[0])
+
+    ms = extract.first(hits, "simplificado")
+    if ms:
+        simpl = br_money_to_float(ms.groups[0])
+
+    if dep is None or simpl is None:
+        raise RuntimeError("IRRF: falha ao extrair dep/simplificado")
+
+    red = {
+        "isenta_ate": 5000.00,
+        "reduz_ate": 7350.00,
+        "max_reducao_ate_5000": None,
+        "a": None,
+        "b": None,
+    }
+
+    mr1 = extract.first(hits, "reducao_max")
+    if mr1:
+        red["max_reducao_ate_5000"] = br_money_to_float(mr1.groups[0])
+
+    mr2 = extract.first(hits, "reducao_formula")
+    if mr2:
+        red["a"] = br_money_to_float(mr2.groups[0])
+        btxt = mr2.groups[1].replace(",", ".")
+        red["b"] = float(_NON_NUMERIC.sub("", btxt)) if btxt else None
+
+    # antes de 2026 não existe redução; sem nada na página, não inventamos a regra
+    if year is not None and year < REDUCAO_MENSAL_DESDE and not (mr1 or mr2):
+        red = {}
+
+    return {
+        "tabela": brackets,
+        "dep": dep,
+        "simplificado": simpl,
+        "reducao_mensal": red,
+    }
+
+
+def irrf_complete(irrf: Dict[str, Any], year: int) -> bool:
+    """
+    A partir de REDUCAO_MENSAL_DESDE a página traz também a redução mensal;
+    sem ela (ou com parte dela) a extração ficou incompleta.
+    """
+    if year < REDUCAO_MENSAL_DESDE:
+        return True
+    red = irrf.get("reducao_mensal") or {}
+    return bool(red) and all(v is not None for v in red.values())
+
+
+_INSS_URL_CACHE_LOCK = threading.Lock()
+
+
+def read_inss_url_cache(year: int) -> Optional[str]:
+    cache = read_json_file(INSS_URL_CACHE_FILE) or {}
+    entry = cache.get(str(year))
+    if isinstance(entry, dict) and isinstance(entry.get("url"), str):
+        return entry["url"]
+    return None
+
+
+def update_inss_url_cache(year: int, url: Optional[str]) -> None:
+    """
+    Grava (ou remove, se url=None) a URL descoberta para `year`.
+    """
+    with _INSS_URL_CACHE_LOCK:
+        cache = read_json_file(INSS_URL_CACHE_FILE) or {}
+        if url:
+            cache[str(year)] = {"url": url, "found_at_utc": now_utc_iso()}
+        else:
+            cache.pop(str(year), None)
+        try:
+            os.makedirs(os.path.dirname(INSS_URL_CACHE_FILE) or ".", exist_ok=True)
+            tmp = INSS_URL_CACHE_FILE + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(cache, f, indent=2, ensure_ascii=False)
+            os.replace(tmp, INSS_URL_CACHE_FILE)
+        except OSError:
+            # cache é só otimização; falha aqui não pode derrubar a coleta
+            pass
+
+
+def search_inss_article(query: str, url_patterns: List[str], cancel: threading.Event) -> Optional[str]:
+    if cancel.is_set():
+        return None
+
+    search_url = f"https://www.gov.br/inss/@@search?SearchableText={quote(query)}"
+    ok, code, html = fetch(search_url, cancel=cancel)
+    if not ok:
+        return None
+
+    seen = set()
+    hrefs = re.findall(r'https://www\.gov\.br/inss/[^"\']+', html)
+    for href in hrefs:
+        href = href.replace("&amp;", "&")
+        if href in seen:
+            continue
+        seen.add(href)
+
+        if any(re.search(p, href, re.IGNORECASE) for p in url_patterns):
+            return href
+
+    return None
+
+
+def find_inss_article_url(year: int) -> str:
+    """
+    Ordem: URL fixada -> URL descoberta em execução anterior (cache por ano) ->
+    buscas @@search em paralelo, onde vence o primeiro resultado que casar.
+    """
+    pinned = PINNED_INSS_URLS.get(year)
+    if pinned:
+        ok, code, _html = fetch(pinned)
+        if ok and code == 200:
+            return pinned
+
+    cached = read_inss_url_cache(year)
+    if cached:
+        ok, code, _html = fetch(cached)
+        if ok and code == 200:
+            return cached
+        update_inss_url_cache(year, None)
+
+    queries = [
+        f"teto do INSS {year}",
+        f"reajuste teto do INSS {year}",
+        f"faixas de contribuição INSS {year}",
+        f"com reajuste teto do INSS chega em {year}",
+        f"benefícios acima do salário mínimo {year}",
+    ]
+
+    url_patterns = [
+        rf"https://www\.gov\.br/inss/pt-br/assuntos/[^\"'\s<>]*{year}[^\"'\s<>]*",
+        rf"https://www\.gov\.br/inss/pt-br/noticias/[^\"'\s<>]*{year}[^\"'\s<>]*",
+    ]
+
+    cancel = threading.Event()
+    found: Optional[str] = None
+
+    pool = ThreadPoolExecutor(max_workers=max(1, INSS_SEARCH_CONCURRENCY), thread_name_prefix="inss-search")
+    try:
+        pending = {pool.submit(policy.bind(search_inss_article), q, url_patterns, cancel) for q in queries}
+        while pending and found is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                href = fut.result()
+                if href and found is None:
+                    found = href
+    finally:
+        # cancela as buscas que ainda nem começaram e impede novas tentativas
+        # das que estão em voo; não esperamos por elas
+        cancel.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    if found:
+        update_inss_url_cache(year, found)
+        return found
+
+    raise RuntimeError(f"INSS: não encontrei a notícia oficial do ano {year} via @@search/pinned")
+
+
+def parse_inss_gov(year: int) -> Dict[str, Any]:
+    with metrics.stage("inss.find_url", str(year)):
+        url = find_inss_article_url(year)
+    ok, code, html = fetch(url)
+    if not ok:
+        raise RuntimeError(f"INSS: falha ao buscar {url} (status={code})")
+
+    return {"url": url, "http_code": code, **extract_page(html, extract_inss)}
+
+
+extract.register("inss", "faixa_inicial", r"([\d\.,]+)%\s*para\s*quem\s*ganha\s*até\s*R\$\s*([\d\.\,]+)", first=r"\d.,")
+extract.register("inss", "faixa", r"([\d\.,]+)%\s*para\s*quem\s*ganha\s*entre\s*R\$\s*([\d\.\,]+)\s*e\s*R\$\s*([\d\.\,]+)", first=r"\d.,")
+extract.register("inss", "faixa_final", r"([\d\.,]+)%\s*para\s*quem\s*ganha\s*de\s*R\$\s*([\d\.\,]+)\s*até\s*R\$\s*([\d\.\,]+)", first=r"\d.,")
+
+
+def extract_inss(text: str) -> Dict[str, Any]:
+    with metrics.stage("regex.extract", "inss") as rec:
+        rec.bytes = len(text)
+        hits = extract.scan("inss", text)
+
+    brackets: List[Dict[str, float]] = []
+
+    m1 = extract.first(hits, "faixa_inicial")
+    if m1:
+        brackets.append({"limite": br_money_to_float(m1.groups[1]), "aliquota": br_percent_to_rate(m1.groups[0])})
+
+    for m in hits["faixa"]:
+        upper = br_money_to_float(m.groups[2])
+        rate = br_percent_to_rate(m.groups[0])
+        brackets.append({"limite": upper, "aliquota": rate})
+
+    m_last = extract.first(hits, "faixa_final")
+    if m_last:
+        brackets.append({"limite": br_money_to_float(m_last.groups[2]), "aliquota": br_percent_to_rate(m_last.groups[0])})
+
+    brackets = sorted(brackets, key=lambda x: x["limite"])
+
+    if len(brackets) < 3:
+        raise RuntimeError("INSS: não consegui extrair as faixas")
+
+    teto = brackets[-1]["limite"]
+
+    return {
+        "tabela": brackets,
+        "teto": teto,
+    }
+
+
+def validate_tables(d: Dict[str, Any]) -> List[str]:
+    """
+    Monta as TaxTables de INSS e IRRF na ordem do documento: limites
+    repetidos ou fora de ordem (páginas com mais de uma tabela mensal no ano,
+    mescladas) são rejeitados aqui, antes de o ano virar final.
+    """
+    errs: List[str] = []
+    irrf = d.get("irrf") if isinstance(d.get("irrf"), dict) else {}
+    for name, rows in (("inss", d.get("inss")), ("irrf.tabela", irrf.get("tabela"))):
+        if not isinstance(rows, list) or not rows:
+            continue
+        try:
+            TaxTable(
+                [float(r["limite"]) for r in rows],
+                [float(r["aliquota"]) for r in rows],
+                [float(r.get("deducao", 0.0)) for r in rows],
+            )
+        except (KeyError, TypeError, ValueError):
+            errs.append(f"{name}:faixas_invalidas")
+    return errs
+
+
+def validate_payload(d: Dict[str, Any], require_taxas: bool = True) -> Tuple[bool, List[str]]:
+    errs: List[str] = []
+
+    irrf = d.get("irrf", {})
+    if isinstance(irrf, dict):
+        tab_check = irrf.get("tabela", [])
+        for f in tab_check if isinstance(tab_check, list) else []:
+            lim = f.get("limite")
+            if isinstance(lim, (int, float)) and (10000 < lim < 1e9):
+                errs.append("irrf.tabela:contains_annual_rows")
+                break
+
+    for k in ("ano", "dep", "inss", "irrf", "taxas") if require_taxas else ("ano", "dep", "inss", "irrf"):
+        if k not in d:
+            errs.append(f"missing:{k}")
+
+    if not isinstance(d.get("inss"), list) or len(d["inss"]) < 3:
+        errs.append("inss:bad_shape")
+
+    irrf = d.get("irrf", {})
+    if not isinstance(irrf, dict):
+        errs.append("irrf:bad_shape")
+    else:
+        tab = irrf.get("tabela", [])
+        if not isinstance(tab, list) or len(tab) < 4:
+            errs.append("irrf.tabela:bad_shape")
+        if "simplificado" not in irrf or not isinstance(irrf.get("simplificado"), (int, float)):
+            errs.append("irrf.simplificado:missing_or_bad")
+
+    taxas = d.get("taxas", {})
+    if not isinstance(taxas, dict):
+        errs.append("taxas:bad_shape")
+    elif require_taxas:
+        for k in ("selic", "cdi"):
+            if k not in taxas or not isinstance(taxas.get(k), (int, float)):
+                errs.append(f"taxas.{k}:missing_or_bad")
+
+    if isinstance(d.get("dep"), (int, float)) and not (0 < d["dep"] < 500):
+        errs.append("dep:out_of_range")
+
+    if isinstance(d.get("inss"), list):
+        for f in d["inss"]:
+            if not (isinstance(f.get("limite"), (int, float)) and isinstance(f.get("aliquota"), (int, float))):
+                errs.append("inss:row_bad")
+                break
+            if not (0 <= f["aliquota"] <= 0.3):
+                errs.append("inss:aliquota_out_of_range")
+                break
+
+    if isinstance(irrf, dict) and isinstance(irrf.get("tabela"), list):
+        for f in irrf["tabela"]:
+            if not all(k in f for k in ("limite", "aliquota", "deducao")):
+                errs.append("irrf:tabela_row_missing")
+                break
+
+    if not any(e.startswith(("inss:", "irrf:", "irrf.tabela:")) for e in errs):
+        errs.extend(validate_tables(d))
+
+    if isinstance(taxas, dict):
+        if isinstance(taxas.get("selic"), (int, float)) and not (0 <= taxas["selic"] <= 60):
+            errs.append("selic:out_of_range")
+        if isinstance(taxas.get("cdi"), (int, float)) and not (0 <= taxas["cdi"] <= 60):
+            errs.append("cdi:out_of_range")
+
+    return (len(errs) == 0), errs
+
+
+def collect_taxas() -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    taxas_doc, taxas_origin, taxas_ref = load_taxas_payload()
+
+    taxas_meta = taxas_doc.get("meta", {}) if isinstance(taxas_doc.get("meta"), dict) else {}
+    taxas_sources = taxas_meta.get("sources", {}) if isinstance(taxas_meta.get("sources"), dict) else {}
+
+    source = {
+        "origin": taxas_origin,
+        "origin_ref": taxas_ref,
+        "generated_at_utc": taxas_meta.get("generated_at_utc"),
+        "source_meta": taxas_sources,
+    }
+
+    return taxas_doc.get("taxas", {}), source
+
+
+def collect_sources(collectors: Dict[str, Callable[[], Any]]) -> Dict[str, Tuple[Any, Optional[Exception]]]:
+    """
+    Dispara todos os coletores ao mesmo tempo (um thread por fonte), de modo que
+    o tempo total fica limitado pela fonte mais lenta e não pela soma delas.
+    Cada coletor roda sob o prazo da sua etapa (STAGE_SHARES).
+    Retorna {nome: (resultado, erro)}; o erro é a exceção levantada pelo coletor.
+    """
+    results: Dict[str, Tuple[Any, Optional[Exception]]] = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, len(collectors)), thread_name_prefix="coleta") as pool:
+        futures = {
+            name: pool.submit(policy.within(name, STAGE_SHARES.get(name, 1.0), fn))
+            for name, fn in collectors.items()
+        }
+        for name, fut in futures.items():
+            try:
+                results[name] = (fut.result(), None)
+            except Exception as e:
+                results[name] = (None, e)
+
+    return results
+
+
+def build_payload(
+    year: int,
+    irrf: Dict[str, Any],
+    inss: Dict[str, Any],
+    taxas: Optional[Dict[str, Any]],
+    meta: Dict[str, Any],
+) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {
+        "schema_version": "2.2.0",
+        "meta": meta,
+        "ano": year,
+        "dep": float(irrf["dep"]),
+        "inss": inss["tabela"],
+        "irrf": {
+            "tabela": irrf["tabela"],
+            "simplificado": float(irrf["simplificado"]),
+        },
+    }
+    # só existe a partir de REDUCAO_MENSAL_DESDE; antes disso a chave fica de fora
+    if irrf.get("reducao_mensal"):
+        payload["irrf"]["reducao_mensal"] = irrf["reducao_mensal"]
+    if taxas is not None:
+        payload["taxas"] = {
+            "selic": float(taxas["selic"]),
+            "cdi": float(taxas["cdi"]),
+            "cdi_basis": taxas.get("cdi_basis"),
+        }
+    return round_tree(payload)
+
+
+def year_file(year: int) -> str:
+    return os.path.join(FISCAIS_DIR, f"{year}.json")
+
+
+def read_final_year(year: int) -> Optional[Dict[str, Any]]:
+    """
+    Documento do ano já marcado como final e ainda válido; None se precisa buscar.
+    """
+    doc = read_json(year_file(year))
+    if not isinstance(doc, dict) or not (doc.get("meta") or {}).get("final"):
+        return None
+    ok, _ = validate_payload(doc, require_taxas=False)
+    return doc if ok and doc.get("ano") == year else None
+
+
+def scrape_year(year: int, current_year: int) -> Dict[str, Any]:
+    """
+    IRRF + INSS de um ano, validados. Sem taxas: elas são do dia, não do ano.
+    """
+    collected = collect_sources(
+        {
+            "irrf": lambda: parse_irrf_receita(year),
+            "inss": lambda: parse_inss_gov(year),
+        }
+    )
+    errors = [f"{name}:{err}" for name, (_result, err) in collected.items() if err is not None]
+    if errors:
+        raise RuntimeError("; ".join(errors))
+
+    irrf, _ = collected["irrf"]
+    inss, _ = collected["inss"]
+    meta = {
+        "generated_at_utc": now_utc_iso(),
+        "final": year < current_year,
+        "sources": {
+            "irrf": {"url": irrf["url"], "http_code": irrf["http_code"]},
+            "inss": {"url": inss["url"], "http_code": inss["http_code"]},
+        },
+        "errors": [],
+        "warnings": [],
+    }
+    payload = build_payload(year, irrf, inss, None, meta)
+
+    ok, verrs = validate_payload(payload, require_taxas=False)
+    if not ok:
+        raise RuntimeError(f"payload inválido: {verrs}")
+    return payload
+
+
+def scrape_years(years: List[int]) -> Dict[int, str]:
+    """
+    Busca os anos pedidos em paralelo (até YEARS_CONCURRENCY anos em voo; a carga
+    por host é limitada no cliente HTTP) e grava um documento por ano.
+    Anos finais são pulados sem nenhuma requisição. Devolve {ano: status}.
+    """
+    current_year = cassette.now_utc().year
+    status: Dict[int, str] = {}
+
+    pending = []
+    for year in years:
+        if read_final_year(year) is not None:
+            status[year] = "final"
+        else:
+            pending.append(year)
+
+    if pending:
+        os.makedirs(FISCAIS_DIR, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=max(1, YEARS_CONCURRENCY), thread_name_prefix="ano") as pool:
+            futures = {year: pool.submit(policy.bind(scrape_year), year, current_year) for year in pending}
+            for year, fut in futures.items():
+                try:
+                    payload = fut.result()
+                except Exception as e:
+                    # falha não apaga o que já existe para o ano
+                    status[year] = f"erro: {e}"
+                    continue
+                path = year_file(year)
+                previous = read_json(path)
+                # ano que acabou de virar final precisa ser regravado mesmo sem mudança nos dados
+                became_final = payload["meta"]["final"] and not ((previous or {}).get("meta") or {}).get("final")
+                written = digest.write_if_changed(
+                    path, payload, lambda d: write_json_atomic(d, path), force=bool(became_final)
+                )
+                if not written:
+                    status[year] = "unchanged"
+                else:
+                    status[year] = "final_written" if payload["meta"]["final"] else "written"
+
+    return dict(sorted(status.items()))
+
+
+def parse_years(spec: str) -> List[int]:
+    """
+    "2024-2026", "2023,2025" ou combinações ("2020-2022,2025").
+    """
+    years = set()
+    for part in spec.replace(" ", "").split(","):
+        if not part:
+            continue
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            years.update(range(int(lo), int(hi) + 1))
+        else:
+            years.add(int(part))
+    return sorted(years)
+
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(prog="python -m sanida fiscais", description="Atualiza dados_fiscais.json (IRRF, INSS e taxas).")
+    ap.add_argument("--anos", help=f"modo multi-ano: ex. 2024-2026; grava {FISCAIS_DIR}/<ano>.json")
+    ap.add_argument(
+        "--daemon",
+        action="store_true",
+        help="fica residente e repete a coleta com intervalo adaptativo (sanida/daemon.py)",
+    )
+    args = ap.parse_args(argv)
+
+    if args.daemon:
+        from sanida import daemon
+
+        output = year_file(cassette.today().year) if args.anos else OUTPUT_FILE
+        return daemon.run_forever(lambda: run_once(args.anos), output, "fiscais")
+    return run_once(args.anos)
+
+
+def run_once(anos: Optional[str] = None):
+    policy.start_run()
+
+    if anos:
+        for year, st in scrape_years(parse_years(anos)).items():
+            print(f"{year}: {st}")
+        return
+
+    metrics.reset()
+    existing = read_json(OUTPUT_FILE)
+    existing_ok = False
+    if isinstance(existing, dict):
+        existing_ok, _ = validate_payload(existing)
+
+    year = cassette.now_utc().year
+
+    errors: List[str] = []
+    warnings: List[str] = []
+    sources: Dict[str, Any] = {}
+
+    collected = collect_sources(
+        {
+            "irrf": lambda: parse_irrf_receita(year),
+            "inss": lambda: parse_inss_gov(year),
+            "taxas": collect_taxas,
+        }
+    )
+
+    irrf, err = collected["irrf"]
+    if err is None:
+        sources["irrf"] = {"url": irrf["url"], "http_code": irrf["http_code"]}
+    else:
+        errors.append(f"irrf:{err}")
+
+    inss, err = collected["inss"]
+    if err is None:
+        sources["inss"] = {"url": inss["url"], "http_code": inss["http_code"]}
+    else:
+        errors.append(f"inss:{err}")
+
+    taxas_result, err = collected["taxas"]
+    if err is None:
+        taxas, sources["taxas"] = taxas_result
+    else:
+        errors.append(f"taxas:{err}")
+        taxas = None
+
+    sources["http"] = http_client.connection_stats()
+    sources["http_cache"] = http_cache.cache_stats()
+    sources["policy"] = policy.stats()
+
+    if irrf and inss and taxas:
+        meta = {
+            "generated_at_utc": now_utc_iso(),
+            "sources": sources,
+            "errors": [],
+            "warnings": warnings,
+            "timings": metrics.timings(),
+        }
+        payload = build_payload(year, irrf, inss, taxas, meta)
+
+        ok, verrs = validate_payload(payload)
+        if ok:
+            if digest.write_if_changed(
+                OUTPUT_FILE,
+                payload,
+                lambda d: publish.write_published(d, OUTPUT_FILE),
+                force=not publish.variants_present(OUTPUT_FILE),
+            ):
+                print("OK: dados_fiscais.json atualizado.")
+            else:
+                print("OK: dados inalterados; dados_fiscais.json mantido (só o heartbeat mudou).")
+            metrics.export("scraper", True)
+            return
+
+        print("ERRO: payload inválido -> NÃO sobrescrevi o last-good.")
+        print("Detalhes:", verrs)
+
+    if existing_ok:
+        digest.write_heartbeat(OUTPUT_FILE, digest.data_digest(existing), False, success=False)
+        metrics.export("scraper", False)
+        print("WARN: coleta falhou, mantendo last-good (nenhuma alteração no JSON).")
+        print("Erros:", errors)
+        return
+
+    minimal = {
+        "schema_version": "2.2.0",
+        "meta": {
+            "generated_at_utc": now_utc_iso(),
+            "sources": sources,
+            "errors": errors,
+            "warnings": warnings + ["minimal_fallback_written", "static_reference_values"],
+            "timings": metrics.timings(),
+        },
+        "ano": year,
+        "dep": 189.59,
+        "inss": [
+            {"limite": 1621.00, "aliquota": 0.075},
+            {"limite": 2902.84, "aliquota": 0.09},
+            {"limite": 4354.27, "aliquota": 0.12},
+            {"limite": 8475.55, "aliquota": 0.14},
+        ],
+        "irrf": {
+            "tabela": [
+                {"limite": 2428.80, "aliquota": 0.0, "deducao": 0.0},
+                {"limite": 2826.65, "aliquota": 0.075, "deducao": 182.16},
+                {"limite": 3751.05, "aliquota": 0.15, "deducao": 394.16},
+                {"limite": 4664.68, "aliquota": 0.225, "deducao": 675.49},
+                {"limite": 9e9, "aliquota": 0.275, "deducao": 908.73},
+            ],
+            "simplificado": 607.20,
+            "reducao_mensal": {
+                "isenta_ate": 5000.00,
+                "reduz_ate": 7350.00,
+                "max_reducao_ate_5000": 312.89,
+                "a": 978.62,
+                "b": 0.133145,
+            },
+        },
+        "taxas": {
+            "selic": 15.00,
+            "cdi": 14.90,
+            "cdi_basis": "fallback",
+        },
+    }
+
+    digest.write_if_changed(
+        OUTPUT_FILE, round_tree(minimal), lambda d: publish.write_published(d, OUTPUT_FILE), success=False
+    )
+    metrics.export("scraper", False)
+    print("WARN: sem last-good; escrevi fallback mínimo para evitar quebra.")
+
+
+if __name__ == "__main__":
+    main()
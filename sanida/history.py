@@ -0,0 +1,353 @@
+"""
+Histórico versionado dos documentos publicados, em NDJSON só de acréscimo.
+
+Cada vez que dados_fiscais.json ou taxas_bacen.json muda de verdade (o digest
+de sanida.digest mudou), uma linha é acrescentada a
+SFA_HISTORY_DIR/<nome>.ndjson:
+
+    {"version": 7, "published_at_utc": "...", "data_digest": "sha256:...",
+     "base": 6, "patch": [{"op": "replace", "path": "/taxas/selic", "value": 14.25}]}
+
+`patch` é um JSON Patch (RFC 6902) da parte de dados (tudo menos "meta") da
+versão `base` para esta. A primeira versão, as que não encaixam na anterior
+(arquivo editado fora do coletor) e uma a cada SNAPSHOT_EVERY trazem
+`snapshot` com a parte de dados inteira no lugar do patch, para que
+reconstruir qualquer versão nunca exija reaplicar o log todo.
+
+Quem sabe a última versão que tem pede `since(nome, v)` e aplica os patches
+com `apply_patch`; `reconstruct(nome, v)` remonta qualquer versão offline.
+"""
+import os
+import json
+import copy
+from typing import Any, Dict, Iterator, List, Optional
+
+from sanida import digest
+from sanida.common import now_utc_iso
+
+
+HISTORY_DIR = os.getenv("SFA_HISTORY_DIR", os.path.join("historico", "versoes")).strip()
+SNAPSHOT_EVERY = int(os.getenv("SFA_HISTORY_SNAPSHOT_EVERY", "50").strip())
+
+Patch = List[Dict[str, Any]]
+
+
+# JSON Pointer (RFC 6901)
+
+
+def _escape(token: str) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def _split(pointer: str) -> List[str]:
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise RuntimeError(f"JSON Pointer inválido: {pointer!r}")
+    return [t.replace("~1", "/").replace("~0", "~") for t in pointer[1:].split("/")]
+
+
+def _index(container: List[Any], token: str, allow_end: bool = False) -> int:
+    if token == "-" and allow_end:
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token.startswith("0")):
+        raise RuntimeError(f"JSON Patch: índice inválido {token!r}")
+    i = int(token)
+    if i > len(container) or (i == len(container) and not allow_end):
+        raise RuntimeError(f"JSON Patch: índice fora da lista {token!r}")
+    return i
+
+
+def _resolve(doc: Any, tokens: List[str]) -> Any:
+    node = doc
+    for token in tokens:
+        if isinstance(node, list):
+            node = node[_index(node, token)]
+        elif isinstance(node, dict) and token in node:
+            node = node[token]
+        else:
+            raise RuntimeError(f"JSON Patch: caminho inexistente /{'/'.join(map(_escape, tokens))}")
+    return node
+
+
+# JSON Patch (RFC 6902)
+
+
+def diff(old: Any, new: Any, path: str = "") -> Patch:
+    """
+    Patch mínimo por estrutura: objetos campo a campo, listas posição a
+    posição (sobras removidas do fim para o começo), o resto por `replace`.
+    """
+    if type(old) is not type(new) and not (isinstance(old, (int, float)) and isinstance(new, (int, float))):
+        return [{"op": "replace", "path": path, "value": new}]
+
+    if isinstance(old, dict):
+        ops: Patch = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                ops.extend(diff(old[key], value, child))
+        return ops
+
+    if isinstance(old, list):
+        ops = []
+        common = min(len(old), len(new))
+        for i in range(common):
+            ops.extend(diff(old[i], new[i], f"{path}/{i}"))
+        for i in range(len(old) - 1, common - 1, -1):
+            ops.append({"op": "remove", "path": f"{path}/{i}"})
+        for i in range(common, len(new)):
+            ops.append({"op": "add", "path": f"{path}/{i}", "value": new[i]})
+        return ops
+
+    if old != new or type(old) is not type(new):
+        return [{"op": "replace", "path": path, "value": new}]
+    return []
+
+
+def apply_patch(doc: Any, patch: Patch) -> Any:
+    """
+    Aplica um JSON Patch (add, remove, replace, move, copy, test) numa cópia
+    de `doc` e a devolve. Operação inválida levanta RuntimeError.
+    """
+    doc = copy.deepcopy(doc)
+    for op in patch:
+        name = op.get("op")
+        tokens = _split(op["path"])
+
+        if name == "test":
+            if _resolve(doc, tokens) != op["value"]:
+                raise RuntimeError(f"JSON Patch: test falhou em {op['path']}")
+            continue
+
+        if name in ("move", "copy"):
+            source = _split(op["from"])
+            value = copy.deepcopy(_resolve(doc, source))
+            if name == "move":
+                if tokens[: len(source)] == source and tokens != source:
+                    raise RuntimeError("JSON Patch: move para dentro de si mesmo")
+                doc = _remove(doc, source)
+            doc = _add(doc, tokens, value)
+        elif name == "add":
+            doc = _add(doc, tokens, copy.deepcopy(op["value"]))
+        elif name == "remove":
+            doc = _remove(doc, tokens)
+        elif name == "replace":
+            _resolve(doc, tokens)
+            if not tokens:
+                doc = copy.deepcopy(op["value"])
+                continue
+            parent = _resolve(doc, tokens[:-1])
+            if isinstance(parent, list):
+                parent[_index(parent, tokens[-1])] = copy.deepcopy(op["value"])
+            else:
+                parent[tokens[-1]] = copy.deepcopy(op["value"])
+        else:
+            raise RuntimeError(f"JSON Patch: operação desconhecida {name!r}")
+    return doc
+
+
+def _add(doc: Any, tokens: List[str], value: Any) -> Any:
+    if not tokens:
+        return value
+    parent = _resolve(doc, tokens[:-1])
+    if isinstance(parent, list):
+        parent.insert(_index(parent, tokens[-1], allow_end=True), value)
+    elif isinstance(parent, dict):
+        parent[tokens[-1]] = value
+    else:
+        raise RuntimeError("JSON Patch: add em valor que não é objeto nem lista")
+    return doc
+
+
+def _remove(doc: Any, tokens: List[str]) -> Any:
+    if not tokens:
+        raise RuntimeError("JSON Patch: remove da raiz")
+    parent = _resolve(doc, tokens[:-1])
+    if isinstance(parent, list):
+        del parent[_index(parent, tokens[-1])]
+    elif isinstance(parent, dict) and tokens[-1] in parent:
+        del parent[tokens[-1]]
+    else:
+        raise RuntimeError(f"JSON Patch: caminho inexistente /{'/'.join(map(_escape, tokens))}")
+    return doc
+
+
+# Log NDJSON
+
+
+def log_path(name: str, directory: Optional[str] = None) -> str:
+    name = os.path.basename(name)
+    if name.endswith(".json"):
+        name = name[:-5]
+    return os.path.join(directory or HISTORY_DIR, f"{name}.ndjson")
+
+
+def entries(name: str, directory: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Versões do log em ordem. Uma última linha incompleta (queda no meio da
+    gravação) é ignorada.
+    """
+    try:
+        f = open(log_path(name, directory), "r", encoding="utf-8")
+    except FileNotFoundError:
+        return
+    with f:
+        for line in f:
+            if not line.endswith("\n"):
+                break
+            yield json.loads(line)
+
+
+def _entries_reversed(name: str, directory: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Versões do log da última para a primeira, lidas do fim do arquivo em
+    blocos. Uma última linha incompleta é ignorada.
+    """
+    path = log_path(name, directory)
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        pos = f.seek(0, os.SEEK_END)
+        buf = b""
+        seen_end = False
+        while pos > 0:
+            step = min(4096, pos)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+            if not seen_end:
+                # o que vem depois do último "\n" é vazio ou linha incompleta
+                k = buf.rfind(b"\n")
+                if k < 0:
+                    continue
+                buf = buf[: k + 1]
+                seen_end = True
+            lines = buf.split(b"\n")
+            # lines[0] só está completa se já chegamos ao começo do arquivo;
+            # senão volta para o buffer e se junta ao bloco anterior
+            buf = b"" if pos == 0 else lines[0] + b"\n"
+            for line in reversed(lines[:-1] if pos == 0 else lines[1:-1]):
+                if line.strip():
+                    yield json.loads(line)
+
+
+def last_entry(name: str, directory: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Última versão completa, lida do fim do arquivo (sem percorrer o log).
+    """
+    return next(_entries_reversed(name, directory), None)
+
+
+def _truncate_partial(path: str) -> None:
+    # linha incompleta no fim (queda durante a gravação): descarta antes de acrescentar
+    try:
+        f = open(path, "rb+")
+    except FileNotFoundError:
+        return
+    with f:
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return
+        pos = size
+        while pos > 0:
+            step = min(4096, pos)
+            pos -= step
+            f.seek(pos)
+            chunk = f.read(step)
+            k = chunk.rfind(b"\n")
+            if k >= 0:
+                f.truncate(pos + k + 1)
+                return
+        f.truncate(0)
+
+
+def record(path: str, previous: Optional[Dict[str, Any]], current: Dict[str, Any], directory: Optional[str] = None) -> Optional[int]:
+    """
+    Acrescenta `current` ao log de `path` se a parte de dados mudou. `previous`
+    é o documento que estava publicado antes (ou None). Devolve a versão nova.
+    """
+    new_digest = digest.data_digest(current)
+    last = last_entry(path, directory)
+    if last is not None and last.get("data_digest") == new_digest:
+        return None
+
+    version = (last["version"] + 1) if last else 1
+    entry: Dict[str, Any] = {
+        "version": version,
+        "published_at_utc": (current.get("meta") or {}).get("generated_at_utc") or now_utc_iso(),
+        "data_digest": new_digest,
+    }
+    chained = (
+        last is not None
+        and previous is not None
+        and digest.data_digest(previous) == last.get("data_digest")
+        and version % max(SNAPSHOT_EVERY, 1) != 0
+    )
+    if chained:
+        entry["base"] = last["version"]
+        entry["patch"] = diff(digest.data_part(previous), digest.data_part(current))
+    else:
+        entry["snapshot"] = digest.data_part(current)
+
+    target = log_path(path, directory)
+    os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+    _truncate_partial(target)
+    line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+    with open(target, "a", encoding="utf-8") as f:
+        f.write(line)
+        f.flush()
+        os.fsync(f.fileno())
+    return version
+
+
+def since(name: str, version: int, directory: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Entradas posteriores a `version`: o delta que um consumidor nessa versão
+    precisa aplicar, em ordem.
+    """
+    return [e for e in entries(name, directory) if e["version"] > version]
+
+
+def reconstruct(name: str, version: Optional[int] = None, directory: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Parte de dados da versão pedida (a última, se None), conferida contra o
+    digest gravado. O log é lido do fim até o snapshot mais recente que não
+    passa da versão, e só os patches depois dele são aplicados.
+    """
+    chain: List[Dict[str, Any]] = []
+    for entry in _entries_reversed(name, directory):
+        if version is not None and entry["version"] > version:
+            continue
+        chain.append(entry)
+        if "snapshot" in entry:
+            break
+
+    if not chain:
+        raise RuntimeError(f"histórico {name}: nenhuma versão registrada")
+    current = chain[0]
+    if version is not None and current["version"] != version:
+        raise RuntimeError(f"histórico {name}: versão {version} não encontrada")
+    chain.reverse()
+    if "snapshot" not in chain[0]:
+        raise RuntimeError(f"histórico {name}: versão {chain[0]['version']} sem base {chain[0].get('base')}")
+
+    doc: Any = copy.deepcopy(chain[0]["snapshot"])
+    for prev, entry in zip(chain, chain[1:]):
+        if entry.get("base") != prev["version"]:
+            raise RuntimeError(f"histórico {name}: versão {entry['version']} sem base {entry.get('base')}")
+        doc = apply_patch(doc, entry["patch"])
+
+    if digest.data_digest(doc) != current["data_digest"]:
+        raise RuntimeError(f"histórico {name}: digest não confere na versão {current['version']}")
+    return doc
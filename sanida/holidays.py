@@ -0,0 +1,116 @@
+"""
+Calendário de mercado: feriados nacionais / de pregão da B3, dias úteis e as
+datas de decisão do COPOM.
+
+Há dois calendários. O da ANBIMA (anbima_holidays, anbima_days) é o dos dias
+com Taxa DI/Selic publicada e serve para correção (sanida.accrual). O de
+pregão da B3 (market_holidays, is_business_day) tira também 24/12 e 31/12,
+quando não há sessão mas a DI sai normalmente; é o que o daemon usa.
+
+Os feriados móveis (Carnaval, Sexta-feira Santa, Corpus Christi) saem da data
+da Páscoa (algoritmo de Meeus/Jones/Butcher). As reuniões do COPOM não têm
+regra: vêm do calendário publicado pelo BCB, mantido em COPOM_DECISIONS, e
+podem ser complementadas por SFA_COPOM_DATES ("2027-01-27,2027-03-17").
+"""
+import os
+import datetime as dt
+from functools import lru_cache
+from typing import FrozenSet, Iterable
+
+
+BRT = dt.timezone(dt.timedelta(hours=-3), "BRT")
+
+# Segundo dia de cada reunião (a decisão sai no fim da tarde). Conferir com o
+# calendário do BCB a cada ano.
+COPOM_DECISIONS = frozenset(
+    dt.date.fromisoformat(d)
+    for d in (
+        "2025-01-29", "2025-03-19", "2025-05-07", "2025-06-18",
+        "2025-07-30", "2025-09-17", "2025-11-05", "2025-12-10",
+        "2026-01-28", "2026-03-18", "2026-04-29", "2026-06-17",
+        "2026-08-05", "2026-09-16", "2026-11-04", "2026-12-09",
+    )
+) | frozenset(
+    dt.date.fromisoformat(d.strip())
+    for d in os.getenv("SFA_COPOM_DATES", "").split(",")
+    if d.strip()
+)
+
+
+def easter(year: int) -> dt.date:
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7  # noqa: E741
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return dt.date(year, month, day + 1)
+
+
+@lru_cache(maxsize=64)
+def anbima_holidays(year: int) -> FrozenSet[dt.date]:
+    """
+    Dias sem Taxa DI (calendário ANBIMA): feriados nacionais, Carnaval,
+    Sexta-feira Santa e Corpus Christi.
+    """
+    p = easter(year)
+    fixed = [(1, 1), (4, 21), (5, 1), (9, 7), (10, 12), (11, 2), (11, 15), (12, 25)]
+    days = {dt.date(year, m, d) for m, d in fixed}
+    if year >= 2024:
+        days.add(dt.date(year, 11, 20))  # Consciência Negra, nacional desde 2024
+    for offset in (-48, -47, -2, 60):
+        days.add(p + dt.timedelta(days=offset))
+    return frozenset(days)
+
+
+@lru_cache(maxsize=64)
+def market_holidays(year: int) -> FrozenSet[dt.date]:
+    """
+    Dias sem pregão na B3: os da ANBIMA mais 24/12 e 31/12.
+    """
+    return anbima_holidays(year) | {dt.date(year, 12, 24), dt.date(year, 12, 31)}
+
+
+def is_business_day(day: dt.date) -> bool:
+    return day.weekday() < 5 and day not in market_holidays(day.year)
+
+
+def is_anbima_day(day: dt.date) -> bool:
+    return day.weekday() < 5 and day not in anbima_holidays(day.year)
+
+
+def business_days(start: dt.date, end: dt.date) -> Iterable[dt.date]:
+    """
+    Dias úteis em [start, end).
+    """
+    day = start
+    while day < end:
+        if is_business_day(day):
+            yield day
+        day += dt.timedelta(days=1)
+
+
+def anbima_days(start: dt.date, end: dt.date) -> Iterable[dt.date]:
+    """
+    Dias com Taxa DI em [start, end).
+    """
+    day = start
+    while day < end:
+        if is_anbima_day(day):
+            yield day
+        day += dt.timedelta(days=1)
+
+
+def previous_business_day(day: dt.date) -> dt.date:
+    day -= dt.timedelta(days=1)
+    while not is_business_day(day):
+        day -= dt.timedelta(days=1)
+    return day
+
+
+def is_copom_decision(day: dt.date) -> bool:
+    return day in COPOM_DECISIONS
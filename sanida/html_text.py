@@ -0,0 +1,136 @@
+import re
+from html.parser import HTMLParser
+from typing import List, Optional, Sequence
+
+
+# Regiões de conteúdo das páginas gov.br (Plone). O texto fora delas (menus,
+# rodapé, barra do governo) não interessa às extrações e é descartado sem
+# montar árvore nenhuma.
+CONTENT_IDS = ("content-core", "content", "main-content", "conteudo")
+CONTENT_TAGS = ("article", "main")
+
+# Mesmo critério do BeautifulSoup.get_text: texto de script/style/template não conta.
+SKIP_TAGS = frozenset({"script", "style", "template"})
+
+FEED_CHUNK = 64 * 1024
+
+_WS = re.compile(r"\s+")
+
+
+class RegionTextParser(HTMLParser):
+    """
+    Coleta o texto (já com strip por nó, como get_text(" ", strip=True)) só dentro
+    da primeira região de conteúdo e de <table>s encontradas antes dela.
+    Com `whole_document=True` coleta o documento inteiro.
+    """
+
+    def __init__(
+        self,
+        content_ids: Sequence[str] = CONTENT_IDS,
+        content_tags: Sequence[str] = CONTENT_TAGS,
+        whole_document: bool = False,
+    ) -> None:
+        super().__init__(convert_charrefs=True)
+        self.content_ids = frozenset(content_ids)
+        self.content_tags = frozenset(content_tags)
+        self.whole_document = whole_document
+
+        self.parts: List[str] = []
+        self.done = False
+
+        self._pending: List[str] = []
+        self._region_tag: Optional[str] = None
+        self._region_level = 0
+        self._region_is_content = False
+        self._skip_level = 0
+
+    def _flush(self) -> None:
+        if self._pending:
+            text = "".join(self._pending).strip()
+            self._pending.clear()
+            if text:
+                self.parts.append(text)
+
+    def _capturing(self) -> bool:
+        return self.whole_document or self._region_tag is not None
+
+    def handle_starttag(self, tag, attrs):
+        self._flush()
+
+        if tag in SKIP_TAGS:
+            self._skip_level += 1
+            return
+
+        if self.done:
+            # o resto do bloco já entregue ao feed não abre região nova
+            return
+        if self._region_tag is None:
+            if tag in self.content_tags or dict(attrs).get("id") in self.content_ids:
+                self._region_tag = tag
+                self._region_level = 1
+                self._region_is_content = True
+            elif tag == "table":
+                self._region_tag = tag
+                self._region_level = 1
+                self._region_is_content = False
+        elif tag == self._region_tag:
+            self._region_level += 1
+
+    def handle_startendtag(self, tag, attrs):
+        self._flush()
+
+    def handle_endtag(self, tag):
+        self._flush()
+
+        if tag in SKIP_TAGS:
+            self._skip_level = max(self._skip_level - 1, 0)
+            return
+
+        if tag == self._region_tag:
+            self._region_level -= 1
+            if self._region_level == 0:
+                self._region_tag = None
+                if self._region_is_content and not self.whole_document:
+                    self.done = True
+
+    def handle_data(self, data):
+        if self._skip_level == 0 and self._capturing():
+            self._pending.append(data)
+
+    def handle_comment(self, data):
+        self._flush()
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def _run(html: str, parser: RegionTextParser) -> List[str]:
+    for start in range(0, len(html), FEED_CHUNK):
+        parser.feed(html[start:start + FEED_CHUNK])
+        if parser.done:
+            # região principal fechou: o resto do documento é rodapé/menus
+            break
+    parser.close()
+    return parser.parts
+
+
+def normalize_text(parts: Sequence[str]) -> str:
+    return _WS.sub(" ", " ".join(parts))
+
+
+def extract_text(html: str) -> str:
+    """
+    Texto normalizado (espaços colapsados) da região de conteúdo da página.
+    Se a página não tiver nenhuma região reconhecida, usa o documento inteiro.
+    Se a região achada não for a das tabelas, a extração falha sobre este
+    texto; sanida.fiscais.extract_page tenta então extract_full_text.
+    """
+    parts = _run(html, RegionTextParser())
+    if not parts:
+        parts = _run(html, RegionTextParser(whole_document=True))
+    return normalize_text(parts)
+
+
+def extract_full_text(html: str) -> str:
+    return normalize_text(_run(html, RegionTextParser(whole_document=True)))
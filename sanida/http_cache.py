@@ -0,0 +1,167 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Any, Dict, Mapping, Optional
+
+
+# Cache HTTP em disco para GETs condicionais (ETag / Last-Modified).
+# Cada URL vira um arquivo JSON com os validadores e o corpo; em 304 o corpo
+# salvo é servido. Entradas sem revalidação (200 ou 304) há mais que o TTL
+# são descartadas e o total em disco é limitado por SFA_HTTP_CACHE_MAX_BYTES
+# (remove as menos usadas).
+HTTP_CACHE_ENABLED = os.getenv("SFA_HTTP_CACHE", "1").strip() not in ("0", "false", "False")
+HTTP_CACHE_DIR = os.path.join(os.getenv("SFA_CACHE_DIR", ".cache").strip(), "http")
+HTTP_CACHE_TTL = int(os.getenv("SFA_HTTP_CACHE_TTL", str(7 * 24 * 3600)).strip())
+HTTP_CACHE_MAX_BYTES = int(os.getenv("SFA_HTTP_CACHE_MAX_BYTES", str(32 * 1024 * 1024)).strip())
+
+
+class HttpCache:
+    def __init__(self, directory: str, ttl: int, max_bytes: int) -> None:
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stored": 0, "evicted": 0, "bytes_saved": 0}
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json")
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self._stats[key] += n
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        path = self._path(url)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(entry, dict) or entry.get("url") != url or not isinstance(entry.get("body"), str):
+            return None
+
+        # idade desde a última validação: a gravação (200) ou o último 304,
+        # que renova o mtime em hit(); stored_at é só a data do corpo
+        try:
+            validated_at = max(os.path.getmtime(path), float(entry.get("stored_at", 0)))
+        except OSError:
+            return None
+        if time.time() - validated_at > self.ttl:
+            self._remove(path)
+            return None
+
+        return entry
+
+    def validators(self, entry: Mapping[str, Any]) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def hit(self, url: str, entry: Mapping[str, Any]) -> str:
+        """
+        Registra um 304: renova o mtime (uso, para o LRU, e validação, para o
+        TTL) e devolve o corpo em cache.
+        """
+        try:
+            os.utime(self._path(url))
+        except OSError:
+            pass
+        self._count("hits")
+        self._count("bytes_saved", len(entry["body"].encode("utf-8")))
+        return entry["body"]
+
+    def miss(self, url: str, headers: Mapping[str, str], body: str) -> None:
+        """
+        Registra um 200 completo e guarda o corpo se a resposta trouxer validadores.
+        """
+        self._count("misses")
+
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+
+        entry = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "stored_at": time.time(),
+            "body": body,
+        }
+
+        path = self._path(url)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp, path)
+        except OSError:
+            return
+
+        self._count("stored")
+        self.evict()
+
+    def evict(self) -> None:
+        with self._lock:
+            try:
+                names = [n for n in os.listdir(self.directory) if n.endswith(".json")]
+            except OSError:
+                return
+
+            files = []
+            total = 0
+            for name in names:
+                path = os.path.join(self.directory, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                files.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+
+            files.sort()
+            for _mtime, size, path in files:
+                if total <= self.max_bytes:
+                    break
+                if self._remove(path):
+                    self._stats["evicted"] += 1
+                    total -= size
+
+    def _remove(self, path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+
+_CACHE: Optional[HttpCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_cache() -> Optional[HttpCache]:
+    global _CACHE
+    if not HTTP_CACHE_ENABLED:
+        return None
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = HttpCache(HTTP_CACHE_DIR, HTTP_CACHE_TTL, HTTP_CACHE_MAX_BYTES)
+        return _CACHE
+
+
+def cache_stats() -> Dict[str, Any]:
+    cache = get_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
@@ -0,0 +1,270 @@
+import os
+import time
+import threading
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from sanida import cassette, http_cache, metrics, policy
+
+if TYPE_CHECKING:
+    import requests
+    from requests.adapters import HTTPAdapter
+
+# requests/urllib3 só são importados na primeira requisição: quem usa o módulo
+# apenas para estatísticas ou validação não paga ~150 ms de importação.
+
+
+# Uma Session por host: cada uma tem seu próprio pool de conexões keep-alive,
+# então N requisições ao mesmo host pagam um único handshake TCP+TLS.
+POOL_CONNECTIONS = int(os.getenv("SFA_HTTP_POOL_CONNECTIONS", "2").strip())
+POOL_MAXSIZE = int(os.getenv("SFA_HTTP_POOL_MAXSIZE", "8").strip())
+
+# Retentativas no nível do adapter cobrem só falhas de conexão (DNS, connect
+# recusado/timeout). Respostas 5xx continuam sendo tratadas pelo laço de fetch(),
+# para não multiplicar as tentativas.
+ADAPTER_RETRIES = int(os.getenv("SFA_HTTP_ADAPTER_RETRIES", "2").strip())
+
+# Requisições simultâneas por host, somando todos os threads do processo. Com
+# coletas de vários anos em paralelo, é isso que segura a carga sobre o gov.br.
+HOST_CONCURRENCY = int(os.getenv("SFA_HTTP_HOST_CONCURRENCY", "4").strip())
+
+# Redireciona hosts para outro endereço, ex. para os servidores locais de
+# benchmarks/: "https://www.gov.br=http://127.0.0.1:8001,https://api.bcb.gov.br=http://127.0.0.1:8001".
+# O cache, as sessões e as estatísticas continuam indexados pela URL original.
+HOST_OVERRIDES = dict(
+    (k.strip().rstrip("/").lower(), v.strip().rstrip("/"))
+    for k, _, v in (item.partition("=") for item in os.getenv("SFA_HOST_OVERRIDES", "").split(","))
+    if k.strip() and v.strip()
+)
+
+
+def host_key(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def rewrite_url(url: str) -> str:
+    if not HOST_OVERRIDES:
+        return url
+    target = HOST_OVERRIDES.get(host_key(url))
+    if target is None:
+        return url
+    parts = urlsplit(url)
+    return target + url[len(f"{parts.scheme}://{parts.netloc}"):]
+
+
+class HttpClient:
+    def __init__(
+        self,
+        pool_connections: int = POOL_CONNECTIONS,
+        pool_maxsize: int = POOL_MAXSIZE,
+        adapter_retries: int = ADAPTER_RETRIES,
+        host_concurrency: int = HOST_CONCURRENCY,
+    ) -> None:
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.adapter_retries = adapter_retries
+        self.host_concurrency = max(1, host_concurrency)
+        self._sessions: Dict[str, "requests.Session"] = {}
+        self._adapters: Dict[str, "HTTPAdapter"] = {}
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _new_adapter(self) -> "HTTPAdapter":
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        retry = Retry(
+            total=self.adapter_retries,
+            connect=self.adapter_retries,
+            read=0,
+            status=0,
+            other=0,
+            backoff_factor=0.3,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            raise_on_status=False,
+        )
+        return HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=retry,
+        )
+
+    def _host(self, url: str) -> Tuple["requests.Session", threading.BoundedSemaphore]:
+        key = host_key(url)
+        with self._lock:
+            s = self._sessions.get(key)
+            if s is None:
+                import requests
+
+                adapter = self._new_adapter()
+                s = requests.Session()
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                self._sessions[key] = s
+                self._adapters[key] = adapter
+                self._slots[key] = threading.BoundedSemaphore(self.host_concurrency)
+            self._calls[key] = self._calls.get(key, 0) + 1
+            return s, self._slots[key]
+
+    def session(self, url: str) -> "requests.Session":
+        return self._host(url)[0]
+
+    def get(self, url: str, **kwargs) -> "requests.Response":
+        s, slot = self._host(url)
+        with slot:
+            return s.get(rewrite_url(url), **kwargs)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Por host: chamadas feitas, requisições HTTP efetivas, conexões abertas
+        (= handshakes) e quantas requisições reaproveitaram conexão.
+        """
+        out: Dict[str, Dict[str, int]] = {}
+        with self._lock:
+            items = list(self._adapters.items())
+            calls = dict(self._calls)
+
+        for key, adapter in items:
+            n_requests = 0
+            n_connections = 0
+            pools = adapter.poolmanager.pools
+            for pool_key in list(pools.keys()):
+                pool = pools.get(pool_key)
+                if pool is None:
+                    continue
+                n_requests += int(getattr(pool, "num_requests", 0))
+                n_connections += int(getattr(pool, "num_connections", 0))
+
+            out[key] = {
+                "calls": calls.get(key, 0),
+                "requests": n_requests,
+                "connections": n_connections,
+                "reused": max(n_requests - n_connections, 0),
+            }
+        return out
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+            self._adapters.clear()
+            self._slots.clear()
+            self._calls.clear()
+        for s in sessions:
+            s.close()
+
+
+_CLIENT: Optional[HttpClient] = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_client() -> HttpClient:
+    global _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            _CLIENT = HttpClient()
+        return _CLIENT
+
+
+def connection_stats() -> Dict[str, Dict[str, int]]:
+    return get_client().stats()
+
+
+def _pause(seconds: float, cancel: Optional[threading.Event], rec: Optional[metrics.StageRecord] = None) -> None:
+    t0 = time.perf_counter()
+    if cancel is None:
+        time.sleep(seconds)
+    else:
+        cancel.wait(seconds)
+    if rec is not None:
+        rec.sleep += time.perf_counter() - t0
+
+
+def fetch(
+    url: str,
+    headers: Dict[str, str],
+    timeout: float,
+    retries: int,
+    verify: bool = True,
+    cancel: Optional[threading.Event] = None,
+) -> Tuple[bool, int, str]:
+    """
+    GET com retentativas em 5xx/exceções, espaçadas pelo backoff de
+    sanida.policy (com Retry-After), limitadas pelo prazo corrente e pelo
+    disjuntor do host. Se `cancel` for sinalizado, não inicia novas tentativas
+    (a requisição já em voo termina normalmente).
+
+    Com o cache HTTP ativo, envia If-None-Match/If-Modified-Since e, em 304,
+    devolve o corpo salvo como se fosse um 200.
+
+    Com SFA_RECORD/SFA_REPLAY (sanida.cassette), o resultado final é gravado ou
+    reproduzido; na reprodução não há rede, cache nem espera entre tentativas.
+
+    Cada chamada entra em sanida.metrics como etapa "http.fetch" do host.
+    """
+    with metrics.stage("http.fetch", urlsplit(url).netloc) as rec:
+        result = cassette.http(url, lambda: _fetch_live(url, headers, timeout, retries, verify, cancel, rec))
+        rec.error = not result[0]
+        return result
+
+
+def _fetch_live(
+    url: str,
+    headers: Dict[str, str],
+    timeout: float,
+    retries: int,
+    verify: bool = True,
+    cancel: Optional[threading.Event] = None,
+    rec: Optional[metrics.StageRecord] = None,
+) -> Tuple[bool, int, str]:
+    rec = rec or metrics.StageRecord()
+    client = get_client()
+    cache = http_cache.get_cache()
+    entry = cache.lookup(url) if cache is not None else None
+    if entry is not None:
+        headers = {**headers, **cache.validators(entry)}
+
+    host = host_key(url)
+    deadline = policy.current()
+    last_err = ""
+    for i in range(1, retries + 1):
+        if cancel is not None and cancel.is_set():
+            return False, 0, "cancelled"
+        if not policy.BREAKER.allow(host):
+            return False, 0, "circuit_open"
+        attempt_timeout = deadline.timeout(timeout)
+        if attempt_timeout is None:
+            return False, 0, "deadline_exceeded"
+
+        rec.retries = i - 1
+        retry_after = None
+        try:
+            r = client.get(url, headers=headers, timeout=attempt_timeout, verify=verify)
+            rec.bytes += len(r.content)
+            code = int(r.status_code)
+            if 500 <= code < 600:
+                policy.BREAKER.failure(host)
+                last_err = f"http_{code}"
+                retry_after = r.headers.get("Retry-After")
+            else:
+                policy.BREAKER.success(host)
+                if code == 304 and entry is not None:
+                    return True, 200, cache.hit(url, entry)
+                if code == 200:
+                    if cache is not None:
+                        cache.miss(url, r.headers, r.text)
+                    return True, code, r.text
+                return False, code, r.text[:500]
+        except Exception as e:
+            policy.BREAKER.failure(host)
+            last_err = f"exc_{type(e).__name__}"
+
+        if i == retries:
+            break
+        delay = policy.backoff(i, retry_after)
+        if not deadline.can_wait(delay):
+            return False, 0, f"{last_err};deadline_exceeded"
+        _pause(delay, cancel, rec)
+    return False, 0, last_err
@@ -0,0 +1,153 @@
+"""
+Métricas por etapa de uma execução: tempo de parede, bytes, retentativas,
+tempo dormindo entre tentativas e erros, agregados por (etapa, rótulo) —
+ex. ("http.fetch", "www.gov.br"), ("ftp.retr", "ftp.cetip.com.br"),
+("regex.extract", "irrf").
+
+As etapas podem se sobrepor (a descoberta da URL do INSS contém fetches) e
+rodam em threads paralelas, então a soma dos tempos não é o tempo da execução;
+`run_ms` é.
+
+`timings()` vai para meta.timings dos JSON publicados. Com SFA_METRICS_DIR,
+`export(script)` grava também <dir>/sanida_<script>.prom, no formato texto do
+Prometheus/OpenMetrics, para o textfile collector do node_exporter.
+"""
+import os
+import time
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+METRICS_DIR = os.getenv("SFA_METRICS_DIR", "").strip()
+
+
+class StageRecord:
+    __slots__ = ("bytes", "retries", "sleep", "error")
+
+    def __init__(self) -> None:
+        self.bytes = 0
+        self.retries = 0
+        self.sleep = 0.0
+        self.error = False
+
+
+class Metrics:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stages: Dict[Tuple[str, str], Dict[str, float]] = {}
+        self._started = time.perf_counter()
+        self._started_wall = time.time()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages = {}
+            self._started = time.perf_counter()
+            self._started_wall = time.time()
+
+    def add(self, stage: str, label: str, seconds: float, rec: StageRecord) -> None:
+        with self._lock:
+            agg = self._stages.get((stage, label))
+            if agg is None:
+                agg = {"count": 0, "seconds": 0.0, "bytes": 0, "retries": 0, "sleep": 0.0, "errors": 0}
+                self._stages[(stage, label)] = agg
+            agg["count"] += 1
+            agg["seconds"] += seconds
+            agg["bytes"] += rec.bytes
+            agg["retries"] += rec.retries
+            agg["sleep"] += rec.sleep
+            agg["errors"] += 1 if rec.error else 0
+
+    @contextmanager
+    def stage(self, stage: str, label: str = "all") -> Iterator[StageRecord]:
+        """
+        Mede o bloco; quem chama preenche bytes/retries/sleep no registro.
+        Exceção que escapa do bloco conta como erro (e é repassada).
+        """
+        rec = StageRecord()
+        t0 = time.perf_counter()
+        try:
+            yield rec
+        except BaseException:
+            rec.error = True
+            raise
+        finally:
+            self.add(stage, label, time.perf_counter() - t0, rec)
+
+    def snapshot(self) -> Tuple[float, float, Dict[Tuple[str, str], Dict[str, float]]]:
+        with self._lock:
+            stages = {k: dict(v) for k, v in self._stages.items()}
+            return self._started_wall, time.perf_counter() - self._started, stages
+
+    def timings(self) -> Dict[str, Any]:
+        _wall, run_seconds, stages = self.snapshot()
+        out: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (stage, label), agg in sorted(stages.items()):
+            out.setdefault(stage, {})[label] = {
+                "count": int(agg["count"]),
+                "wall_ms": round(agg["seconds"] * 1000.0, 1),
+                "bytes": int(agg["bytes"]),
+                "retries": int(agg["retries"]),
+                "sleep_ms": round(agg["sleep"] * 1000.0, 1),
+                "errors": int(agg["errors"]),
+            }
+        return {"run_ms": round(run_seconds * 1000.0, 1), "stages": out}
+
+    def openmetrics(self, script: str, success: bool) -> str:
+        started_wall, run_seconds, stages = self.snapshot()
+        families = [
+            ("sanida_stage_calls", "Chamadas da etapa na última execução", "count", 1.0),
+            ("sanida_stage_seconds", "Tempo de parede somado da etapa", "seconds", 1.0),
+            ("sanida_stage_bytes", "Bytes transferidos (ou processados, em parse/regex) pela etapa", "bytes", 1.0),
+            ("sanida_stage_retries", "Retentativas feitas pela etapa", "retries", 1.0),
+            ("sanida_stage_sleep_seconds", "Tempo dormindo entre tentativas", "sleep", 1.0),
+            ("sanida_stage_errors", "Chamadas da etapa que falharam", "errors", 1.0),
+        ]
+        lines: List[str] = []
+        for name, help_text, key, scale in families:
+            lines.append(f"# HELP {name} {help_text}.")
+            lines.append(f"# TYPE {name} gauge")
+            for (stage, label), agg in sorted(stages.items()):
+                labels = f'script="{_esc(script)}",stage="{_esc(stage)}",label="{_esc(label)}"'
+                lines.append(f"{name}{{{labels}}} {agg[key] * scale:.6g}")
+
+        run = f'script="{_esc(script)}"'
+        lines += [
+            "# HELP sanida_run_seconds Duração da última execução.",
+            "# TYPE sanida_run_seconds gauge",
+            f"sanida_run_seconds{{{run}}} {run_seconds:.6g}",
+            "# HELP sanida_run_start_timestamp_seconds Início da última execução (epoch).",
+            "# TYPE sanida_run_start_timestamp_seconds gauge",
+            f"sanida_run_start_timestamp_seconds{{{run}}} {started_wall:.3f}",
+            "# HELP sanida_run_success 1 se a última execução publicou dados novos.",
+            "# TYPE sanida_run_success gauge",
+            f"sanida_run_success{{{run}}} {1 if success else 0}",
+            "# EOF",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def export(self, script: str, success: bool, directory: str = METRICS_DIR) -> None:
+        if not directory:
+            return
+        path = os.path.join(directory, f"sanida_{script}.prom")
+        tmp = path + ".tmp"
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(self.openmetrics(script, success))
+            os.replace(tmp, path)
+        except OSError:
+            # métrica é só observabilidade; não derruba a coleta
+            pass
+
+
+def _esc(v: str) -> str:
+    return v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+METRICS = Metrics()
+
+stage = METRICS.stage
+reset = METRICS.reset
+timings = METRICS.timings
+export = METRICS.export
@@ -0,0 +1,244 @@
+"""
+Folha em CSV, em fluxo: INSS, IRRF e líquido para arquivos de qualquer
+tamanho, com as regras de dados_fiscais.json (sanida.calc).
+
+O processo principal só lê linhas e escreve texto. A entrada vem em blocos
+de CHUNK_ROWS linhas, que são distribuídos a um ProcessPoolExecutor. Cada
+worker carrega e compila as tabelas uma única vez, no initializer. Por bloco
+trafega só o texto das linhas, nas duas direções. No máximo
+MAX_INFLIGHT × workers blocos ficam em voo. A saída é gravada na ordem da
+entrada, à medida que o bloco mais antigo termina. Assim a memória não
+depende do tamanho do arquivo.
+
+Cada linha de saída é a linha de entrada seguida de inss, irrf e liquido
+(duas casas). Os campos não podem conter quebra de linha: os blocos são
+cortados por linha antes do parse.
+
+    python -m sanida folha entrada.csv saida.csv [--sep ";" --decimal ","]
+        [--workers N] [--chunk N] [--dados dados_fiscais.json]
+"""
+import os
+import io
+import sys
+import csv
+import time
+import argparse
+from collections import deque
+from itertools import islice
+from typing import Any, Deque, Dict, List, Optional, TextIO, Tuple
+
+from sanida.common import read_json
+
+
+DADOS_FILE = "dados_fiscais.json"
+CHUNK_ROWS = int(os.getenv("SFA_FOLHA_CHUNK_ROWS", "50000").strip())
+WORKERS = int(os.getenv("SFA_FOLHA_WORKERS", "0").strip())  # 0 = os.cpu_count()
+MAX_INFLIGHT = 2  # blocos em voo por worker
+
+SALARIO_COL = "salario"
+DEPENDENTES_COL = "dependentes"
+OUTPUT_COLS = ("inss", "irrf", "liquido")
+
+# estado de cada worker, preenchido uma vez por _init_worker
+_WORKER: Dict[str, Any] = {}
+
+
+def _init_worker(dados: Dict[str, Any], sal_idx: int, dep_idx: Optional[int], sep: str, decimal: str) -> None:
+    from sanida.tables import compile_tables
+
+    compile_tables(dados)  # compila e deixa no cache de sanida.tables
+    _WORKER.update(dados=dados, sal_idx=sal_idx, dep_idx=dep_idx, sep=sep, decimal=decimal)
+
+
+def _process_chunk(first_line: int, lines: List[str]) -> Tuple[int, str]:
+    """
+    Linhas de entrada (sem o fim de linha) -> (quantidade, texto de saída).
+    `first_line` é o número da primeira delas no arquivo (cabeçalho = 1).
+    """
+    import numpy as np
+
+    from sanida.calc import calcular_folha
+
+    w = _WORKER
+    sep, decimal, sal_idx, dep_idx = w["sep"], w["decimal"], w["sal_idx"], w["dep_idx"]
+    rows = list(csv.reader(lines, delimiter=sep))
+
+    def column(idx: int) -> np.ndarray:
+        raw = [r[idx] if idx < len(r) else "" for r in rows]
+        if decimal != ".":
+            raw = [v.replace(".", "").replace(decimal, ".") for v in raw]
+        raw = [v.strip() or "0" for v in raw]
+        try:
+            return np.array(raw, dtype=np.float64)
+        except ValueError:
+            pass
+        for i, v in enumerate(raw):
+            try:
+                float(v)
+            except ValueError:
+                value = rows[i][idx] if idx < len(rows[i]) else ""
+                raise RuntimeError(f"folha: linha {first_line + i}: valor numérico inválido {value!r}")
+        raise RuntimeError(f"folha: valor numérico inválido perto da linha {first_line}")
+
+    salarios = column(sal_idx)
+    dependentes = column(dep_idx) if dep_idx is not None else 0
+    r = calcular_folha(salarios, dependentes, w["dados"])
+
+    cols = [np.round(r[k], 2).tolist() for k in OUTPUT_COLS]
+    if decimal == ".":
+        tail = [f"{sep}{a:.2f}{sep}{b:.2f}{sep}{c:.2f}\n" for a, b, c in zip(*cols)]
+    else:
+        tail = [
+            f"{sep}{a:.2f}{sep}{b:.2f}{sep}{c:.2f}\n".replace(".", decimal) for a, b, c in zip(*cols)
+        ]
+    return len(lines), "".join(line + t for line, t in zip(lines, tail))
+
+
+def _chunks(f: TextIO, size: int, first_line: int = 2):
+    """
+    Blocos de até `size` linhas, com o número da primeira linha de cada um.
+    """
+    while True:
+        block = [line.rstrip("\r\n") for line in islice(f, size)]
+        if not block:
+            return
+        yield first_line, block
+        first_line += len(block)
+
+
+def run(
+    src: TextIO,
+    dst: TextIO,
+    dados: Dict[str, Any],
+    workers: int = WORKERS,
+    chunk_rows: int = CHUNK_ROWS,
+    sep: str = ",",
+    decimal: str = ".",
+    salario_col: str = SALARIO_COL,
+    dependentes_col: Optional[str] = DEPENDENTES_COL,
+) -> Dict[str, Any]:
+    """
+    Processa `src` inteiro e grava em `dst`. Devolve linhas, segundos e linhas/s.
+    `workers` <= 1 processa no próprio processo (sem pool).
+    """
+    header_line = src.readline().rstrip("\r\n")
+    if not header_line:
+        raise RuntimeError("folha: entrada vazia")
+    header = [h.strip() for h in next(csv.reader([header_line], delimiter=sep))]
+    if salario_col not in header:
+        raise RuntimeError(f"folha: coluna {salario_col!r} não encontrada em {header}")
+    sal_idx = header.index(salario_col)
+    dep_idx = header.index(dependentes_col) if dependentes_col and dependentes_col in header else None
+    dst.write(header_line + "".join(sep + c for c in OUTPUT_COLS) + "\n")
+
+    init_args = (dados, sal_idx, dep_idx, sep, decimal)
+    workers = workers if workers > 0 else (os.cpu_count() or 1)
+    chunk_rows = max(chunk_rows, 1)
+    total = 0
+    t0 = time.perf_counter()
+
+    if workers <= 1:
+        _init_worker(*init_args)
+        for first_line, block in _chunks(src, chunk_rows):
+            n, text = _process_chunk(first_line, block)
+            dst.write(text)
+            total += n
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        pending: Deque[Any] = deque()
+        limit = workers * MAX_INFLIGHT
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init_args) as pool:
+            try:
+                for first_line, block in _chunks(src, chunk_rows):
+                    if len(pending) >= limit:
+                        n, text = pending.popleft().result()
+                        dst.write(text)
+                        total += n
+                    pending.append(pool.submit(_process_chunk, first_line, block))
+                while pending:
+                    n, text = pending.popleft().result()
+                    dst.write(text)
+                    total += n
+            except BaseException:
+                # erro num bloco: os que ainda não começaram não precisam rodar
+                for fut in pending:
+                    fut.cancel()
+                raise
+
+    elapsed = time.perf_counter() - t0
+    return {
+        "rows": total,
+        "seconds": round(elapsed, 3),
+        "rows_per_s": round(total / elapsed) if elapsed > 0 else None,
+        "workers": workers,
+        "chunk_rows": chunk_rows,
+    }
+
+
+def _open(path: str, mode: str) -> TextIO:
+    if path == "-":
+        stream = sys.stdin if "r" in mode else sys.stdout
+        return io.TextIOWrapper(stream.buffer, encoding="utf-8", newline="" if "w" in mode else None, write_through=False)
+    return open(path, mode, encoding="utf-8", newline="" if "w" in mode else None, buffering=1 << 20)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(
+        prog="python -m sanida folha",
+        description="Calcula INSS, IRRF e líquido de um CSV de folha, em blocos e em paralelo.",
+    )
+    ap.add_argument("entrada", help="CSV com cabeçalho ('-' = stdin)")
+    ap.add_argument("saida", help="CSV de saída ('-' = stdout)")
+    ap.add_argument("--dados", default=DADOS_FILE, help="dados_fiscais.json (ou um ano de historico/fiscais/)")
+    ap.add_argument("--workers", type=int, default=WORKERS, help="processos (0 = número de CPUs, 1 = sem pool)")
+    ap.add_argument("--chunk", type=int, default=CHUNK_ROWS, help="linhas por bloco")
+    ap.add_argument("--sep", default=",")
+    ap.add_argument("--decimal", default=".", help="separador decimal dos valores (ex.: ',')")
+    ap.add_argument("--salario-col", default=SALARIO_COL)
+    ap.add_argument("--dependentes-col", default=DEPENDENTES_COL)
+    args = ap.parse_args(argv)
+
+    if args.sep == args.decimal:
+        ap.error("--sep e --decimal precisam ser diferentes")
+    dados = read_json(args.dados)
+    if not isinstance(dados, dict) or "irrf" not in dados:
+        print(f"ERRO: {args.dados} ausente ou não é um dados_fiscais.json")
+        return 1
+
+    # grava ao lado do destino e só troca (os.replace) se tudo deu certo: uma
+    # falha no meio não deixa um CSV truncado no lugar da saída
+    target = args.saida
+    out_path = target if target == "-" else f"{target}.{os.getpid()}.tmp"
+    try:
+        with _open(args.entrada, "r") as src, _open(out_path, "w") as dst:
+            stats = run(
+                src,
+                dst,
+                dados,
+                workers=args.workers,
+                chunk_rows=args.chunk,
+                sep=args.sep,
+                decimal=args.decimal,
+                salario_col=args.salario_col,
+                dependentes_col=args.dependentes_col,
+            )
+        if out_path != target:
+            os.replace(out_path, target)
+    except (RuntimeError, OSError) as e:
+        print(f"ERRO: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if out_path != target and os.path.exists(out_path):
+            os.remove(out_path)
+
+    print(
+        f"folha: {stats['rows']} linhas em {stats['seconds']:.2f} s "
+        f"({stats['rows_per_s'] or 0:,} linhas/s, {stats['workers']} workers, blocos de {stats['chunk_rows']})",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
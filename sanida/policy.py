@@ -0,0 +1,200 @@
+"""
+Política de tempo e de retentativas compartilhada por scraper.py e update_taxas.py.
+
+- Prazo global da execução (SFA_DEADLINE, segundos), repartido entre etapas com
+  `stage(nome, fração)`: cada etapa ganha até `fração × prazo total`, nunca além
+  do prazo de quem a contém. O prazo corrente vive num contextvar; funções
+  enviadas a pools de threads precisam passar por `bind()` para herdá-lo.
+- Backoff exponencial com teto e jitter completo; um Retry-After do servidor
+  é respeitado (e, se não couber no prazo, a retentativa não acontece).
+- Disjuntor por host: depois de SFA_BREAKER_THRESHOLD falhas seguidas
+  (exceção de rede ou 5xx), o host fica aberto até o fim da execução e as
+  chamadas seguintes falham na hora, sem rede.
+
+Com o prazo estourado ou o disjuntor aberto, os coletores falham rápido e o
+main cai no last-good dentro de um tempo previsível.
+"""
+import os
+import time
+import random
+import threading
+import contextvars
+import datetime as dt
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+
+DEADLINE_SECONDS = float(os.getenv("SFA_DEADLINE", "240").strip())
+BACKOFF_BASE = float(os.getenv("SFA_BACKOFF_BASE", "0.4").strip())
+BACKOFF_CAP = float(os.getenv("SFA_BACKOFF_CAP", "8").strip())
+BREAKER_THRESHOLD = int(os.getenv("SFA_BREAKER_THRESHOLD", "4").strip())
+
+
+class Deadline:
+    __slots__ = ("at", "total", "name")
+
+    def __init__(self, at: float, total: float, name: str = "run") -> None:
+        self.at = at
+        self.total = total
+        self.name = name
+
+    @classmethod
+    def after(cls, seconds: float, name: str = "run") -> "Deadline":
+        return cls(time.monotonic() + seconds, seconds, name)
+
+    def remaining(self) -> float:
+        return max(self.at - time.monotonic(), 0.0)
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.at
+
+    def timeout(self, wanted: float) -> Optional[float]:
+        """
+        Timeout para a próxima operação: o pedido, limitado ao que resta.
+        None se o prazo já acabou.
+        """
+        left = self.remaining()
+        if left <= 0.0:
+            return None
+        return min(wanted, left)
+
+    def can_wait(self, seconds: float) -> bool:
+        # esperar só faz sentido se ainda sobrar tempo para tentar de novo
+        return seconds < self.remaining()
+
+
+_CURRENT: contextvars.ContextVar[Deadline] = contextvars.ContextVar("sanida_deadline")
+
+
+def current() -> Deadline:
+    dl = _CURRENT.get(None)
+    if dl is None:
+        dl = Deadline.after(DEADLINE_SECONDS)
+        _CURRENT.set(dl)
+    return dl
+
+
+@contextmanager
+def stage(name: str, share: float) -> Iterator[Deadline]:
+    parent = current()
+    at = min(parent.at, time.monotonic() + share * parent.total)
+    token = _CURRENT.set(Deadline(at, parent.total, name))
+    try:
+        yield _CURRENT.get()
+    finally:
+        _CURRENT.reset(token)
+
+
+def within(name: str, share: float, fn: Callable[[], Any]) -> Callable[[], Any]:
+    """
+    `fn` rodando sob o prazo da etapa `name`, em qualquer thread.
+    """
+    def run() -> Any:
+        with stage(name, share):
+            return fn()
+
+    return bind(run)
+
+
+def bind(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Leva o contexto atual (prazo) junto com `fn` para outra thread.
+    """
+    ctx = contextvars.copy_context()
+
+    def run(*args: Any, **kwargs: Any) -> Any:
+        return ctx.run(fn, *args, **kwargs)
+
+    return run
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    import email.utils  # só para a forma HTTP-date, rara; ~10 ms de importação
+
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=dt.timezone.utc)
+    return max((when - dt.datetime.now(dt.timezone.utc)).total_seconds(), 0.0)
+
+
+_RNG = random.Random()
+_RNG_LOCK = threading.Lock()
+
+
+def backoff(attempt: int, retry_after: Optional[str] = None) -> float:
+    """
+    Espera antes da tentativa `attempt + 1`: Retry-After, se veio; senão,
+    uniforme em [0, min(teto, base × 2^(attempt-1))] (jitter completo).
+    """
+    hinted = parse_retry_after(retry_after)
+    if hinted is not None:
+        return hinted
+    ceiling = min(BACKOFF_CAP, BACKOFF_BASE * (2 ** max(attempt - 1, 0)))
+    with _RNG_LOCK:
+        return _RNG.uniform(0.0, ceiling)
+
+
+class CircuitBreaker:
+    def __init__(self, threshold: int = BREAKER_THRESHOLD) -> None:
+        self.threshold = max(1, threshold)
+        self._lock = threading.Lock()
+        self._failures: Dict[str, int] = {}
+        self._open: Dict[str, float] = {}
+
+    def allow(self, host: str) -> bool:
+        with self._lock:
+            return host not in self._open
+
+    def success(self, host: str) -> None:
+        with self._lock:
+            if host not in self._open:
+                self._failures[host] = 0
+
+    def failure(self, host: str) -> None:
+        with self._lock:
+            n = self._failures.get(host, 0) + 1
+            self._failures[host] = n
+            if n >= self.threshold and host not in self._open:
+                self._open[host] = time.time()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._failures.clear()
+            self._open.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "open": sorted(self._open),
+                "consecutive_failures": {h: n for h, n in sorted(self._failures.items()) if n},
+            }
+
+
+BREAKER = CircuitBreaker()
+
+
+def start_run(seconds: float = DEADLINE_SECONDS) -> Deadline:
+    """
+    Início de uma execução: prazo novo e disjuntores fechados.
+    """
+    BREAKER.reset()
+    dl = Deadline.after(seconds)
+    _CURRENT.set(dl)
+    return dl
+
+
+def stats() -> Dict[str, Any]:
+    dl = current()
+    return {
+        "deadline_s": round(dl.total, 1),
+        "remaining_s": round(dl.remaining(), 1),
+        "breaker": BREAKER.stats(),
+    }
@@ -0,0 +1,253 @@
+"""
+Variantes publicadas junto com dados_fiscais.json e taxas_bacen.json.
+
+Para cada <nome>.json gravado pelos coletores:
+
+    <nome>.min.json      JSON compacto (sem indentação)
+    <nome>.min.json.gz   o mesmo, gzip nível 9 com mtime=0 (bytes reprodutíveis)
+    <nome>.min.json.br   o mesmo, brotli qualidade 11 (se o pacote brotli existir)
+    <nome>.bin           tabelas em layout binário fixo (abaixo)
+
+Todas são geradas em arquivos temporários e trocadas por os.replace antes do
+JSON principal; assim, quando o .json novo aparece, as variantes dele já
+estão no lugar. Em seguida a versão entra no histórico (sanida.history).
+
+Layout do .bin (little-endian): cabeçalho de 24 bytes
+
+    magic "SFAB", versão (u8), tipo (u8: 1 fiscais, 2 taxas), ano (u16),
+    n_inss (u16), n_irrf (u16), 8 primeiros bytes do data_digest, 4 reservados
+
+seguido só de float64 (NaN = ausente), alinhados em 8 bytes:
+
+    fiscais: FISCAIS_SCALARS, n_inss × (limite, aliquota), n_irrf × (limite, aliquota, deducao)
+    taxas:   n_inss valores na ordem de TAXAS_FIELDS (n_irrf = 0)
+
+`read_binary`/`load_binary` devolvem um BinaryDocument com memoryviews sobre o
+buffer (ou sobre um mmap do arquivo): nada é copiado nem parseado.
+"""
+import os
+import sys
+import gzip
+import json
+import mmap
+import math
+import struct
+from array import array
+from typing import Any, Dict, Optional, Sequence
+
+from sanida import history
+from sanida.common import read_json, write_json_atomic
+
+
+VARIANTS_ENABLED = os.getenv("SFA_PUBLISH_VARIANTS", "1").strip() not in ("0", "false", "False")
+
+MAGIC = b"SFAB"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sBBHHH8s4x")
+
+KIND_FISCAIS = 1
+KIND_TAXAS = 2
+
+FISCAIS_SCALARS = (
+    "dep",
+    "simplificado",
+    "isenta_ate",
+    "reduz_ate",
+    "max_reducao_ate_5000",
+    "a",
+    "b",
+    "selic",
+    "cdi",
+)
+TAXAS_FIELDS = ("selic", "cdi", "selic_diaria", "cdi_diario", "selic_aa", "cdi_aa", "ipca_mensal", "ipca_12m")
+
+
+def _num(v: Any) -> float:
+    return float(v) if isinstance(v, (int, float)) and not isinstance(v, bool) else math.nan
+
+
+def _digest8(doc: Dict[str, Any]) -> bytes:
+    digest = str((doc.get("meta") or {}).get("data_digest", ""))
+    hexpart = digest.split(":", 1)[-1][:16]
+    try:
+        return bytes.fromhex(hexpart).ljust(8, b"\0")
+    except ValueError:
+        return b"\0" * 8
+
+
+def encode_binary(doc: Dict[str, Any]) -> bytes:
+    """
+    Documento (dados_fiscais ou taxas_bacen) no layout binário fixo.
+    """
+    values = array("d")
+    if "irrf" in doc:
+        irrf = doc["irrf"]
+        reducao = irrf.get("reducao_mensal") or {}
+        taxas = doc.get("taxas") or {}
+        scalars = {"dep": doc.get("dep"), "simplificado": irrf.get("simplificado"), **reducao, **taxas}
+        values.extend(_num(scalars.get(k)) for k in FISCAIS_SCALARS)
+        for row in doc["inss"]:
+            values.extend((_num(row["limite"]), _num(row["aliquota"])))
+        for row in irrf["tabela"]:
+            values.extend((_num(row["limite"]), _num(row["aliquota"]), _num(row.get("deducao", 0.0))))
+        header = HEADER.pack(
+            MAGIC, FORMAT_VERSION, KIND_FISCAIS, int(doc.get("ano") or 0), len(doc["inss"]), len(irrf["tabela"]), _digest8(doc)
+        )
+    else:
+        taxas = doc.get("taxas") or {}
+        values.extend(_num(taxas.get(k)) for k in TAXAS_FIELDS)
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, KIND_TAXAS, 0, len(TAXAS_FIELDS), 0, _digest8(doc))
+
+    if sys.byteorder != "little":
+        values.byteswap()
+    return header + values.tobytes()
+
+
+def _doubles(view: memoryview) -> memoryview:
+    if sys.byteorder == "little":
+        return view.cast("d")
+    # máquina big-endian: aqui não há como evitar a cópia
+    values = array("d", view.tobytes())
+    values.byteswap()
+    return memoryview(values)
+
+
+class BinaryDocument:
+    """
+    Visão somente leitura de um .bin. `inss[i, 0]` é o limite da faixa i e
+    `inss[i, 1]` a alíquota; `irrf[i, 0..2]` são limite, alíquota e dedução.
+    """
+
+    __slots__ = ("kind", "version", "year", "digest", "values", "inss", "irrf", "_names", "_owner")
+
+    def __init__(self, buf: Any, owner: Any = None) -> None:
+        mv = memoryview(buf)
+        if mv.nbytes < HEADER.size:
+            raise RuntimeError("binário: arquivo truncado")
+        magic, version, kind, year, n_a, n_b, digest = HEADER.unpack_from(mv, 0)
+        if magic != MAGIC or version != FORMAT_VERSION or kind not in (KIND_FISCAIS, KIND_TAXAS):
+            raise RuntimeError("binário: cabeçalho inválido")
+
+        names: Sequence[str] = FISCAIS_SCALARS if kind == KIND_FISCAIS else TAXAS_FIELDS[:n_a]
+        n_values = len(names) + (n_a * 2 + n_b * 3 if kind == KIND_FISCAIS else 0)
+        if mv.nbytes != HEADER.size + n_values * 8:
+            raise RuntimeError("binário: tamanho não confere com o cabeçalho")
+
+        body = _doubles(mv[HEADER.size:])
+        self.kind = kind
+        self.version = version
+        self.year = year
+        self.digest = digest.hex()
+        self.values = body[: len(names)]
+        self._names = {name: i for i, name in enumerate(names)}
+        self._owner = owner
+        if kind == KIND_FISCAIS:
+            start = len(names)
+            self.inss = body[start : start + n_a * 2].cast("B").cast("d", [n_a, 2])
+            start += n_a * 2
+            self.irrf = body[start : start + n_b * 3].cast("B").cast("d", [n_b, 3])
+        else:
+            self.inss = None
+            self.irrf = None
+
+    def get(self, name: str) -> Optional[float]:
+        i = self._names.get(name)
+        if i is None:
+            return None
+        v = self.values[i]
+        return None if math.isnan(v) else v
+
+    def __getitem__(self, name: str) -> float:
+        v = self.get(name)
+        if v is None:
+            raise KeyError(name)
+        return v
+
+    def tax_tables(self) -> Dict[str, Any]:
+        """
+        TaxTables (sanida.tables) de INSS e IRRF a partir das views.
+        """
+        from sanida.tables import TaxTable
+
+        if self.kind != KIND_FISCAIS:
+            raise RuntimeError("binário: documento de taxas não tem tabelas")
+        inss, irrf = self.inss, self.irrf
+        return {
+            "inss": TaxTable([inss[i, 0] for i in range(inss.shape[0])], [inss[i, 1] for i in range(inss.shape[0])]),
+            "irrf": TaxTable(
+                [irrf[i, 0] for i in range(irrf.shape[0])],
+                [irrf[i, 1] for i in range(irrf.shape[0])],
+                [irrf[i, 2] for i in range(irrf.shape[0])],
+            ),
+        }
+
+
+def read_binary(buf: Any) -> BinaryDocument:
+    return BinaryDocument(buf)
+
+
+def load_binary(path: str) -> BinaryDocument:
+    """
+    .bin mapeado em memória; o mmap vive enquanto o documento viver.
+    """
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return BinaryDocument(mm, owner=mm)
+
+
+def variant_paths(path: str) -> Dict[str, str]:
+    stem = path[:-5] if path.endswith(".json") else path
+    return {
+        "min": stem + ".min.json",
+        "gz": stem + ".min.json.gz",
+        "br": stem + ".min.json.br",
+        "bin": stem + ".bin",
+    }
+
+
+def render_variants(data: Dict[str, Any]) -> Dict[str, bytes]:
+    minified = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    out = {
+        "min": minified,
+        "gz": gzip.compress(minified, compresslevel=9, mtime=0),
+        "bin": encode_binary(data),
+    }
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+    if brotli is not None:
+        out["br"] = brotli.compress(minified, mode=brotli.MODE_TEXT, quality=11)
+    return out
+
+
+def variants_present(path: str) -> bool:
+    if not VARIANTS_ENABLED:
+        return True
+    return all(os.path.exists(p) for key, p in variant_paths(path).items() if key != "br")
+
+
+def write_published(data: Dict[str, Any], path: str) -> None:
+    """
+    Grava as variantes, o JSON principal (write_json_atomic) e, se a parte de
+    dados mudou, uma versão nova no histórico (sanida.history).
+    """
+    previous = read_json(path) if history.HISTORY_DIR else None
+    if VARIANTS_ENABLED:
+        paths = variant_paths(path)
+        blobs = render_variants(data)
+        staged = []
+        for key, blob in blobs.items():
+            tmp = paths[key] + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(blob)
+            staged.append((tmp, paths[key]))
+        for tmp, target in staged:
+            os.replace(tmp, target)
+        if "br" not in blobs and os.path.exists(paths["br"]):
+            # sem brotli nesta máquina: melhor nenhum .br do que um desatualizado
+            os.remove(paths["br"])
+    write_json_atomic(data, path)
+    if history.HISTORY_DIR:
+        # depois do JSON: se cair entre os dois, a próxima versão sai como snapshot
+        history.record(path, previous if isinstance(previous, dict) else None, data)
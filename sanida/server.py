@@ -0,0 +1,294 @@
+"""
+Servidor HTTP local, só leitura, para dados_fiscais.json e taxas_bacen.json.
+
+Os documentos ficam em memória já serializados (JSON compacto) e comprimidos
+com gzip, cada representação com um ETag forte; clientes que mandam
+If-None-Match recebem 304 sem corpo. Trechos dos documentos podem ser pedidos
+por caminho:
+
+    /dados_fiscais.json  /taxas_bacen.json     documento inteiro
+    /dados_fiscais/irrf/tabela                 trecho de um documento
+    /taxas  /irrf/tabela  /inss/0              atalho para trechos de dados_fiscais
+
+Quando write_json_atomic troca um arquivo (os.replace), a mudança de
+inode/mtime/tamanho é detectada por polling e o snapshot é trocado de uma vez;
+requisições em andamento continuam servindo o snapshot anterior.
+
+    python -m sanida serve [--host 127.0.0.1] [--port 8787] [--dir .]
+"""
+import os
+import sys
+import gzip
+import json
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+
+DOCUMENTS = {
+    "dados_fiscais": "dados_fiscais.json",
+    "taxas_bacen": "taxas_bacen.json",
+}
+DEFAULT_DOCUMENT = "dados_fiscais"
+
+POLL_INTERVAL = float(os.getenv("SFA_SERVE_POLL", "1.0").strip())
+MAX_CACHED_PARTS = 256
+
+_MISSING = object()
+
+
+class Representation:
+    __slots__ = ("body", "gzip_body", "etag", "gzip_etag")
+
+    def __init__(self, obj: Any) -> None:
+        self.body = json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.gzip_body = gzip.compress(self.body, compresslevel=6, mtime=0)
+        digest = hashlib.sha256(self.body).hexdigest()[:32]
+        # ETag forte precisa ser distinto por codificação
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gz"'
+
+
+class Snapshot:
+    """
+    Versão imutável de um documento carregado do disco.
+    """
+
+    def __init__(self, doc: Any, stamp: Tuple[int, int, int]) -> None:
+        self.doc = doc
+        self.stamp = stamp
+        self.full = Representation(doc)
+        self._parts: Dict[Tuple[str, ...], Representation] = {}
+        self._lock = threading.Lock()
+
+    def part(self, segments: Tuple[str, ...]) -> Optional[Representation]:
+        if not segments:
+            return self.full
+
+        with self._lock:
+            rep = self._parts.get(segments)
+        if rep is not None:
+            return rep
+
+        node = self.doc
+        for seg in segments:
+            if isinstance(node, dict):
+                node = node.get(seg, _MISSING)
+            elif isinstance(node, list) and seg.isdigit() and int(seg) < len(node):
+                node = node[int(seg)]
+            else:
+                node = _MISSING
+            if node is _MISSING:
+                return None
+
+        rep = Representation(node)
+        with self._lock:
+            if len(self._parts) < MAX_CACHED_PARTS:
+                self._parts[segments] = rep
+        return rep
+
+
+def _file_stamp(path: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+class DocumentStore:
+    def __init__(self, directory: str = ".", documents: Optional[Dict[str, str]] = None) -> None:
+        self.paths = {name: os.path.join(directory, fn) for name, fn in (documents or DOCUMENTS).items()}
+        self._snapshots: Dict[str, Snapshot] = {}
+        self._stop = threading.Event()
+        self.refresh()
+
+    def get(self, name: str) -> Optional[Snapshot]:
+        return self._snapshots.get(name)
+
+    def refresh(self) -> List[str]:
+        """
+        Recarrega os arquivos que mudaram desde o último snapshot e troca o
+        mapa inteiro numa única atribuição. Arquivo ilegível mantém o anterior.
+        """
+        current = self._snapshots
+        updated = dict(current)
+        changed: List[str] = []
+
+        for name, path in self.paths.items():
+            stamp = _file_stamp(path)
+            old = current.get(name)
+            if stamp is None or (old is not None and old.stamp == stamp):
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    doc = json.load(f)
+            except (OSError, ValueError):
+                continue
+            updated[name] = Snapshot(doc, stamp)
+            changed.append(name)
+
+        if changed:
+            self._snapshots = updated
+        return changed
+
+    def watch(self, interval: float = POLL_INTERVAL) -> threading.Thread:
+        def loop() -> None:
+            while not self._stop.wait(interval):
+                self.refresh()
+
+        t = threading.Thread(target=loop, name="sanida-watch", daemon=True)
+        t.start()
+        return t
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+def resolve(store: DocumentStore, path: str) -> Optional[Representation]:
+    segments = [unquote(s) for s in urlsplit(path).path.split("/") if s]
+    if not segments:
+        return None
+
+    head = segments[0]
+    if head.endswith(".json") and head[:-5] in store.paths and len(segments) == 1:
+        name, rest = head[:-5], ()
+    elif head in store.paths:
+        name, rest = head, tuple(segments[1:])
+    else:
+        name, rest = DEFAULT_DOCUMENT, tuple(segments)
+
+    snap = store.get(name)
+    if snap is None:
+        return None
+    return snap.part(rest)
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag == etag or tag == f"W/{etag}":
+            return True
+    return False
+
+
+def _accepts_gzip(header: Optional[str]) -> bool:
+    """
+    Accept-Encoding com q-values: "gzip;q=0" é recusa explícita; "*" vale
+    para gzip quando gzip não aparece por nome.
+    """
+    if not header:
+        return False
+    wildcard: Optional[float] = None
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding in ("gzip", "x-gzip"):
+            return q > 0
+        if coding == "*":
+            wildcard = q
+    return wildcard is not None and wildcard > 0
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "SanidaDados/1.0"
+    store: DocumentStore
+
+    def _send(self, head_only: bool) -> None:
+        if self.path.split("?", 1)[0] in ("/", "/healthz"):
+            index = {name: (snap.full.etag if snap else None) for name, snap in ((n, self.store.get(n)) for n in self.store.paths)}
+            rep = Representation({"documents": index})
+        else:
+            rep = resolve(self.store, self.path)
+
+        if rep is None:
+            body = b'{"error":"not_found"}'
+            self.send_response(404)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if not head_only:
+                self.wfile.write(body)
+            return
+
+        use_gzip = _accepts_gzip(self.headers.get("Accept-Encoding"))
+        etag = rep.gzip_etag if use_gzip else rep.etag
+        body = rep.gzip_body if use_gzip else rep.body
+
+        if _etag_matches(self.headers.get("If-None-Match"), etag):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Vary", "Accept-Encoding")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("ETag", etag)
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Cache-Control", "no-cache")
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not head_only:
+            self.wfile.write(body)
+
+    def do_GET(self):
+        self._send(head_only=False)
+
+    def do_HEAD(self):
+        self._send(head_only=True)
+
+    def log_message(self, format, *args):
+        if os.getenv("SFA_SERVE_LOG", "0").strip() not in ("0", "false", "False"):
+            super().log_message(format, *args)
+
+
+def make_server(host: str, port: int, store: DocumentStore) -> ThreadingHTTPServer:
+    handler = type("SanidaHandler", (Handler,), {"store": store})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m sanida serve", description="Serve dados_fiscais.json e taxas_bacen.json localmente.")
+    ap.add_argument("--host", default=os.getenv("SFA_SERVE_HOST", "127.0.0.1"))
+    ap.add_argument("--port", type=int, default=int(os.getenv("SFA_SERVE_PORT", "8787")))
+    ap.add_argument("--dir", default=".", help="diretório com os JSON publicados")
+    ap.add_argument("--poll", type=float, default=POLL_INTERVAL, help="intervalo (s) de checagem dos arquivos")
+    args = ap.parse_args(argv)
+
+    store = DocumentStore(args.dir)
+    store.watch(args.poll)
+    server = make_server(args.host, args.port, store)
+
+    print(f"Servindo {', '.join(store.paths.values())} em http://{args.host}:{server.server_address[1]}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store.stop()
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+"""
+Histórico local, só de acréscimo, de séries do SGS (BCB).
+
+Cada série fica em <dir>/<código>.bin: um cabeçalho de 16 bytes seguido de
+registros de largura fixa (data como ordinal uint32 + valor float64, 12 bytes),
+em ordem estritamente crescente de data. A primeira sincronização baixa a série
+inteira em janelas dataInicial/dataFinal; as seguintes pedem só o que veio
+depois do último ponto gravado.
+
+O diretório fica fora do git (cada ponto novo regrava o .bin inteiro como um
+blob novo); no CI ele persiste no cache do workflow de taxas.
+"""
+import os
+import struct
+import datetime as dt
+from array import array
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sanida.holidays import BRT
+
+
+SGS_DIR = os.getenv("SFA_SGS_DIR", os.path.join("historico", "sgs")).strip()
+
+MAGIC = b"SGS1"
+HEADER = struct.Struct("<4sIII")  # magic, versão, código da série, reservado
+RECORD = struct.Struct("<Id")  # date.toordinal(), valor
+FORMAT_VERSION = 1
+
+# O SGS limita consultas de séries diárias a 10 anos por requisição.
+WINDOW_DAYS = 3650
+
+SERIES_START = {
+    11: dt.date(1986, 6, 4),
+    12: dt.date(1986, 3, 6),
+    432: dt.date(1999, 3, 5),
+    1178: dt.date(1986, 6, 4),
+    4389: dt.date(1986, 3, 6),
+}
+DEFAULT_START = dt.date(1995, 1, 1)
+
+SGS_URL = "https://api.bcb.gov.br/dados/serie/bcdata.sgs.{code}/dados?formato=json&dataInicial={start}&dataFinal={end}"
+
+FetchJson = Callable[[str], Tuple[bool, int, Any]]
+
+
+class SeriesStore:
+    def __init__(self, code: int, directory: str = SGS_DIR) -> None:
+        self.code = int(code)
+        self.directory = directory
+        self.path = os.path.join(directory, f"{self.code}.bin")
+
+    def _check_header(self, raw: bytes) -> None:
+        magic, version, code, _ = HEADER.unpack(raw)
+        if magic != MAGIC or version != FORMAT_VERSION or code != self.code:
+            raise RuntimeError(f"SGS store: cabeçalho inválido em {self.path}")
+
+    def __len__(self) -> int:
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return 0
+        return max(size - HEADER.size, 0) // RECORD.size
+
+    def last(self) -> Optional[Tuple[dt.date, float]]:
+        n = len(self)
+        if n == 0:
+            return None
+        with open(self.path, "rb") as f:
+            self._check_header(f.read(HEADER.size))
+            f.seek(HEADER.size + (n - 1) * RECORD.size)
+            ordinal, value = RECORD.unpack(f.read(RECORD.size))
+        return dt.date.fromordinal(ordinal), value
+
+    def append(self, points: Iterable[Tuple[dt.date, float]]) -> int:
+        """
+        Acrescenta os pontos com data posterior ao último gravado; devolve quantos
+        entraram. Um registro parcial no fim (escrita interrompida) é descartado.
+        """
+        last = self.last()
+        last_ordinal = last[0].toordinal() if last else 0
+
+        buf = bytearray()
+        for day, value in sorted(points):
+            ordinal = day.toordinal()
+            if ordinal <= last_ordinal:
+                continue
+            buf += RECORD.pack(ordinal, float(value))
+            last_ordinal = ordinal
+
+        if not buf:
+            return 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        n = len(self)
+        with open(self.path, "r+b" if os.path.exists(self.path) else "w+b") as f:
+            if n == 0:
+                f.write(HEADER.pack(MAGIC, FORMAT_VERSION, self.code, 0))
+            f.truncate(HEADER.size + n * RECORD.size)
+            f.seek(0, os.SEEK_END)
+            f.write(buf)
+            f.flush()
+            os.fsync(f.fileno())
+        return len(buf) // RECORD.size
+
+    def read(self) -> Tuple[array, array]:
+        """
+        Série inteira como dois arrays compactos: ordinais de data (uint32) e valores (double).
+        """
+        dates = array("I")
+        values = array("d")
+        n = len(self)
+        if n == 0:
+            return dates, values
+        with open(self.path, "rb") as f:
+            self._check_header(f.read(HEADER.size))
+            raw = f.read(n * RECORD.size)
+        for ordinal, value in RECORD.iter_unpack(raw):
+            dates.append(ordinal)
+            values.append(value)
+        return dates, values
+
+    def __iter__(self) -> Iterator[Tuple[dt.date, float]]:
+        dates, values = self.read()
+        for ordinal, value in zip(dates, values):
+            yield dt.date.fromordinal(ordinal), value
+
+
+def _br_date(d: dt.date) -> str:
+    return d.strftime("%d/%m/%Y")
+
+
+def parse_points(data: Any) -> List[Tuple[dt.date, float]]:
+    if not isinstance(data, list):
+        raise RuntimeError("SGS store: resposta não é lista")
+    points: List[Tuple[dt.date, float]] = []
+    for row in data:
+        day = dt.datetime.strptime(str(row["data"]), "%d/%m/%Y").date()
+        points.append((day, float(str(row["valor"]).replace(",", "."))))
+    return points
+
+
+def fetch_window(code: int, start: dt.date, end: dt.date, fetch_json: FetchJson) -> List[Tuple[dt.date, float]]:
+    url = SGS_URL.format(code=code, start=_br_date(start), end=_br_date(end))
+    ok, http_code, data = fetch_json(url)
+    if not ok:
+        # o SGS responde 404 quando a janela não tem nenhum ponto
+        if http_code == 404:
+            return []
+        raise RuntimeError(f"BCB: falha SGS {code} {_br_date(start)}-{_br_date(end)} (status={http_code})")
+    return parse_points(data)
+
+
+def sync_series(
+    code: int,
+    fetch_json: FetchJson,
+    directory: str = SGS_DIR,
+    today: Optional[dt.date] = None,
+) -> Dict[str, Any]:
+    """
+    Traz a série local até hoje (data de Brasília): carga completa na primeira
+    vez, só o delta depois.
+    """
+    store = SeriesStore(code, directory)
+    today = today or dt.datetime.now(BRT).date()
+
+    last = store.last()
+    start = last[0] + dt.timedelta(days=1) if last else SERIES_START.get(code, DEFAULT_START)
+
+    added = 0
+    requests_made = 0
+    while start <= today:
+        end = min(start + dt.timedelta(days=WINDOW_DAYS - 1), today)
+        added += store.append(fetch_window(code, start, end, fetch_json))
+        requests_made += 1
+        start = end + dt.timedelta(days=1)
+
+    last = store.last()
+    return {
+        "points": len(store),
+        "added": added,
+        "requests": requests_made,
+        "last_date": last[0].isoformat() if last else None,
+    }
@@ -0,0 +1,227 @@
+"""
+Tabelas de INSS/IRRF compiladas a partir de dados_fiscais.json.
+
+`TaxTable` guarda os limites das faixas num array('d') compacto e já tem, para
+cada limite, a contribuição acumulada das faixas anteriores; assim o INSS
+progressivo de um salário é um bisect + uma conta, O(log n), sem percorrer as
+faixas nem criar listas. As instâncias são imutáveis e hasheáveis, e
+`compile_tables` devolve o mesmo objeto para o mesmo documento (ano,
+schema_version e conteúdo das tabelas).
+"""
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Mapping, Optional, Sequence, Tuple
+
+
+class TaxTable:
+    __slots__ = ("limits", "rates", "deductions", "cumulative", "_key", "_hash")
+
+    def __init__(self, limits: Sequence[float], rates: Sequence[float], deductions: Optional[Sequence[float]] = None) -> None:
+        if len(limits) != len(rates) or not limits:
+            raise ValueError("TaxTable: limites e alíquotas precisam ter o mesmo tamanho (>0)")
+        if deductions is None:
+            deductions = [0.0] * len(limits)
+        if len(deductions) != len(limits):
+            raise ValueError("TaxTable: deduções com tamanho diferente dos limites")
+        if any(b <= a for a, b in zip(limits, limits[1:])):
+            raise ValueError("TaxTable: limites precisam ser estritamente crescentes")
+
+        cumulative = array("d")
+        total = 0.0
+        lower = 0.0
+        for limit, rate in zip(limits, rates):
+            total += rate * (limit - lower)
+            cumulative.append(total)
+            lower = limit
+
+        key = (tuple(map(float, limits)), tuple(map(float, rates)), tuple(map(float, deductions)))
+        set_ = object.__setattr__
+        set_(self, "limits", array("d", key[0]))
+        set_(self, "rates", array("d", key[1]))
+        set_(self, "deductions", array("d", key[2]))
+        set_(self, "cumulative", cumulative)
+        set_(self, "_key", key)
+        set_(self, "_hash", hash(key))
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping[str, Any]]) -> "TaxTable":
+        ordered = sorted(rows, key=lambda r: r["limite"])
+        return cls(
+            [r["limite"] for r in ordered],
+            [r["aliquota"] for r in ordered],
+            [r.get("deducao", 0.0) for r in ordered],
+        )
+
+    def __setattr__(self, name, value):
+        raise AttributeError("TaxTable é imutável")
+
+    def __delattr__(self, name):
+        raise AttributeError("TaxTable é imutável")
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, TaxTable) and self._key == other._key
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __len__(self) -> int:
+        return len(self.limits)
+
+    def __repr__(self) -> str:
+        return f"TaxTable(limits={list(self.limits)!r}, rates={list(self.rates)!r})"
+
+    def bracket(self, amount: float) -> int:
+        """
+        Índice da faixa em que `amount` cai (limite superior inclusivo); valores
+        acima do último limite ficam na última faixa.
+        """
+        i = bisect_left(self.limits, amount)
+        last = len(self.limits) - 1
+        return i if i < last else last
+
+    def progressive(self, amount: float) -> float:
+        """
+        Contribuição progressiva (cada alíquota só sobre a parcela dentro da sua
+        faixa), limitada ao último limite.
+        """
+        if amount <= 0.0:
+            return 0.0
+        i = bisect_left(self.limits, amount)
+        if i >= len(self.limits):
+            return self.cumulative[-1]
+        if i == 0:
+            return self.rates[0] * amount
+        return self.cumulative[i - 1] + self.rates[i] * (amount - self.limits[i - 1])
+
+    def marginal(self, amount: float) -> float:
+        """
+        Imposto pela alíquota cheia da faixa menos a parcela a deduzir (IRRF).
+        """
+        if amount <= 0.0:
+            return 0.0
+        i = self.bracket(amount)
+        v = amount * self.rates[i] - self.deductions[i]
+        return v if v > 0.0 else 0.0
+
+
+class FiscalTables:
+    __slots__ = ("ano", "schema_version", "inss", "irrf", "dep", "simplificado", "reducao", "_hash")
+
+    def __init__(
+        self,
+        ano: int,
+        schema_version: str,
+        inss: TaxTable,
+        irrf: TaxTable,
+        dep: float,
+        simplificado: float,
+        reducao: Optional[Tuple[float, Optional[float], Optional[float], Optional[float], Optional[float]]],
+    ) -> None:
+        set_ = object.__setattr__
+        set_(self, "ano", ano)
+        set_(self, "schema_version", schema_version)
+        set_(self, "inss", inss)
+        set_(self, "irrf", irrf)
+        set_(self, "dep", dep)
+        set_(self, "simplificado", simplificado)
+        set_(self, "reducao", reducao)
+        set_(self, "_hash", hash((ano, schema_version, inss, irrf, dep, simplificado, reducao)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FiscalTables é imutável")
+
+    def __delattr__(self, name):
+        raise AttributeError("FiscalTables é imutável")
+
+    def _tuple(self):
+        return (self.ano, self.schema_version, self.inss, self.irrf, self.dep, self.simplificado, self.reducao)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, FiscalTables) and self._tuple() == other._tuple()
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"FiscalTables(ano={self.ano!r}, schema_version={self.schema_version!r})"
+
+    def inss_mensal(self, salario: float) -> float:
+        return self.inss.progressive(salario)
+
+    def irrf_mensal(self, salario: float, dependentes: int = 0, inss: Optional[float] = None) -> float:
+        """
+        Mesmas regras de sanida.calc.calcular_folha, para um salário só.
+        """
+        if inss is None:
+            inss = self.inss.progressive(salario)
+
+        deducao = inss + dependentes * self.dep
+        if self.simplificado > deducao:
+            deducao = self.simplificado
+        base = salario - deducao
+        imposto = self.irrf.marginal(base) if base > 0.0 else 0.0
+
+        red = self.reducao
+        if red is None or imposto == 0.0:
+            return imposto
+
+        isenta_ate, reduz_ate, teto, a, b = red
+        if salario <= isenta_ate:
+            reducao = imposto if teto is None else min(imposto, teto)
+        elif reduz_ate is not None and a is not None and b is not None and salario <= reduz_ate:
+            reducao = min(max(a - b * salario, 0.0), imposto)
+        else:
+            reducao = 0.0
+        return imposto - reducao
+
+    def liquido(self, salario: float, dependentes: int = 0) -> float:
+        inss = self.inss.progressive(salario)
+        return salario - inss - self.irrf_mensal(salario, dependentes, inss)
+
+
+def _opt(v: Any) -> Optional[float]:
+    return None if v is None else float(v)
+
+
+def _rows_key(rows: Iterable[Mapping[str, Any]]) -> Tuple[Tuple[float, float, float], ...]:
+    return tuple(sorted((float(r["limite"]), float(r["aliquota"]), float(r.get("deducao", 0.0))) for r in rows))
+
+
+@lru_cache(maxsize=32)
+def _compile(
+    ano: int,
+    schema_version: str,
+    inss_rows: Tuple[Tuple[float, float, float], ...],
+    irrf_rows: Tuple[Tuple[float, float, float], ...],
+    dep: float,
+    simplificado: float,
+    reducao: Optional[Tuple[float, Optional[float], Optional[float], Optional[float], Optional[float]]],
+) -> FiscalTables:
+    inss = TaxTable([r[0] for r in inss_rows], [r[1] for r in inss_rows])
+    irrf = TaxTable([r[0] for r in irrf_rows], [r[1] for r in irrf_rows], [r[2] for r in irrf_rows])
+    return FiscalTables(ano, schema_version, inss, irrf, dep, simplificado, reducao)
+
+
+def compile_tables(dados: Dict[str, Any]) -> FiscalTables:
+    irrf = dados["irrf"]
+    red = irrf.get("reducao_mensal") or {}
+    reducao = None
+    if red.get("isenta_ate") is not None:
+        reducao = (
+            float(red["isenta_ate"]),
+            _opt(red.get("reduz_ate")),
+            _opt(red.get("max_reducao_ate_5000")),
+            _opt(red.get("a")),
+            _opt(red.get("b")),
+        )
+
+    return _compile(
+        int(dados["ano"]),
+        str(dados.get("schema_version", "")),
+        _rows_key(dados["inss"]),
+        _rows_key(irrf["tabela"]),
+        float(dados["dep"]),
+        float(irrf["simplificado"]),
+        reducao,
+    )
@@ -0,0 +1,364 @@
+"""
+Coletor de taxas_bacen.json: Selic e séries do SGS (BCB) e a Taxa DI da B3.
+
+    python -m sanida taxas [--daemon]
+"""
+import os
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from sanida import cassette, common, digest, holidays, http_cache, http_client, metrics, policy, publish, sgs_store
+from sanida.common import now_utc_iso, read_json, round_tree
+
+
+OUTPUT_FILE = "taxas_bacen.json"
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; SanidaTaxasBot/1.3; +https://sanida.com.br)",
+    "Accept": "application/json,text/plain,*/*",
+    "Accept-Language": "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
+    "Connection": "keep-alive",
+}
+
+
+class SgsSeries(NamedTuple):
+    key: str
+    code: int
+    min_value: float
+    max_value: float
+    decimals: int = 2
+    required: bool = False
+
+
+# Registro das séries SGS publicadas em `taxas`. Todas são buscadas em paralelo,
+# pelo pool HTTP compartilhado; só as `required` derrubam a coleta se falharem,
+# as demais simplesmente ficam de fora (com o erro em meta.sources.sgs).
+SGS_SERIES: List[SgsSeries] = [
+    SgsSeries("selic", 432, 0, 60, required=True),  # meta Selic, % a.a.
+    SgsSeries("selic_diaria", 11, 0, 0.3, decimals=6),  # Selic, % a.d.
+    SgsSeries("cdi_diario", 12, 0, 0.3, decimals=6),  # CDI, % a.d.
+    SgsSeries("selic_aa", 1178, 0, 60),  # Selic anualizada base 252, % a.a.
+    SgsSeries("cdi_aa", 4389, 0, 60),  # CDI anualizado base 252, % a.a.
+    SgsSeries("ipca_mensal", 433, -5, 10),  # IPCA, variação % no mês
+    SgsSeries("ipca_12m", 13522, -5, 50),  # IPCA acumulado em 12 meses, %
+]
+
+SGS_CONCURRENCY = int(os.getenv("SFA_SGS_CONCURRENCY", "8").strip())
+
+# Fração do prazo da execução (SFA_DEADLINE) que cada etapa pode consumir.
+STAGE_SHARES = {
+    "sgs_history": 0.3,
+    "rates": 0.6,
+}
+
+# Séries SGS mantidas em histórico local (sanida.sgs_store), as mesmas de
+# sanida.asof.RATE_SERIES: meta Selic, Selic e CDI diários e anualizados.
+# Vazio desativa.
+SGS_HISTORY_SERIES = [int(c) for c in os.getenv("SFA_SGS_HISTORY_SERIES", "432,11,12,1178,4389").replace(",", " ").split()]
+
+# Mantido propositalmente como fallback estático por enquanto.
+FALLBACK_SELIC = 15.00
+FALLBACK_CDI = 14.90
+
+
+def fetch_json(url: str) -> Tuple[bool, int, Any]:
+    return common.fetch_json(url, HEADERS)
+
+
+def sgs_last_point(code: int) -> Tuple[Optional[str], float]:
+    url = f"https://api.bcb.gov.br/dados/serie/bcdata.sgs.{code}/dados/ultimos/1?formato=json"
+    ok, http_code, data = fetch_json(url)
+    if not ok:
+        raise RuntimeError(f"BCB: falha SGS {code} (status={http_code})")
+    if not isinstance(data, list) or not data or "valor" not in data[0]:
+        raise RuntimeError(f"BCB: shape inválido SGS {code}")
+    v = str(data[0]["valor"]).replace(",", ".")
+    return data[0].get("data"), float(v)
+
+
+def sgs_last(code: int) -> float:
+    return sgs_last_point(code)[1]
+
+
+def fetch_sgs_series(series: SgsSeries) -> Dict[str, Any]:
+    """
+    Último ponto de uma série do registro, validado contra a faixa da série.
+    Nunca levanta: o erro vai no próprio resultado.
+    """
+    t0 = time.perf_counter()
+    out: Dict[str, Any] = {"code": series.code, "ok": False, "value": None, "date": None, "error": None}
+    try:
+        date, value = sgs_last_point(series.code)
+        if not (series.min_value <= value <= series.max_value):
+            raise RuntimeError(f"BCB: SGS {series.code} fora de faixa: {value}")
+        out.update(ok=True, value=round(value, series.decimals), date=date)
+    except Exception as e:
+        out["error"] = str(e)
+    out["ms"] = round((time.perf_counter() - t0) * 1000.0, 1)
+    return out
+
+
+def fetch_rates() -> Dict[str, Any]:
+    """
+    Todas as séries do registro SGS e o CDI da B3 (FTP) ao mesmo tempo: a
+    latência total é a da fonte mais lenta, não a soma delas.
+    """
+    from sanida import b3_cdi
+
+    with ThreadPoolExecutor(max_workers=max(1, SGS_CONCURRENCY), thread_name_prefix="sgs") as pool:
+        cdi_future = pool.submit(policy.bind(b3_cdi.fetch_b3_cdi_ftp))
+        sgs_futures = {series.key: pool.submit(policy.bind(fetch_sgs_series), series) for series in SGS_SERIES}
+        sgs = {key: fut.result() for key, fut in sgs_futures.items()}
+        cdi_info = cdi_future.result()
+
+    for series in SGS_SERIES:
+        if series.required and not sgs[series.key]["ok"]:
+            raise RuntimeError(sgs[series.key]["error"])
+
+    extras = {
+        series.key: sgs[series.key]["value"]
+        for series in SGS_SERIES
+        if series.key != "selic" and sgs[series.key]["ok"]
+    }
+
+    return {
+        "selic": round(sgs["selic"]["value"], 2),
+        "cdi": round(float(cdi_info["value"]), 2),
+        "cdi_basis": "b3_ftp_taxa_di_txt_aa",
+        "extras": extras,
+        "sgs": sgs,
+        "sources": {
+            "selic": "sgs_432",
+            "cdi": "b3_ftp_taxa_di_txt",
+        },
+        "source_meta": {
+            "cdi_ftp_host": cdi_info["ftp_host"],
+            "cdi_ftp_path": cdi_info["ftp_path"],
+            "cdi_ftp_filename": cdi_info["ftp_filename"],
+            "cdi_raw_sample": cdi_info["raw_sample"],
+        },
+    }
+
+
+def carry_forward_extras(extras: Dict[str, Any], sgs: Dict[str, Any], previous: Optional[Dict[str, Any]]) -> List[str]:
+    """
+    Série opcional que falhou nesta execução fica com o valor do
+    taxas_bacen.json publicado, em vez de sumir do documento (e mudar o
+    digest só por causa de uma falha transitória). Devolve os warnings.
+    """
+    warnings: List[str] = []
+    previous = previous or {}
+    for series in SGS_SERIES:
+        if series.key == "selic" or series.key in extras:
+            continue
+        value = previous.get(series.key)
+        if isinstance(value, (int, float)) and series.min_value <= value <= series.max_value:
+            extras[series.key] = value
+            sgs[series.key]["carried_forward"] = True
+            warnings.append(f"sgs:{series.code}:valor_anterior_mantido:{sgs[series.key]['error']}")
+    return warnings
+
+
+def sync_sgs_history() -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Atualiza o histórico local das séries configuradas. Falha aqui não impede a
+    publicação das taxas: vira warning.
+
+    Série que já tem o ponto do dia útil anterior não é consultada (o do dia
+    só sai depois do fechamento; entra na execução seguinte a ele); as demais
+    são sincronizadas em paralelo. Em regime, a maioria das execuções de 15
+    minutos não faz nenhuma requisição aqui.
+    """
+    today = cassette.today()
+    current_since = holidays.previous_business_day(today)
+    summary: Dict[str, Any] = {}
+    warnings: List[str] = []
+
+    pending: List[int] = []
+    for code in SGS_HISTORY_SERIES:
+        last = sgs_store.SeriesStore(code).last()
+        if last is not None and last[0] >= current_since:
+            summary[str(code)] = {"points": None, "added": 0, "requests": 0, "last_date": last[0].isoformat(), "skipped": True}
+        else:
+            pending.append(code)
+
+    def sync(code: int) -> Dict[str, Any]:
+        with metrics.stage("sgs.history", str(code)):
+            return sgs_store.sync_series(code, fetch_json, today=today)
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=max(1, min(SGS_CONCURRENCY, len(pending))), thread_name_prefix="sgs-hist") as pool:
+            futures = {code: pool.submit(policy.bind(sync), code) for code in pending}
+            for code, fut in futures.items():
+                try:
+                    summary[str(code)] = fut.result()
+                except Exception as e:
+                    warnings.append(f"sgs_history:{code}:{e}")
+    return summary, warnings
+
+
+def validate_payload(d: Dict[str, Any]) -> Tuple[bool, List[str]]:
+    errs: List[str] = []
+
+    if not isinstance(d, dict):
+        return False, ["payload:not_dict"]
+
+    if "meta" not in d or not isinstance(d["meta"], dict):
+        errs.append("meta:missing_or_bad")
+    else:
+        if not isinstance(d["meta"].get("generated_at_utc"), str):
+            errs.append("meta.generated_at_utc:missing_or_bad")
+
+    taxas = d.get("taxas")
+    if not isinstance(taxas, dict):
+        errs.append("taxas:missing_or_bad")
+    else:
+        if not isinstance(taxas.get("selic"), (int, float)):
+            errs.append("taxas.selic:missing_or_bad")
+        if not isinstance(taxas.get("cdi"), (int, float)):
+            errs.append("taxas.cdi:missing_or_bad")
+
+        if isinstance(taxas.get("selic"), (int, float)) and not (0 <= taxas["selic"] <= 60):
+            errs.append("taxas.selic:out_of_range")
+        if isinstance(taxas.get("cdi"), (int, float)) and not (0 <= taxas["cdi"] <= 60):
+            errs.append("taxas.cdi:out_of_range")
+
+        for series in SGS_SERIES:
+            if series.key == "selic" or series.key not in taxas:
+                continue
+            v = taxas[series.key]
+            if not isinstance(v, (int, float)):
+                errs.append(f"taxas.{series.key}:bad")
+            elif not (series.min_value <= v <= series.max_value):
+                errs.append(f"taxas.{series.key}:out_of_range")
+
+    return (len(errs) == 0), errs
+
+
+def run_once():
+    metrics.reset()
+    policy.start_run()
+    existing = read_json(OUTPUT_FILE)
+    existing_ok = False
+    if isinstance(existing, dict):
+        existing_ok, _ = validate_payload(existing)
+
+    errors: List[str] = []
+    warnings: List[str] = []
+    sources: Dict[str, Any] = {}
+
+    if SGS_HISTORY_SERIES:
+        with policy.stage("sgs_history", STAGE_SHARES["sgs_history"]):
+            sources["sgs_history"], history_warnings = sync_sgs_history()
+        warnings.extend(history_warnings)
+
+    try:
+        with policy.stage("rates", STAGE_SHARES["rates"]):
+            taxas = fetch_rates()
+        previous = existing.get("taxas") if existing_ok else None
+        warnings.extend(carry_forward_extras(taxas["extras"], taxas["sgs"], previous))
+
+        sources["selic"] = {"source": taxas["sources"]["selic"]}
+        sources["cdi"] = {
+            "source": taxas["sources"]["cdi"],
+            "ftp_host": taxas["source_meta"]["cdi_ftp_host"],
+            "ftp_path": taxas["source_meta"]["cdi_ftp_path"],
+            "ftp_filename": taxas["source_meta"]["cdi_ftp_filename"],
+            "raw_sample": taxas["source_meta"]["cdi_raw_sample"],
+        }
+        sources["sgs"] = taxas["sgs"]
+        sources["http"] = http_client.connection_stats()
+        sources["http_cache"] = http_cache.cache_stats()
+        sources["policy"] = policy.stats()
+
+        payload = {
+            "schema_version": "1.4.0",
+            "meta": {
+                "generated_at_utc": now_utc_iso(),
+                "sources": sources,
+                "errors": [],
+                "warnings": warnings,
+                "timings": metrics.timings(),
+            },
+            "taxas": {
+                "selic": float(taxas["selic"]),
+                "cdi": float(taxas["cdi"]),
+                "cdi_basis": taxas.get("cdi_basis"),
+                **taxas["extras"],
+            },
+        }
+
+        payload = round_tree(payload)
+        ok, verrs = validate_payload(payload)
+
+        if ok:
+            if digest.write_if_changed(
+                OUTPUT_FILE,
+                payload,
+                lambda d: publish.write_published(d, OUTPUT_FILE),
+                force=not publish.variants_present(OUTPUT_FILE),
+            ):
+                print("OK: taxas_bacen.json atualizado.")
+            else:
+                print("OK: dados inalterados; taxas_bacen.json mantido (só o heartbeat mudou).")
+            metrics.export("update_taxas", True)
+            return
+
+        errors.extend(verrs)
+    except Exception as e:
+        errors.append(str(e))
+
+    if existing_ok:
+        digest.write_heartbeat(OUTPUT_FILE, digest.data_digest(existing), False, success=False)
+        metrics.export("update_taxas", False)
+        print("WARN: coleta falhou, mantendo last-good (nenhuma alteração no JSON).")
+        print("Erros:", errors)
+        return
+
+    sources["http"] = http_client.connection_stats()
+    sources["http_cache"] = http_cache.cache_stats()
+    sources["policy"] = policy.stats()
+
+    fallback_payload = {
+        "schema_version": "1.4.0",
+        "meta": {
+            "generated_at_utc": now_utc_iso(),
+            "sources": sources,
+            "errors": errors,
+            "warnings": warnings + ["minimal_fallback_written", "static_reference_values"],
+            "timings": metrics.timings(),
+        },
+        "taxas": {
+            "selic": FALLBACK_SELIC,
+            "cdi": FALLBACK_CDI,
+            "cdi_basis": "fallback",
+        },
+    }
+
+    digest.write_if_changed(
+        OUTPUT_FILE, round_tree(fallback_payload), lambda d: publish.write_published(d, OUTPUT_FILE), success=False
+    )
+    metrics.export("update_taxas", False)
+    print("WARN: sem last-good; escrevi fallback mínimo em taxas_bacen.json.")
+
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(prog="python -m sanida taxas", description="Atualiza taxas_bacen.json (Selic, CDI e séries do SGS).")
+    ap.add_argument(
+        "--daemon",
+        action="store_true",
+        help="fica residente e repete a coleta com intervalo adaptativo (sanida/daemon.py)",
+    )
+    args = ap.parse_args(argv)
+
+    if args.daemon:
+        from sanida import daemon
+
+        return daemon.run_forever(run_once, OUTPUT_FILE, "taxas")
+    return run_once()
+
+
+if __name__ == "__main__":
+    main()
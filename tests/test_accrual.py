@@ -0,0 +1,100 @@
+import datetime as dt
+
+import numpy as np
+import pytest
+
+from sanida import holidays
+from sanida.accrual import DAILY_DECIMALS, DailyCurve, accrual_factors, annual_to_daily, revalue
+
+
+def loop_factor(start, end, pct, rates):
+    """
+    Referência: produto dia a dia de (1 + d × pct) nos dias com taxa em [start, end).
+    """
+    factor = 1.0
+    for day in holidays.anbima_days(start, end):
+        factor *= 1.0 + round(rates[day] / 100.0, DAILY_DECIMALS) * pct / 100.0
+    return factor
+
+
+@pytest.fixture
+def published():
+    # uma taxa diferente por dia publicado, atravessando a virada de ano
+    days = list(holidays.anbima_days(dt.date(2024, 11, 1), dt.date(2025, 3, 1)))
+    rates = {d: 0.04 + 0.0001 * i for i, d in enumerate(days)}
+    return days, rates
+
+
+def test_fatores_iguais_ao_laco(published):
+    days, rates = published
+    curve = DailyCurve.from_series([d.isoformat() for d in days], [rates[d] for d in days])
+    rng = np.random.default_rng(7)
+    first, last = days[0].toordinal(), curve.end
+    starts = rng.integers(first, last, 50)
+    ends = np.minimum(starts + rng.integers(0, 90, 50), last)
+    pct = rng.choice([90.0, 100.0, 110.0], 50)
+
+    got = accrual_factors(curve, pct, starts, ends)
+    for s, e, p, g in zip(starts, ends, pct, got):
+        s, e = dt.date.fromordinal(int(s)), dt.date.fromordinal(int(e))
+        assert g == pytest.approx(loop_factor(s, e, p, rates), rel=1e-12)
+
+    principal = np.full(50, 1000.0)
+    np.testing.assert_allclose(revalue(curve, principal, pct, starts, ends), principal * got)
+
+
+def test_virada_de_ano_usa_24_e_31_de_dezembro(published):
+    days, rates = published
+    assert dt.date(2024, 12, 24) in days and dt.date(2024, 12, 31) in days
+    assert not holidays.is_business_day(dt.date(2024, 12, 31))  # sem pregão, mas com DI
+
+    curve = DailyCurve.from_series(days, [rates[d] for d in days])
+    f = accrual_factors(curve, 100.0, "2024-12-23", "2025-01-03")
+    # 23, 24, 26, 27, 30, 31/12 e 02/01
+    expected = np.prod([1.0 + round(rates[d] / 100.0, DAILY_DECIMALS) for d in days if dt.date(2024, 12, 23) <= d < dt.date(2025, 1, 3)])
+    assert len([d for d in days if dt.date(2024, 12, 23) <= d < dt.date(2025, 1, 3)]) == 7
+    assert f == pytest.approx(expected, rel=1e-12)
+
+
+def test_lacunas_repetem_taxa_anterior():
+    curve = DailyCurve.from_series(["2025-01-06", "2025-01-02"], [0.05, 0.04])
+    assert [dt.date.fromordinal(int(d)) for d in curve.dates] == [
+        dt.date(2025, 1, 2), dt.date(2025, 1, 3), dt.date(2025, 1, 6)
+    ]
+    np.testing.assert_allclose(curve.daily, [0.0004, 0.0004, 0.0005])
+    assert curve.end == dt.date(2025, 1, 7).toordinal()
+
+
+def test_anual_convertida_na_base_252():
+    curve = DailyCurve.from_series(["2025-01-02"], [12.0], annual=True)
+    assert curve.daily[0] == round(float(annual_to_daily(12.0)), DAILY_DECIMALS)
+    assert (1 + curve.daily[0]) ** 252 == pytest.approx(1.12, rel=1e-5)
+
+
+def test_fora_da_cobertura(published):
+    days, rates = published
+    curve = DailyCurve.from_series(days, [rates[d] for d in days])
+    with pytest.raises(RuntimeError, match="fora disso"):
+        accrual_factors(curve, 100.0, "2024-10-31", "2024-11-05")
+    with pytest.raises(RuntimeError, match="fora disso"):
+        accrual_factors(curve, 100.0, "2025-02-20", "2025-03-10")
+    with pytest.raises(RuntimeError, match="fim antes do início"):
+        accrual_factors(curve, 100.0, "2025-01-10", "2025-01-09")
+    # período vazio fora da curva não precisa de taxa
+    assert accrual_factors(curve, 100.0, "2030-01-01", "2030-01-01") == 1.0
+
+
+def test_data_base_corta_o_periodo(published):
+    days, rates = published
+    curve = DailyCurve.from_series(days, [rates[d] for d in days])
+    values = revalue(
+        curve, [100.0, 100.0], [100.0, 100.0], ["2024-12-02", "2025-01-15"], ["2025-02-03", "2025-02-03"],
+        data_base="2025-01-02",
+    )
+    assert values[0] == pytest.approx(100.0 * loop_factor(dt.date(2024, 12, 2), dt.date(2025, 1, 2), 100.0, rates))
+    assert values[1] == 100.0  # começa depois da data-base
+
+
+def test_serie_vazia():
+    with pytest.raises(RuntimeError):
+        DailyCurve.from_series([], [])
@@ -0,0 +1,104 @@
+import copy
+import datetime as dt
+import json
+
+import numpy as np
+import pytest
+
+from sanida import sgs_store
+from sanida.asof import RATE_SERIES, AsOf, SeriesIndex, to_date
+
+from test_calc import DADOS
+
+D = dt.date
+POINTS = [(D(2024, 1, 2), 11.75), (D(2024, 1, 31), 11.25), (D(2024, 3, 20), 10.75)]
+
+
+@pytest.fixture
+def sgs_dir(tmp_path):
+    directory = str(tmp_path / "sgs")
+    sgs_store.SeriesStore(RATE_SERIES["selic"], directory).append(POINTS)
+    return directory
+
+
+def test_as_of(sgs_dir):
+    idx = SeriesIndex(RATE_SERIES["selic"], sgs_dir)
+    assert len(idx) == 3
+    assert idx.as_of("2024-01-01") is None  # antes do primeiro ponto
+    assert idx.as_of("2024-01-02") == POINTS[0]  # na data exata
+    assert idx.as_of(dt.datetime(2024, 3, 1, 18, 30)) == POINTS[1]  # entre pontos
+    assert idx.as_of("2030-01-01") == POINTS[2]  # depois do último
+
+
+def test_as_of_many(sgs_dir):
+    idx = SeriesIndex(RATE_SERIES["selic"], sgs_dir)
+    days = np.array(["2023-12-29", "2024-01-02", "2024-02-15", "2024-03-20"], dtype="datetime64[D]")
+    np.testing.assert_array_equal(idx.as_of_many(days), [np.nan, 11.75, 11.25, 10.75])
+    ordinals = np.array([D(2024, 1, 30).toordinal(), D(2024, 1, 31).toordinal()])
+    np.testing.assert_array_equal(idx.as_of_many(ordinals), [11.75, 11.25])
+
+
+def test_range_inclui_as_pontas(sgs_dir):
+    idx = SeriesIndex(RATE_SERIES["selic"], sgs_dir)
+    assert idx.range("2024-01-02", "2024-03-20")["value"].tolist() == [11.75, 11.25, 10.75]
+    assert idx.range("2024-01-03", "2024-03-19")["value"].tolist() == [11.25]
+    assert len(idx.range("2024-02-01", "2024-03-19")) == 0
+    assert len(idx.range("2023-01-01", "2023-12-31")) == 0
+
+
+def test_refresh_ve_pontos_novos(sgs_dir):
+    idx = SeriesIndex(RATE_SERIES["selic"], sgs_dir)
+    sgs_store.SeriesStore(RATE_SERIES["selic"], sgs_dir).append([(D(2024, 5, 8), 10.5)])
+    assert idx.as_of("2024-06-01") == POINTS[2]
+    idx.refresh()
+    assert idx.as_of("2024-06-01") == (D(2024, 5, 8), 10.5)
+
+
+def test_serie_ausente(tmp_path):
+    idx = SeriesIndex(12, str(tmp_path))
+    assert len(idx) == 0 and idx.as_of("2024-01-01") is None
+    assert np.isnan(idx.as_of_many(["2024-01-01"])).all()
+
+
+def write_json(path, doc):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(doc), encoding="utf-8")
+
+
+def test_tabelas_do_historico_e_do_arquivo_corrente(tmp_path, sgs_dir):
+    fiscais = tmp_path / "fiscais"
+    antigo = copy.deepcopy(DADOS)
+    antigo["ano"] = 2025
+    antigo["dep"] = 150.0
+    del antigo["irrf"]["reducao_mensal"]
+    write_json(fiscais / "2025.json", antigo)
+    current = tmp_path / "dados_fiscais.json"
+    write_json(current, DADOS)
+
+    h = AsOf(sgs_dir, str(fiscais), str(current))
+    assert h.tables(2025).dep == 150.0 and h.tables(2025).reducao is None
+    assert h.tables(2026).dep == DADOS["dep"]  # sem 2026.json: vem do corrente
+    assert h.tables(2024) is None  # corrente é de outro ano
+
+    # o arquivo do ano tem prioridade sobre o corrente
+    write_json(fiscais / "2026.json", dict(DADOS, dep=200.0))
+    assert AsOf(sgs_dir, str(fiscais), str(current)).tables(2026).dep == 200.0
+
+    snap = h.as_of("2025-02-10")
+    assert snap["data"] == D(2025, 2, 10)
+    assert snap["taxas"] == {"selic": {"data": D(2024, 3, 20), "valor": 10.75}}
+    assert snap["fiscais"] is h.tables(2025)
+
+    r = h.range("2024-01-15", "2025-01-01")
+    assert r["taxas"]["selic"]["value"].tolist() == [11.25, 10.75]
+    assert len(r["taxas"]["cdi_diario"]) == 0
+    assert set(r["fiscais"]) == {2024, 2025}
+    with pytest.raises(RuntimeError):
+        h.range("2025-01-02", "2025-01-01")
+
+
+def test_to_date():
+    assert to_date("2024-03-15T10:00:00") == D(2024, 3, 15)
+    assert to_date(dt.datetime(2024, 3, 15, 23, 59)) == D(2024, 3, 15)
+    with pytest.raises(KeyError):
+        AsOf().series("ipca")
@@ -0,0 +1,147 @@
+import datetime as dt
+from ftplib import error_perm
+
+import pytest
+
+from sanida import b3_cdi, cassette, policy
+
+
+class FakeFTP:
+    """
+    Servidor FTP em memória: {caminho: {arquivo: conteúdo}}. Registra cada operação.
+    """
+
+    def __init__(self, tree, mlsd=True, listing=True):
+        self.tree = tree
+        self.mlsd_ok = mlsd
+        self.listing_ok = listing
+        self.ops = []
+        self.path = "/"
+        self.timeout = None
+        self.sock = None
+
+    def cwd(self, path):
+        self.ops.append(("CWD", path))
+        if path not in self.tree:
+            raise error_perm("550 diretório inexistente")
+        self.path = path
+        return "250 OK"
+
+    def retrbinary(self, cmd, callback):
+        name = cmd.split(" ", 1)[1]
+        self.ops.append(("RETR", f"{self.path}/{name}".replace("//", "/")))
+        if name not in self.tree[self.path]:
+            raise error_perm("550 arquivo inexistente")
+        callback(self.tree[self.path][name].encode("latin-1"))
+        return "226 OK"
+
+    def mlsd(self, path, facts=()):
+        self.ops.append(("MLSD", path))
+        if not self.mlsd_ok or not self.listing_ok:
+            raise error_perm("500 comando desconhecido")
+        yield "subdir", {"type": "dir"}
+        for name in self.tree.get(path, {}):
+            yield name, {"type": "file"}
+
+    def nlst(self, path):
+        self.ops.append(("NLST", path))
+        if not self.listing_ok:
+            raise error_perm("550 sem permissão")
+        return [f"{path}/{name}" for name in self.tree.get(path, {})]
+
+    def quit(self):
+        return "221"
+
+    def close(self):
+        pass
+
+    def reads(self):
+        return [arg for op, arg in self.ops if op == "RETR"]
+
+
+@pytest.fixture(autouse=True)
+def today(monkeypatch):
+    monkeypatch.setattr(cassette, "today", lambda: dt.date(2026, 1, 7))
+    monkeypatch.setattr(policy, "backoff", lambda attempt, retry_after=None: 0.0)
+    policy.start_run()
+
+
+def test_listagem_le_so_o_mais_recente_da_janela():
+    ftp = FakeFTP({"/": {}, "/MediaCDI": {
+        "20251201.txt": "000001490",  # fora da janela
+        "20260105.txt": "000001490",
+        "20260106.txt": "000001500",
+        "leiame.txt": "x",
+    }})
+    got = b3_cdi.b3_latest_cdi(ftp, "ftp.b3")
+    assert (got["value"], got["ftp_path"], got["ftp_filename"]) == (15.0, "/MediaCDI", "20260106.txt")
+    assert ftp.reads() == ["/MediaCDI/20260106.txt"]
+
+
+def test_arquivo_invalido_passa_para_o_anterior():
+    ftp = FakeFTP({"/": {}, "/MediaCDI": {"20260105.txt": "000001490", "20260106.txt": ""}})
+    assert b3_cdi.b3_latest_cdi(ftp, "ftp.b3")["ftp_filename"] == "20260105.txt"
+    assert ftp.reads() == ["/MediaCDI/20260106.txt", "/MediaCDI/20260105.txt"]
+
+
+def test_sem_mlsd_usa_nlst():
+    ftp = FakeFTP({"/": {}, "/MediaCDI": {"20260102.txt": "000001490"}}, mlsd=False)
+    assert b3_cdi.b3_latest_cdi(ftp, "ftp.b3")["ftp_filename"] == "20260102.txt"
+    assert ("NLST", "/MediaCDI") in ftp.ops
+
+
+def test_listagem_falha_e_sonda_por_nome():
+    ftp = FakeFTP({"/": {"20260105.txt": "000001490"}, "/MediaCDI": {}}, listing=False)
+    got = b3_cdi.b3_latest_cdi(ftp, "ftp.b3")
+    assert (got["ftp_path"], got["ftp_filename"]) == ("/", "20260105.txt")
+    assert ftp.reads() == ["/20260107.txt", "/20260106.txt", "/20260105.txt"]
+
+
+def test_listagem_vazia_nao_sonda_mediacdi():
+    ftp = FakeFTP({"/": {}, "/MediaCDI": {"20251201.txt": "000001490"}})
+    with pytest.raises(RuntimeError, match="nenhum arquivo de Taxa DI"):
+        b3_cdi.b3_latest_cdi(ftp, "ftp.b3")
+    reads = ftp.reads()
+    assert len(reads) == b3_cdi.B3_FTP_LOOKBACK_DAYS
+    # a listagem já mostrou que /MediaCDI não tem candidato: só "/" é sondado
+    assert not any(r.startswith("/MediaCDI") for r in reads)
+
+
+def test_candidatos():
+    files = b3_cdi.b3_candidate_files(3)
+    assert files == ["20260107.txt", "20260106.txt", "20260105.txt"]
+
+
+def test_modo_listing_usa_uma_sessao(monkeypatch):
+    sessions = []
+
+    def connect(host):
+        sessions.append(FakeFTP({"/": {}, "/MediaCDI": {"20260106.txt": "000001500"}}))
+        return sessions[-1]
+
+    monkeypatch.setattr(b3_cdi, "ftp_connect", connect)
+    assert b3_cdi.fetch_b3_cdi_ftp()["value"] == 15.0
+    assert len(sessions) == 1
+
+
+def test_modo_probe_uma_conexao_por_tentativa(monkeypatch):
+    sessions = []
+
+    def connect(host):
+        sessions.append(FakeFTP({"/": {"20260106.txt": "000001500"}, "/MediaCDI": {}}))
+        return sessions[-1]
+
+    monkeypatch.setattr(b3_cdi, "ftp_connect", connect)
+    got = b3_cdi.fetch_b3_cdi_ftp_probe()
+    assert (got["ftp_path"], got["ftp_filename"]) == ("/", "20260106.txt")
+    # 20260107.txt falha em todas as tentativas antes de passar para o dia anterior
+    assert len(sessions) == b3_cdi.RETRIES + 1
+    assert [s.reads() for s in sessions][-1] == ["/20260106.txt"]
+
+
+def test_parse_b3_numeric_rate():
+    assert b3_cdi.parse_b3_numeric_rate(" 000001465 \r\n") == 14.65
+    with pytest.raises(RuntimeError):
+        b3_cdi.parse_b3_numeric_rate("sem número")
+    with pytest.raises(RuntimeError):
+        b3_cdi.parse_b3_numeric_rate("000009999")
@@ -0,0 +1,87 @@
+import copy
+
+import numpy as np
+import pytest
+
+from sanida import calc
+from sanida.tables import TaxTable, compile_tables
+
+# Tabelas de 2026, fixas aqui para o teste não depender do dados_fiscais.json do dia.
+DADOS = {
+    "ano": 2026,
+    "schema_version": "2.2.0",
+    "dep": 189.59,
+    "inss": [
+        {"limite": 1621.0, "aliquota": 0.075},
+        {"limite": 2902.84, "aliquota": 0.09},
+        {"limite": 4354.27, "aliquota": 0.12},
+        {"limite": 8475.55, "aliquota": 0.14},
+    ],
+    "irrf": {
+        "tabela": [
+            {"limite": 2428.8, "aliquota": 0.0, "deducao": 0.0},
+            {"limite": 2826.65, "aliquota": 0.075, "deducao": 182.16},
+            {"limite": 3751.05, "aliquota": 0.15, "deducao": 394.16},
+            {"limite": 4664.68, "aliquota": 0.225, "deducao": 675.49},
+            {"limite": 9000000000.0, "aliquota": 0.275, "deducao": 908.73},
+        ],
+        "simplificado": 607.2,
+        "reducao_mensal": {
+            "isenta_ate": 5000.0,
+            "reduz_ate": 7350.0,
+            "max_reducao_ate_5000": 312.89,
+            "a": 978.62,
+            "b": 0.133145,
+        },
+    },
+}
+
+
+def test_irrf_6000_com_um_dependente():
+    r = calc.calcular_folha([6000.0], [1], DADOS)
+    assert round(float(r["inss"][0]), 2) == 641.51
+    assert round(float(r["irrf"][0]), 2) == 332.97
+
+
+def test_inss_para_no_teto():
+    teto = TaxTable.from_rows(DADOS["inss"]).cumulative[-1]
+    r = calc.calcular_folha([8475.55, 8475.56, 20000.0, 1e6], 0, DADOS)
+    np.testing.assert_allclose(r["inss"], teto)
+    assert round(teto, 2) == 988.09
+
+
+def test_faixa_isenta_e_simplificado():
+    r = calc.calcular_folha([1000.0, 4000.0, 5000.0], 0, DADOS)
+    np.testing.assert_allclose(r["irrf"], 0.0, atol=1e-9)
+    assert r["usa_simplificado"].all()
+
+
+def test_inss_nos_limites_das_faixas():
+    table = TaxTable.from_rows(DADOS["inss"])
+    limites = np.array(table.limits)
+    salarios = np.concatenate([limites - 0.01, limites, limites + 0.01, [0.0, -10.0]])
+    esperado = [table.progressive(s) for s in salarios]
+    np.testing.assert_allclose(calc.inss_mensal(salarios, table), esperado, rtol=0, atol=1e-9)
+
+
+def test_vetorizado_igual_ao_escalar():
+    rng = np.random.default_rng(7)
+    salarios = np.round(rng.uniform(0, 30000, 5000), 2)
+    dependentes = rng.integers(0, 5, 5000)
+    r = calc.calcular_folha(salarios, dependentes, DADOS)
+    t = compile_tables(DADOS)
+
+    for i in range(len(salarios)):
+        s, d = float(salarios[i]), int(dependentes[i])
+        assert r["inss"][i] == pytest.approx(t.inss_mensal(s), abs=1e-9)
+        assert r["irrf"][i] == pytest.approx(t.irrf_mensal(s, d), abs=1e-9)
+        assert r["liquido"][i] == pytest.approx(t.liquido(s, d), abs=1e-9)
+
+
+def test_sem_reducao_mensal():
+    dados = copy.deepcopy(DADOS)
+    dados["irrf"]["reducao_mensal"] = {}
+    r = calc.calcular_folha([5000.0], 0, dados)
+    np.testing.assert_allclose(r["reducao"], 0.0)
+    assert r["irrf"][0] == pytest.approx(r["irrf_tabela"][0])
+    assert r["irrf"][0] > 0
@@ -0,0 +1,83 @@
+import socket
+from ftplib import error_perm
+
+import pytest
+
+from sanida import cassette
+
+
+class FlakyFTP:
+    """
+    Sessão FTP falsa: CWD funciona, NLST estoura timeout, RETR volta 550.
+    """
+
+    def cwd(self, path):
+        return f"250 {path}"
+
+    def nlst(self, *args):
+        raise socket.timeout("timed out")
+
+    def retrbinary(self, cmd, callback, *args, **kwargs):
+        if "falta" in cmd:
+            raise error_perm("550 arquivo inexistente")
+        raise ConnectionResetError(104, "Connection reset by peer")
+
+
+def record_and_reload(tmp_path, session):
+    path = str(tmp_path / "run.json.gz")
+    rec = cassette.Cassette(path, "record")
+    session(rec)
+    rec.save()
+    return cassette.Cassette(path, "replay")
+
+
+def test_erros_de_socket_voltam_com_a_mesma_classe(tmp_path):
+    def session(cas):
+        ftp = cassette.RecordingFTP(FlakyFTP(), cas, "ftp.b3")
+        assert ftp.cwd("/MediaCDI") == "250 /MediaCDI"
+        with pytest.raises(socket.timeout):
+            ftp.nlst()
+        with pytest.raises(ConnectionResetError):
+            ftp.retrbinary("RETR 20260105.txt", lambda b: None)
+        with pytest.raises(error_perm):
+            ftp.retrbinary("RETR falta.txt", lambda b: None)
+
+    replay = cassette.ReplayFTP(record_and_reload(tmp_path, session), "ftp.b3")
+    assert replay.cwd("/MediaCDI") == "250 /MediaCDI"
+    with pytest.raises(TimeoutError, match="timed out"):
+        replay.nlst()
+    with pytest.raises(ConnectionResetError, match="Connection reset by peer"):
+        replay.retrbinary("RETR 20260105.txt", lambda b: None)
+    with pytest.raises(error_perm, match="550 arquivo inexistente"):
+        replay.retrbinary("RETR falta.txt", lambda b: None)
+    # operação que não foi gravada continua sendo um 550
+    with pytest.raises(error_perm, match="nada gravado"):
+        replay.cwd("/outro")
+
+
+def test_falha_no_connect(tmp_path, monkeypatch):
+    def refused():
+        raise ConnectionRefusedError(111, "Connection refused")
+
+    def session(cas):
+        monkeypatch.setattr(cassette, "get_cassette", lambda: cas)
+        with pytest.raises(ConnectionRefusedError):
+            cassette.ftp_session("ftp.b3", refused)
+
+    replay = record_and_reload(tmp_path, session)
+    monkeypatch.setattr(cassette, "get_cassette", lambda: replay)
+    with pytest.raises(ConnectionRefusedError, match="Connection refused"):
+        cassette.ftp_session("ftp.b3", refused)
+
+
+def test_http_e_classe_desconhecida(tmp_path, monkeypatch):
+    def session(cas):
+        monkeypatch.setattr(cassette, "get_cassette", lambda: cas)
+        assert cassette.http("https://x/a", lambda: (True, 200, "ok")) == (True, 200, "ok")
+
+    replay = record_and_reload(tmp_path, session)
+    monkeypatch.setattr(cassette, "get_cassette", lambda: replay)
+    assert cassette.http("https://x/a", lambda: pytest.fail("rede na reprodução")) == (True, 200, "ok")
+    assert cassette.http("https://x/b", lambda: pytest.fail("rede na reprodução")) == (False, 0, "cassette_miss")
+    # nome que não é erro de E/S não vira outra exceção arbitrária
+    assert type(cassette._ftp_error("KeyError", "x")) is OSError
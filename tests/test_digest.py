@@ -0,0 +1,84 @@
+import json
+import os
+
+import pytest
+
+from sanida import digest
+
+
+@pytest.fixture
+def heartbeat_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "heartbeat"
+    monkeypatch.setattr(digest, "HEARTBEAT_DIR", str(directory))
+    return directory
+
+
+def payload(selic=15.0, generated="2026-01-05T10:00:00Z"):
+    return {"schema_version": "2.2.0", "meta": {"generated_at_utc": generated}, "taxas": {"selic": selic, "cdi": 14.9}}
+
+
+def writer(path, calls):
+    def write(doc):
+        calls.append(doc)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(doc, f)
+
+    return write
+
+
+def heartbeat(directory, name):
+    with open(directory / name, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_digest_ignora_meta_e_ordem_das_chaves():
+    a = payload()
+    b = {"taxas": {"cdi": 14.9, "selic": 15.0}, "schema_version": "2.2.0", "meta": {"x": 1}}
+    assert digest.data_digest(a) == digest.data_digest(b)
+    assert digest.data_digest(a) != digest.data_digest(payload(selic=14.75))
+    assert digest.data_part(a) == {"schema_version": "2.2.0", "taxas": {"selic": 15.0, "cdi": 14.9}}
+
+
+def test_grava_so_quando_os_dados_mudam(tmp_path, heartbeat_dir):
+    path = str(tmp_path / "taxas_bacen.json")
+    calls = []
+    write = writer(path, calls)
+
+    assert digest.write_if_changed(path, payload(), write) is True
+    first = heartbeat(heartbeat_dir, "taxas_bacen.json")
+    assert first["changed"] is True and first["success"] is True
+    assert calls[0]["meta"]["data_digest"] == first["data_digest"]
+
+    # só o meta mudou: arquivo intacto, heartbeat registra a verificação
+    mtime = os.stat(path).st_mtime_ns
+    again = payload(generated="2026-01-05T11:00:00Z")
+    assert digest.write_if_changed(path, again, write, success=False) is False
+    assert len(calls) == 1 and os.stat(path).st_mtime_ns == mtime
+    assert again["meta"]["data_digest"] == first["data_digest"]
+    hb = heartbeat(heartbeat_dir, "taxas_bacen.json")
+    assert (hb["changed"], hb["success"]) == (False, False)
+
+    assert digest.write_if_changed(path, payload(selic=14.75), write) is True
+    assert len(calls) == 2 and digest.file_digest(path) == digest.data_digest(payload(selic=14.75))
+
+
+def test_force_regrava_sem_mudanca(tmp_path, heartbeat_dir):
+    path = str(tmp_path / "2025.json")
+    calls = []
+    write = writer(path, calls)
+    digest.write_if_changed(path, payload(), write)
+    final = payload()
+    final["meta"]["final"] = True
+    assert digest.write_if_changed(path, final, write, force=True) is True
+    assert calls[-1]["meta"]["final"] is True
+    assert heartbeat(heartbeat_dir, "2025.json")["changed"] is True
+
+
+def test_arquivo_ilegivel_conta_como_mudanca(tmp_path, heartbeat_dir):
+    path = tmp_path / "dados_fiscais.json"
+    path.write_text("{cortado", encoding="utf-8")
+    assert digest.file_digest(str(path)) is None
+    assert digest.file_digest(str(tmp_path / "nao_existe.json")) is None
+    calls = []
+    assert digest.write_if_changed(str(path), payload(), writer(str(path), calls)) is True
+    assert len(calls) == 1
@@ -0,0 +1,101 @@
+import pytest
+
+from sanida import extract, fiscais
+
+# Trechos como saem de page_text nas páginas da Receita (2026) e do INSS.
+IRRF_2026 = (
+    "Tabela progressiva mensal Base de cálculo (R$) Alíquota (%) Parcela a deduzir do IR (R$) "
+    "Até R$ 2.428,80 - - "
+    "De R$ 2.428,81 até R$ 2.826,65 7,5% R$ 182,16 "
+    "De R$ 2.826,66 até R$ 3.751,05 15% R$ 394,16 "
+    "De R$ 3.751,06 até R$ 4.664,68 22,5% R$ 675,49 "
+    "Acima de R$ 4.664,68 27,5% R$ 908,73 "
+    "Dedução mensal por dependente: R$ 189,59 "
+    "Limite mensal de desconto simplificado: R$ 607,20 "
+    "Redução do imposto Rendimentos tributáveis mensais Redução "
+    "até R$ 5.000,00 até R$ 312,89 (de modo que o imposto devido seja zero) "
+    "de R$ 5.000,01 até R$ 7.350,00 R$ 978,62 - (0,133145 x rendimentos tributáveis mensais)"
+)
+INSS_2026 = (
+    "As alíquotas são: 7,5% para quem ganha até R$ 1.621,00; "
+    "9% para quem ganha entre R$ 1.621,01 e R$ 2.902,84; "
+    "12% para quem ganha entre R$ 2.902,85 e R$ 4.354,27; "
+    "14% para quem ganha de R$ 4.354,28 até R$ 8.475,55."
+)
+
+
+def span(text, fragment):
+    start = text.index(fragment)
+    return start, start + len(fragment)
+
+
+def test_campos_e_offsets_irrf():
+    hits = extract.scan("irrf", IRRF_2026)
+    isenta = extract.first(hits, "faixa_isenta")
+    assert (isenta.start, isenta.end) == span(IRRF_2026, "Até R$ 2.428,80 - -")
+    assert isenta.groups == ("2.428,80",)
+
+    faixas = hits["faixa"]
+    assert [h.groups for h in faixas] == [
+        ("2.428,81", "2.826,65", "7,5", "182,16"),
+        ("2.826,66", "3.751,05", "15", "394,16"),
+        ("3.751,06", "4.664,68", "22,5", "675,49"),
+    ]
+    assert (faixas[1].start, faixas[1].end) == span(IRRF_2026, "De R$ 2.826,66 até R$ 3.751,05 15% R$ 394,16")
+
+    topo = extract.first(hits, "faixa_topo")
+    assert (topo.start, topo.end) == span(IRRF_2026, "Acima de R$ 4.664,68 27,5% R$ 908,73")
+    assert extract.first(hits, "dependente").groups == ("189,59",)
+    assert extract.first(hits, "simplificado").groups == ("607,20",)
+    red = extract.first(hits, "reducao_max")
+    assert (red.start, red.end) == span(IRRF_2026, "até R$ 5.000,00 até R$ 312,89")
+    assert extract.first(hits, "reducao_formula").groups == ("978,62", "0,133145")
+
+
+def test_extract_irrf_2026():
+    irrf = fiscais.extract_irrf(IRRF_2026, 2026)
+    assert [b["limite"] for b in irrf["tabela"]] == [2428.8, 2826.65, 3751.05, 4664.68, 9e9]
+    assert irrf["tabela"][-1]["aliquota"] == pytest.approx(0.275)
+    assert (irrf["dep"], irrf["simplificado"]) == (189.59, 607.2)
+    assert irrf["reducao_mensal"]["max_reducao_ate_5000"] == 312.89
+    assert (irrf["reducao_mensal"]["a"], irrf["reducao_mensal"]["b"]) == (978.62, 0.133145)
+
+
+def test_campos_e_offsets_inss():
+    hits = extract.scan("inss", INSS_2026)
+    inicial = extract.first(hits, "faixa_inicial")
+    assert (inicial.start, inicial.end) == span(INSS_2026, "7,5% para quem ganha até R$ 1.621,00")
+    assert inicial.groups == ("7,5", "1.621,00")
+    assert [h.groups for h in hits["faixa"]] == [("9", "1.621,01", "2.902,84"), ("12", "2.902,85", "4.354,27")]
+    final = extract.first(hits, "faixa_final")
+    # o ponto final da frase entra no último número; br_money_to_float o ignora
+    assert (final.start, final.end) == span(INSS_2026, "14% para quem ganha de R$ 4.354,28 até R$ 8.475,55.")
+    assert final.groups == ("14", "4.354,28", "8.475,55.")
+
+    inss = fiscais.extract_inss(INSS_2026)
+    assert [(b["limite"], b["aliquota"]) for b in inss["tabela"]][-1] == (8475.55, 0.14)
+    assert inss["teto"] == 8475.55
+
+
+def test_filtro_so_com_first_em_todos_os_campos():
+    gated = extract.Extractor([("a", r"x(\d)", "x"), ("b", r"(\d)y", r"\d")])
+    assert gated.regex.pattern.startswith(r"(?=[x\d])")
+    ungated = extract.Extractor([("a", r"x(\d)", "x"), ("b", r"(\d)y", None)])
+    assert not ungated.regex.pattern.startswith("(?=")
+    for ex in (gated, ungated):
+        hits = ex.scan("x1 2y x3")
+        assert [(h.start, h.groups) for h in hits["a"]] == [(0, ("1",)), (6, ("3",))]
+        assert [(h.start, h.groups) for h in hits["b"]] == [(3, ("2",))]
+
+
+def test_sem_sobreposicao_entre_campos():
+    ex = extract.Extractor([("par", r"(\d)-(\d)", r"\d"), ("digito", r"(\d)", r"\d")])
+    hits = ex.scan("1-2 3")
+    # o "2" foi consumido por `par`: `digito` só aparece fora dele
+    assert [h.groups for h in hits["par"]] == [("1", "2")]
+    assert [(h.start, h.groups) for h in hits["digito"]] == [(4, ("3",))]
+
+
+def test_campo_repetido():
+    with pytest.raises(ValueError):
+        extract.register("irrf", "faixa", r"x")
@@ -0,0 +1,29 @@
+import copy
+
+from sanida import fiscais
+
+from test_calc import DADOS
+
+
+def collected(irrf_extra):
+    irrf = {"tabela": DADOS["irrf"]["tabela"], "dep": DADOS["dep"], "simplificado": 607.2, **irrf_extra}
+    inss = {"tabela": DADOS["inss"], "teto": 8475.55}
+    return irrf, inss
+
+
+def test_payload_sem_reducao_antes_de_2026():
+    irrf, inss = collected({"reducao_mensal": {}})
+    payload = fiscais.build_payload(2025, irrf, inss, None, {"final": True})
+    assert "reducao_mensal" not in payload["irrf"]
+    assert fiscais.validate_payload(payload, require_taxas=False) == (True, [])
+
+
+def test_payload_com_reducao():
+    irrf, inss = collected({"reducao_mensal": copy.deepcopy(DADOS["irrf"]["reducao_mensal"])})
+    payload = fiscais.build_payload(2026, irrf, inss, {"selic": 15.0, "cdi": 14.9, "cdi_basis": "a.a."}, {})
+    assert payload["irrf"]["reducao_mensal"] == DADOS["irrf"]["reducao_mensal"]
+    assert payload["taxas"] == {"selic": 15.0, "cdi": 14.9, "cdi_basis": "a.a."}
+
+
+def test_parse_years():
+    assert fiscais.parse_years("2020-2022, 2025,2021") == [2020, 2021, 2022, 2025]
@@ -0,0 +1,168 @@
+import copy
+import json
+
+import pytest
+
+from sanida import digest, history
+
+BASE = {
+    "schema_version": "2.2.0",
+    "meta": {"generated_at_utc": "2026-01-02T09:20:00Z"},
+    "ano": 2026,
+    "dep": 189.59,
+    "inss": [{"limite": 1621.0, "aliquota": 0.075}, {"limite": 2902.84, "aliquota": 0.09}],
+    "irrf": {"tabela": [{"limite": 2428.8, "aliquota": 0.0}], "simplificado": 607.2, "reducao_mensal": {}},
+    "taxas": {"selic": 15.0, "cdi": 14.9},
+}
+
+
+def variants():
+    a = copy.deepcopy(BASE)
+    a["taxas"]["selic"] = 14.25
+    b = copy.deepcopy(a)
+    b["inss"].append({"limite": 8475.55, "aliquota": 0.14})
+    b["irrf"]["reducao_mensal"] = {"isenta_ate": 5000.0, "a/b": 1, "til~": [1, 2]}
+    c = copy.deepcopy(b)
+    del c["inss"][0]
+    c["dep"] = "189,59"  # troca de tipo
+    c["irrf"]["tabela"] = []
+    d = copy.deepcopy(c)
+    del d["taxas"]
+    d["novo"] = {"x": None}
+    return [a, b, c, d]
+
+
+@pytest.mark.parametrize("new", variants())
+def test_diff_apply_ida_e_volta(new):
+    patch = history.diff(BASE, new)
+    assert history.apply_patch(BASE, patch) == new
+    assert history.apply_patch(new, history.diff(new, BASE)) == BASE
+    # o patch precisa sobreviver à serialização do log
+    assert history.apply_patch(BASE, json.loads(json.dumps(patch))) == new
+
+
+def test_diff_sem_mudanca_e_vazio():
+    assert history.diff(BASE, copy.deepcopy(BASE)) == []
+
+
+def test_apply_nao_altera_a_entrada():
+    before = copy.deepcopy(BASE)
+    history.apply_patch(BASE, [{"op": "remove", "path": "/taxas"}])
+    assert BASE == before
+
+
+def test_move_copy_test():
+    doc = {"a": {"b": 1}, "l": [1, 2, 3]}
+    out = history.apply_patch(
+        doc,
+        [
+            {"op": "copy", "from": "/a/b", "path": "/c"},
+            {"op": "move", "from": "/l/0", "path": "/l/-"},
+            {"op": "test", "path": "/l", "value": [2, 3, 1]},
+            {"op": "add", "path": "/l/1", "value": 9},
+        ],
+    )
+    assert out == {"a": {"b": 1}, "c": 1, "l": [2, 9, 3, 1]}
+
+
+@pytest.mark.parametrize(
+    "patch",
+    [
+        [{"op": "test", "path": "/a", "value": 2}],
+        [{"op": "remove", "path": "/nada"}],
+        [{"op": "replace", "path": "/l/5", "value": 0}],
+        [{"op": "add", "path": "/l/01", "value": 0}],
+        [{"op": "move", "from": "/a", "path": "/a/x"}],
+        [{"op": "frobnicate", "path": "/a"}],
+        [{"op": "add", "path": "sem-barra", "value": 0}],
+    ],
+)
+def test_patch_invalido_levanta(patch):
+    with pytest.raises(RuntimeError):
+        history.apply_patch({"a": {"b": 1}, "l": [1]}, patch)
+
+
+def test_record_reconstruct_e_since(tmp_path, monkeypatch):
+    monkeypatch.setattr(history, "SNAPSHOT_EVERY", 3)
+    directory = str(tmp_path)
+    docs = [BASE] + variants()
+
+    previous = None
+    versions = []
+    for doc in docs:
+        versions.append(history.record("dados_fiscais.json", previous, doc, directory))
+        previous = doc
+    assert versions == [1, 2, 3, 4, 5]
+    # mesma parte de dados (só meta mudou): nenhuma versão nova
+    touched = copy.deepcopy(docs[-1])
+    touched["meta"] = {"generated_at_utc": "2026-01-03T09:20:00Z"}
+    assert history.record("dados_fiscais.json", docs[-1], touched, directory) is None
+
+    entries = list(history.entries("dados_fiscais", directory))
+    assert ["snapshot" in e for e in entries] == [True, False, True, False, False]
+    for version, doc in zip(versions, docs):
+        rebuilt = history.reconstruct("dados_fiscais", version, directory)
+        assert rebuilt == digest.data_part(doc)
+        assert digest.data_digest(rebuilt) == entries[version - 1]["data_digest"]
+
+    assert [e["version"] for e in history.since("dados_fiscais", 3, directory)] == [4, 5]
+    with pytest.raises(RuntimeError):
+        history.reconstruct("dados_fiscais", 9, directory)
+
+
+def test_linha_incompleta_e_ignorada_e_descartada(tmp_path):
+    directory = str(tmp_path)
+    history.record("taxas_bacen.json", None, BASE, directory)
+    with open(history.log_path("taxas_bacen", directory), "a", encoding="utf-8") as f:
+        f.write('{"version": 2, "snap')
+    assert history.last_entry("taxas_bacen", directory)["version"] == 1
+    assert [e["version"] for e in history.entries("taxas_bacen", directory)] == [1]
+
+    new = variants()[0]
+    assert history.record("taxas_bacen.json", BASE, new, directory) == 2
+    assert history.reconstruct("taxas_bacen", None, directory) == digest.data_part(new)
+
+
+def test_reconstruct_parte_do_ultimo_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(history, "SNAPSHOT_EVERY", 3)
+    directory = str(tmp_path)
+    docs = [BASE] + variants()
+    previous = None
+    for doc in docs:
+        history.record("taxas_bacen.json", previous, doc, directory)
+        previous = doc
+
+    # estraga o patch da versão 2: as versões a partir do snapshot 3 não dependem dele
+    path = history.log_path("taxas_bacen", directory)
+    with open(path, encoding="utf-8") as f:
+        lines = f.readlines()
+    broken = json.loads(lines[1])
+    broken["patch"] = [{"op": "remove", "path": "/nada"}]
+    lines[1] = json.dumps(broken) + "\n"
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+
+    assert history.reconstruct("taxas_bacen", 5, directory) == digest.data_part(docs[4])
+    assert history.reconstruct("taxas_bacen", 3, directory) == digest.data_part(docs[2])
+    assert history.reconstruct("taxas_bacen", 1, directory) == digest.data_part(docs[0])
+    with pytest.raises(RuntimeError):
+        history.reconstruct("taxas_bacen", 2, directory)
+
+
+def test_leitura_do_fim_com_linhas_longas(tmp_path):
+    directory = str(tmp_path)
+    previous = None
+    docs = []
+    for i in range(6):
+        doc = dict(copy.deepcopy(BASE), texto="x" * (3000 * i), n=i)
+        history.record("dados_fiscais.json", previous, doc, directory)
+        previous = doc
+        docs.append(doc)
+    with open(history.log_path("dados_fiscais", directory), "a", encoding="utf-8") as f:
+        f.write('{"version": 7, "snapshot": "' + "y" * 9000)
+
+    forward = list(history.entries("dados_fiscais", directory))
+    assert list(history._entries_reversed("dados_fiscais", directory)) == forward[::-1]
+    assert history.last_entry("dados_fiscais", directory)["version"] == 6
+    assert history.reconstruct("dados_fiscais", None, directory) == digest.data_part(docs[-1])
+    assert history.reconstruct("dados_fiscais", 4, directory) == digest.data_part(docs[3])
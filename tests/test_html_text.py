@@ -0,0 +1,101 @@
+import pytest
+
+from sanida import fiscais, html_text
+from sanida.html_text import RegionTextParser, extract_full_text, extract_text
+
+from test_extract import IRRF_2026
+
+
+def test_regiao_por_id():
+    html = (
+        "<html><body><nav>Menu Início</nav>"
+        "<div id='portal'><div id='content-core'><p>Tabela</p><div><p>mensal</p></div></div>"
+        "<p>rodapé</p></div></body></html>"
+    )
+    assert extract_text(html) == "Tabela mensal"
+
+
+def test_regiao_por_article_e_main():
+    assert extract_text("<nav>x</nav><article><h1>IRRF</h1> 2026</article><footer>y</footer>") == "IRRF 2026"
+    assert extract_text("<header>x</header><main><main>a</main> b</main><p>c</p>") == "a b"
+
+
+def test_tabela_antes_da_regiao():
+    html = (
+        "<nav>menu</nav><table><tr><td>Até R$ 2.428,80</td><td>-</td></tr></table>"
+        "<p>fora</p><div id='content'>Dedução mensal</div><p>rodapé</p>"
+    )
+    assert extract_text(html) == "Até R$ 2.428,80 - Dedução mensal"
+
+
+def test_para_depois_que_a_regiao_fecha():
+    html = "<main>conteúdo</main><table><tr><td>outra tabela</td></tr></table><article>outra</article>"
+    parser = RegionTextParser()
+    parser.feed(html)
+    parser.close()
+    assert parser.done and parser.parts == ["conteúdo"]
+    # e nem os blocos seguintes são lidos
+    big = "<main>a</main>" + "<p>x</p>" * (html_text.FEED_CHUNK // 8 + 10) + "<main>b</main>"
+    assert extract_text(big) == "a"
+
+
+def test_sem_regiao_usa_o_documento():
+    assert extract_text("<div>Só <b>texto</b></div><script>var x = 1;</script>") == "Só texto"
+
+
+def test_documento_inteiro():
+    html = "<nav>menu</nav><main>a</main><aside>b</aside>"
+    assert extract_full_text(html) == "menu a b"
+
+
+HTML = """<!doctype html>
+<html><head><title>Tabelas &ndash; 2026</title><style>p {color: red}</style>
+<script>var t = "<p>não</p>";</script></head>
+<body>
+  <p>Al&iacute;quota&nbsp;de  7,5&#37;</p>
+  <p>R&#36;&#160;1.621,00<br/>por   m&ecirc;s</p>
+  <!-- comentário -->
+  <template><p>modelo</p></template>
+  <table><tr><td> De R$ 1,00 </td><td>até R$ 2,00</td></tr></table>
+</body></html>"""
+
+
+def test_normalizacao_igual_ao_bs4():
+    pytest.importorskip("bs4")
+    assert extract_full_text(HTML) == fiscais.page_text_bs4(HTML)
+    assert "Alíquota de 7,5%" in extract_full_text(HTML)
+
+
+def test_extract_page_completa_com_o_documento(monkeypatch):
+    monkeypatch.setattr(fiscais, "HTML_PARSER", "fast")
+    cut = IRRF_2026.index("Redução do imposto")
+    # região com as faixas e outra, depois, com a redução de 2026
+    html = f"<main><p>{IRRF_2026[:cut]}</p></main><div><p>{IRRF_2026[cut:]}</p></div>"
+    calls = []
+
+    def extractor(text):
+        calls.append(text)
+        return fiscais.extract_irrf(text, 2026)
+
+    irrf = fiscais.extract_page(html, extractor, lambda d: fiscais.irrf_complete(d, 2026))
+    assert len(calls) == 2
+    assert irrf["reducao_mensal"]["a"] == 978.62
+
+    # sem a redução em lugar nenhum, fica o resultado da região
+    html = f"<main><p>{IRRF_2026[:cut]}</p></main>"
+    irrf = fiscais.extract_page(html, extractor, lambda d: fiscais.irrf_complete(d, 2026))
+    assert irrf["reducao_mensal"]["a"] is None and irrf["dep"] == 189.59
+
+    # antes de 2026 a região já basta
+    calls.clear()
+    fiscais.extract_page(html, lambda t: calls.append(t) or fiscais.extract_irrf(t, 2025),
+                         lambda d: fiscais.irrf_complete(d, 2025))
+    assert len(calls) == 1
+
+
+def test_extract_page_cai_no_documento_se_a_regiao_falha(monkeypatch):
+    monkeypatch.setattr(fiscais, "HTML_PARSER", "fast")
+    html = f"<main>menu do site</main><div>{IRRF_2026}</div>"
+    assert fiscais.extract_page(html, lambda t: fiscais.extract_irrf(t, 2026))["dep"] == 189.59
+    with pytest.raises(RuntimeError):
+        fiscais.extract_page("<main>nada</main>", lambda t: fiscais.extract_irrf(t, 2026))
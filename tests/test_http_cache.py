@@ -0,0 +1,130 @@
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from sanida import http_cache, http_client, policy
+from sanida.http_cache import HttpCache
+
+URL = "https://www.gov.br/tabelas/2026"
+
+
+def age(cache, url, seconds):
+    """
+    Recua mtime e stored_at da entrada, como se tivesse sido validada há `seconds`.
+    """
+    path = cache._path(url)
+    when = time.time() - seconds
+    os.utime(path, (when, when))
+    return path
+
+
+def test_guarda_so_com_validadores(tmp_path):
+    cache = HttpCache(str(tmp_path), ttl=60, max_bytes=1 << 20)
+    cache.miss(URL, {}, "sem validador")
+    assert cache.lookup(URL) is None
+
+    cache.miss(URL, {"ETag": '"v1"', "Last-Modified": "Mon, 05 Jan 2026 10:00:00 GMT"}, "corpo")
+    entry = cache.lookup(URL)
+    assert entry["body"] == "corpo"
+    assert cache.validators(entry) == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 05 Jan 2026 10:00:00 GMT",
+    }
+    assert cache.stats()["misses"] == 2 and cache.stats()["stored"] == 1
+
+
+def test_ttl_conta_da_ultima_validacao(tmp_path, monkeypatch):
+    cache = HttpCache(str(tmp_path), ttl=60, max_bytes=1 << 20)
+    cache.miss(URL, {"ETag": '"v1"'}, "corpo")
+    # corpo gravado há muito tempo, mas revalidado (304) há pouco: continua valendo
+    monkeypatch.setattr(time, "time", lambda real=time.time: real() + 120)
+    path = age(cache, URL, 0)
+    assert cache.lookup(URL) is not None
+    age(cache, URL, 61)
+    assert cache.lookup(URL) is None and not os.path.exists(path)
+
+
+def test_hit_renova_e_conta(tmp_path):
+    cache = HttpCache(str(tmp_path), ttl=60, max_bytes=1 << 20)
+    cache.miss(URL, {"ETag": '"v1"'}, "ação")
+    path = age(cache, URL, 50)
+    entry = cache.lookup(URL)
+    assert cache.hit(URL, entry) == "ação"
+    assert time.time() - os.path.getmtime(path) < 5
+    assert cache.stats()["hits"] == 1 and cache.stats()["bytes_saved"] == len("ação".encode("utf-8"))
+
+
+def test_lru_remove_as_menos_usadas(tmp_path):
+    body = "x" * 1000
+    cache = HttpCache(str(tmp_path), ttl=3600, max_bytes=2500)
+    urls = [f"{URL}?p={i}" for i in range(3)]
+    cache.miss(urls[0], {"ETag": "a"}, body)
+    age(cache, urls[0], 30)
+    cache.miss(urls[1], {"ETag": "b"}, body)
+    age(cache, urls[1], 20)
+    cache.hit(urls[0], cache.lookup(urls[0]))  # a primeira volta a ser a mais recente
+    cache.miss(urls[2], {"ETag": "c"}, body)  # passa do limite: sai a menos usada
+    assert cache.lookup(urls[1]) is None
+    assert cache.lookup(urls[0]) is not None and cache.lookup(urls[2]) is not None
+    assert cache.stats()["evicted"] == 1
+
+
+class Server:
+    """
+    Servidor local com ETag: responde 304 quando If-None-Match bate.
+    """
+
+    def __init__(self):
+        self.etag = '"v1"'
+        self.body = "tabela v1"
+        self.requests = []
+        owner = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                owner.requests.append(self.headers.get("If-None-Match"))
+                if self.headers.get("If-None-Match") == owner.etag:
+                    self.send_response(304)
+                    self.send_header("ETag", owner.etag)
+                    self.end_headers()
+                    return
+                data = owner.body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("ETag", owner.etag)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/tabelas"
+
+
+@pytest.fixture
+def server():
+    s = Server()
+    yield s
+    s.httpd.shutdown()
+    s.httpd.server_close()
+
+
+def test_revalidacao_304_serve_o_corpo_salvo(tmp_path, monkeypatch, server):
+    cache = HttpCache(str(tmp_path), ttl=3600, max_bytes=1 << 20)
+    monkeypatch.setattr(http_cache, "get_cache", lambda: cache)
+    policy.start_run()
+
+    assert http_client.fetch(server.url, {}, 5, 1) == (True, 200, "tabela v1")
+    assert http_client.fetch(server.url, {}, 5, 1) == (True, 200, "tabela v1")
+    assert server.requests == [None, '"v1"']
+    assert cache.stats()["hits"] == 1
+
+    server.etag, server.body = '"v2"', "tabela v2"
+    assert http_client.fetch(server.url, {}, 5, 1) == (True, 200, "tabela v2")
+    assert cache.lookup(server.url)["etag"] == '"v2"'
@@ -0,0 +1,75 @@
+import io
+import json
+
+import pytest
+
+from sanida import payroll
+
+from test_calc import DADOS
+
+
+def csv_text(n, sep=",", decimal="."):
+    lines = [f"id{sep}salario{sep}dependentes"]
+    for i in range(n):
+        salario = f"{1000 + (i * 137.31) % 20000:.2f}"
+        if decimal != ".":
+            salario = salario.replace(".", decimal)
+        lines.append(f"{i}{sep}{salario}{sep}{i % 4}")
+    return "\n".join(lines) + "\n"
+
+
+def run(text, **kwargs):
+    out = io.StringIO()
+    stats = payroll.run(io.StringIO(text), out, DADOS, **kwargs)
+    return out.getvalue(), stats
+
+
+def test_saida_igual_com_qualquer_numero_de_workers():
+    text = csv_text(2500)
+    serial, stats = run(text, workers=1, chunk_rows=1000)
+    assert stats["rows"] == 2500
+    assert serial.splitlines()[0] == "id,salario,dependentes,inss,irrf,liquido"
+    for workers, chunk in ((2, 300), (3, 7)):
+        parallel, stats = run(text, workers=workers, chunk_rows=chunk)
+        assert parallel == serial
+        assert (stats["rows"], stats["workers"]) == (2500, workers)
+
+
+def test_valores_da_linha():
+    out, _ = run("salario;dependentes\n6000,00;1\n", workers=1, sep=";", decimal=",")
+    assert out.splitlines()[1] == "6000,00;1;641,51;332,97;5025,52"
+
+
+def test_linha_invalida_informa_o_numero():
+    lines = csv_text(40).splitlines()
+    lines[27] = "26,12x34,0"  # linha 28 do arquivo (cabeçalho = 1)
+    text = "\n".join(lines) + "\n"
+    for workers in (1, 2):
+        with pytest.raises(RuntimeError, match=r"linha 28: valor numérico inválido '12x34'"):
+            run(text, workers=workers, chunk_rows=10)
+
+
+def test_cabecalho():
+    with pytest.raises(RuntimeError, match="entrada vazia"):
+        run("", workers=1)
+    with pytest.raises(RuntimeError, match="não encontrada"):
+        run("id,bruto\n1,2\n", workers=1)
+
+
+def test_main_nao_deixa_saida_parcial(tmp_path, capsys):
+    dados = tmp_path / "dados.json"
+    dados.write_text(json.dumps(DADOS), encoding="utf-8")
+    src = tmp_path / "folha.csv"
+    target = tmp_path / "saida.csv"
+    target.write_text("anterior\n", encoding="utf-8")
+
+    src.write_text(csv_text(30).replace("\n12,", "\n12,abc", 1), encoding="utf-8")
+    rc = payroll.main([str(src), str(target), "--dados", str(dados), "--workers", "1", "--chunk", "5"])
+    assert rc == 1
+    assert "folha: linha 14:" in capsys.readouterr().err
+    assert target.read_text(encoding="utf-8") == "anterior\n"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["dados.json", "folha.csv", "saida.csv"]
+
+    src.write_text(csv_text(30), encoding="utf-8")
+    assert payroll.main([str(src), str(target), "--dados", str(dados), "--workers", "1"]) == 0
+    assert len(target.read_text(encoding="utf-8").splitlines()) == 31
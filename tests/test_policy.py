@@ -0,0 +1,101 @@
+import email.utils
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from sanida import policy
+from sanida.policy import CircuitBreaker, Deadline
+
+
+def test_prazo_limita_timeout_e_espera():
+    dl = Deadline.after(10.0)
+    assert dl.timeout(25) == pytest.approx(10.0, abs=0.5)
+    assert dl.timeout(2) == 2
+    assert dl.can_wait(1.0) and not dl.can_wait(11.0)
+
+    gone = Deadline(time.monotonic() - 1, 10.0)
+    assert gone.expired() and gone.timeout(5) is None and gone.remaining() == 0.0
+    assert not gone.can_wait(0.0)
+
+
+def test_etapa_ganha_fracao_e_nunca_passa_do_pai():
+    run = policy.start_run(100.0)
+    with policy.stage("fontes", 0.3) as dl:
+        assert policy.current() is dl
+        assert dl.remaining() == pytest.approx(30.0, abs=0.5)
+        with policy.stage("interna", 0.8) as inner:
+            # 80% do total passaria do prazo da etapa de fora
+            assert inner.at == dl.at
+    assert policy.current() is run
+
+
+def test_bind_leva_o_prazo_para_outra_thread():
+    policy.start_run(50.0)
+    with policy.stage("taxas", 0.1) as dl:
+        bound = policy.bind(policy.current)
+        within = policy.within("sgs", 0.05, policy.current)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        assert pool.submit(bound).result() is dl
+        inner = pool.submit(within).result()
+        assert inner.name == "sgs" and inner.at <= dl.at
+        # sem bind a thread nova não vê o prazo da etapa
+        assert pool.submit(policy.current).result() is not dl
+
+
+def test_backoff_com_teto_e_jitter(monkeypatch):
+    monkeypatch.setattr(policy, "BACKOFF_BASE", 0.5)
+    monkeypatch.setattr(policy, "BACKOFF_CAP", 4.0)
+    for attempt, ceiling in ((1, 0.5), (2, 1.0), (3, 2.0), (4, 4.0), (10, 4.0)):
+        waits = [policy.backoff(attempt) for _ in range(200)]
+        assert all(0.0 <= w <= ceiling for w in waits)
+        assert max(waits) > ceiling / 2  # jitter cobre a faixa, não é fixo
+
+
+def test_retry_after():
+    assert policy.backoff(5, "3") == 3.0
+    assert policy.parse_retry_after(" 12 ") == 12.0
+    assert policy.parse_retry_after(None) is None
+    assert policy.parse_retry_after("amanhã") is None
+    future = email.utils.formatdate(time.time() + 30, usegmt=True)
+    assert policy.parse_retry_after(future) == pytest.approx(30, abs=2)
+    past = email.utils.formatdate(time.time() - 30, usegmt=True)
+    assert policy.parse_retry_after(past) == 0.0
+
+
+def test_disjuntor():
+    br = CircuitBreaker(threshold=3)
+    for _ in range(2):
+        br.failure("b3")
+    br.success("b3")  # sucesso zera a contagem
+    br.failure("b3")
+    br.failure("b3")
+    assert br.allow("b3")
+    assert br.stats() == {"open": [], "consecutive_failures": {"b3": 2}}
+    br.failure("b3")
+    assert not br.allow("b3") and br.allow("bcb")
+    br.success("b3")  # aberto fica aberto até o fim da execução
+    assert not br.allow("b3")
+    assert br.stats()["open"] == ["b3"]
+    br.reset()
+    assert br.allow("b3") and br.stats() == {"open": [], "consecutive_failures": {}}
+
+
+def test_disjuntor_entre_threads():
+    br = CircuitBreaker(threshold=50)
+    threads = [threading.Thread(target=lambda: [br.failure("h") for _ in range(10)]) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not br.allow("h") and br.stats()["consecutive_failures"]["h"] == 80
+
+
+def test_start_run_fecha_os_disjuntores():
+    for _ in range(policy.BREAKER.threshold):
+        policy.BREAKER.failure("x")
+    assert not policy.BREAKER.allow("x")
+    dl = policy.start_run(5.0)
+    assert policy.BREAKER.allow("x") and policy.current() is dl
+    assert policy.stats()["deadline_s"] == 5.0
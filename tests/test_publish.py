@@ -0,0 +1,98 @@
+import copy
+import gzip
+import json
+import math
+import os
+
+import pytest
+
+from sanida import digest, history, publish
+from sanida.tables import compile_tables
+
+from test_calc import DADOS
+
+FISCAIS = dict(copy.deepcopy(DADOS), taxas={"selic": 15.0, "cdi": 14.9, "cdi_basis": "a.a."})
+FISCAIS["meta"] = {"data_digest": digest.data_digest(FISCAIS)}
+TAXAS = {
+    "schema_version": "1.0.0",
+    "meta": {"data_digest": "sha256:" + "ab" * 32},
+    "taxas": {"selic": 15.0, "cdi": 14.9, "selic_diaria": 0.055131, "ipca_12m": None},
+}
+
+
+def test_fiscais_ida_e_volta():
+    doc = publish.read_binary(publish.encode_binary(FISCAIS))
+    assert (doc.kind, doc.year) == (publish.KIND_FISCAIS, 2026)
+    assert doc.digest == FISCAIS["meta"]["data_digest"].split(":")[1][:16]
+    assert doc["dep"] == 189.59 and doc["simplificado"] == 607.2
+    assert doc["b"] == 0.133145 and doc["selic"] == 15.0
+    assert doc.inss.shape == (4, 2) and doc.irrf.shape == (5, 3)
+    assert [tuple(doc.inss[i, k] for k in range(2)) for i in range(4)] == [
+        (r["limite"], r["aliquota"]) for r in FISCAIS["inss"]
+    ]
+    assert [doc.irrf[i, 2] for i in range(5)] == [r["deducao"] for r in FISCAIS["irrf"]["tabela"]]
+
+    compiled = compile_tables(FISCAIS)
+    tables = doc.tax_tables()
+    assert tables["inss"] == compiled.inss and tables["irrf"] == compiled.irrf
+
+
+def test_ausentes_viram_none():
+    sem_reducao = copy.deepcopy(FISCAIS)
+    del sem_reducao["irrf"]["reducao_mensal"]
+    del sem_reducao["taxas"]
+    doc = publish.read_binary(publish.encode_binary(sem_reducao))
+    assert doc.get("a") is None and doc.get("selic") is None and doc.get("desconhecido") is None
+    with pytest.raises(KeyError):
+        doc["isenta_ate"]
+    assert math.isnan(doc.values[publish.FISCAIS_SCALARS.index("reduz_ate")])
+
+
+def test_taxas_ida_e_volta():
+    doc = publish.read_binary(publish.encode_binary(TAXAS))
+    assert doc.kind == publish.KIND_TAXAS and doc.inss is None and doc.digest == "ab" * 8
+    assert doc["selic_diaria"] == 0.055131
+    assert doc.get("ipca_12m") is None and doc.get("cdi_aa") is None
+    with pytest.raises(RuntimeError):
+        doc.tax_tables()
+
+
+@pytest.mark.parametrize(
+    "mangle",
+    [
+        lambda b: b[:10],  # truncado no cabeçalho
+        lambda b: b[:-8],  # faltando um valor
+        lambda b: b"XXXX" + b[4:],  # magic
+        lambda b: b[:4] + bytes([9]) + b[5:],  # versão
+    ],
+)
+def test_binario_invalido(mangle):
+    with pytest.raises(RuntimeError):
+        publish.read_binary(mangle(publish.encode_binary(FISCAIS)))
+
+
+def test_write_published_grava_variantes_e_historico(tmp_path, monkeypatch):
+    monkeypatch.setattr(publish, "VARIANTS_ENABLED", True)
+    monkeypatch.setattr(history, "HISTORY_DIR", str(tmp_path / "versoes"))
+    path = str(tmp_path / "dados_fiscais.json")
+    publish.write_published(FISCAIS, path)
+
+    paths = publish.variant_paths(path)
+    assert publish.variants_present(path)
+    with open(paths["min"], "rb") as f:
+        minified = f.read()
+    assert json.loads(minified) == FISCAIS
+    with open(paths["gz"], "rb") as f:
+        assert gzip.decompress(f.read()) == minified
+    assert not any(name.endswith(".tmp") for name in os.listdir(tmp_path))
+
+    doc = publish.load_binary(paths["bin"])
+    assert doc["dep"] == 189.59 and doc.irrf[4, 1] == 0.275
+    assert history.last_entry(path)["version"] == 1
+
+    # bytes reprodutíveis: mesma entrada, mesmos .gz e .bin
+    again = publish.render_variants(FISCAIS)
+    with open(paths["gz"], "rb") as f:
+        assert f.read() == again["gz"]
+    with open(paths["bin"], "rb") as f:
+        assert f.read() == again["bin"]
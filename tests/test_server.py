@@ -0,0 +1,133 @@
+import gzip
+import http.client
+import json
+import os
+import threading
+
+import pytest
+
+from sanida import server
+from sanida.server import DocumentStore, resolve
+
+DADOS = {"ano": 2026, "dep": 189.59, "irrf": {"tabela": [{"limite": 2428.8}]}, "inss": [{"limite": 1621.0}]}
+TAXAS = {"taxas": {"selic": 15.0, "cdi": 14.9}}
+
+
+def write(path, doc):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(doc, f)
+    os.replace(tmp, path)
+
+
+@pytest.fixture
+def store(tmp_path):
+    write(tmp_path / "dados_fiscais.json", DADOS)
+    write(tmp_path / "taxas_bacen.json", TAXAS)
+    return DocumentStore(str(tmp_path))
+
+
+def body(rep):
+    return json.loads(rep.body) if rep is not None else None
+
+
+def test_resolucao_de_caminhos(store):
+    assert body(resolve(store, "/dados_fiscais.json")) == DADOS
+    assert body(resolve(store, "/taxas_bacen.json?x=1")) == TAXAS
+    assert body(resolve(store, "/taxas_bacen/taxas/selic")) == 15.0
+    assert body(resolve(store, "/dados_fiscais/irrf/tabela/0")) == {"limite": 2428.8}
+    # sem nome de documento: trecho de dados_fiscais
+    assert body(resolve(store, "/inss/0/limite")) == 1621.0
+    assert body(resolve(store, "/d%65p")) == 189.59
+    assert resolve(store, "/") is None
+    assert resolve(store, "/inss/5") is None
+    assert resolve(store, "/inss/x") is None
+    assert resolve(store, "/dados_fiscais.json/irrf") is None
+    # o mesmo trecho volta da cache do snapshot
+    assert resolve(store, "/irrf/tabela") is resolve(store, "/irrf/tabela")
+
+
+def test_refresh_troca_o_snapshot(store, tmp_path):
+    before = resolve(store, "/taxas_bacen.json")
+    assert store.refresh() == []
+    write(tmp_path / "taxas_bacen.json", {"taxas": {"selic": 14.75, "cdi": 14.65}})
+    assert store.refresh() == ["taxas_bacen"]
+    after = resolve(store, "/taxas_bacen.json")
+    assert body(after)["taxas"]["selic"] == 14.75 and after.etag != before.etag
+    # arquivo ilegível mantém o anterior
+    (tmp_path / "taxas_bacen.json").write_text("{quebrado", encoding="utf-8")
+    assert store.refresh() == []
+    assert resolve(store, "/taxas_bacen.json") is after
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, False),
+        ("gzip", True),
+        ("br, gzip;q=0.5", True),
+        ("gzip;q=0", False),
+        ("GZIP ; Q=0.0", False),
+        ("*", True),
+        ("*;q=0", False),
+        ("gzip;q=0, *", False),
+        ("identity", False),
+        ("x-gzip", True),
+    ],
+)
+def test_accept_encoding(header, expected):
+    assert server._accepts_gzip(header) is expected
+
+
+def test_if_none_match():
+    assert server._etag_matches('"a", "b"', '"b"')
+    assert server._etag_matches('W/"b"', '"b"')
+    assert server._etag_matches("*", '"b"')
+    assert not server._etag_matches('"b-gz"', '"b"')
+    assert not server._etag_matches(None, '"b"')
+
+
+@pytest.fixture
+def get(store):
+    httpd = server.make_server("127.0.0.1", 0, store)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+
+    def request(path, **headers):
+        conn = http.client.HTTPConnection("127.0.0.1", httpd.server_address[1], timeout=5)
+        conn.request("GET", path, headers=headers)
+        r = conn.getresponse()
+        data = r.read()
+        conn.close()
+        return r, data
+
+    yield request
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_etag_304_e_gzip(get):
+    r, data = get("/taxas_bacen/taxas")
+    assert r.status == 200 and json.loads(data) == TAXAS["taxas"]
+    etag = r.getheader("ETag")
+
+    r, data = get("/taxas_bacen/taxas", **{"If-None-Match": etag})
+    assert (r.status, data, r.getheader("ETag")) == (304, b"", etag)
+
+    r, data = get("/taxas_bacen/taxas", **{"Accept-Encoding": "gzip"})
+    assert r.getheader("Content-Encoding") == "gzip" and r.getheader("Vary") == "Accept-Encoding"
+    assert json.loads(gzip.decompress(data)) == TAXAS["taxas"]
+    gz_etag = r.getheader("ETag")
+    assert gz_etag != etag
+    # o ETag da versão sem compressão não vale para a comprimida
+    r, _ = get("/taxas_bacen/taxas", **{"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert r.status == 200
+    r, _ = get("/taxas_bacen/taxas", **{"Accept-Encoding": "gzip", "If-None-Match": gz_etag})
+    assert r.status == 304
+
+
+def test_404_e_indice(get, store):
+    r, data = get("/nada/aqui")
+    assert r.status == 404 and json.loads(data) == {"error": "not_found"}
+    r, data = get("/healthz")
+    index = json.loads(data)["documents"]
+    assert index == {name: store.get(name).full.etag for name in ("dados_fiscais", "taxas_bacen")}
@@ -0,0 +1,116 @@
+import os
+import datetime as dt
+
+import pytest
+
+from sanida import sgs_store
+from sanida.sgs_store import HEADER, RECORD, SeriesStore
+
+
+def d(day: str) -> dt.date:
+    return dt.date.fromisoformat(day)
+
+
+def test_append_ordena_descarta_repetidos_e_le(tmp_path):
+    store = SeriesStore(12, str(tmp_path))
+    assert len(store) == 0 and store.last() is None
+    dates, values = store.read()
+    assert len(dates) == 0 and len(values) == 0
+
+    added = store.append([(d("2024-01-03"), 0.05), (d("2024-01-02"), 0.04), (d("2024-01-03"), 9.0)])
+    assert added == 2  # fora de ordem é ordenado; data repetida entra uma vez
+    assert store.append([(d("2024-01-02"), 1.0), (d("2024-01-03"), 1.0)]) == 0
+    assert store.append([(d("2024-01-01"), 1.0), (d("2024-01-04"), 0.06)]) == 1
+
+    dates, values = store.read()
+    assert [dt.date.fromordinal(o) for o in dates] == [d("2024-01-02"), d("2024-01-03"), d("2024-01-04")]
+    assert list(values) == [0.04, 0.05, 0.06]
+    assert store.last() == (d("2024-01-04"), 0.06)
+    assert list(store)[0] == (d("2024-01-02"), 0.04)
+    assert len(store) == 3
+
+
+def test_registro_parcial_no_fim_e_descartado(tmp_path):
+    store = SeriesStore(12, str(tmp_path))
+    store.append([(d("2024-01-02"), 0.04)])
+    with open(store.path, "ab") as f:
+        f.write(b"\x01\x02\x03")  # gravação interrompida
+    assert len(store) == 1
+    store.append([(d("2024-01-03"), 0.05)])
+    assert len(store) == 2
+    assert os.path.getsize(store.path) == HEADER.size + 2 * RECORD.size
+
+
+def test_cabecalho_de_outra_serie_e_rejeitado(tmp_path):
+    SeriesStore(12, str(tmp_path)).append([(d("2024-01-02"), 0.04)])
+    other = SeriesStore(11, str(tmp_path))
+    other.path = SeriesStore(12, str(tmp_path)).path
+    with pytest.raises(RuntimeError, match="cabeçalho"):
+        other.last()
+    with pytest.raises(RuntimeError, match="cabeçalho"):
+        other.read()
+
+
+class FakeSGS:
+    """
+    SGS em memória: uma série diária e a lista de janelas pedidas.
+    """
+
+    def __init__(self, points, fail_status=None):
+        self.points = points
+        self.windows = []
+        self.fail_status = fail_status
+
+    def __call__(self, url):
+        q = dict(part.split("=", 1) for part in url.split("?", 1)[1].split("&"))
+        start = dt.datetime.strptime(q["dataInicial"], "%d/%m/%Y").date()
+        end = dt.datetime.strptime(q["dataFinal"], "%d/%m/%Y").date()
+        self.windows.append((start, end))
+        if self.fail_status:
+            return False, self.fail_status, "erro"
+        rows = [
+            {"data": day.strftime("%d/%m/%Y"), "valor": f"{value}".replace(".", ",")}
+            for day, value in self.points
+            if start <= day <= end
+        ]
+        if not rows:
+            return False, 404, "sem dados"  # como o SGS faz numa janela vazia
+        return True, 200, rows
+
+
+def test_sync_em_janelas_e_depois_so_o_delta(tmp_path, monkeypatch):
+    monkeypatch.setattr(sgs_store, "WINDOW_DAYS", 100)
+    monkeypatch.setitem(sgs_store.SERIES_START, 12, d("2024-01-01"))
+    start = d("2024-01-01")
+    points = [(start + dt.timedelta(days=i), 0.01 * i) for i in range(0, 250, 2)]
+    fake = FakeSGS(points)
+
+    summary = sgs_store.sync_series(12, fake, str(tmp_path), today=d("2024-09-06"))
+    assert fake.windows == [
+        (d("2024-01-01"), d("2024-04-09")),
+        (d("2024-04-10"), d("2024-07-18")),
+        (d("2024-07-19"), d("2024-09-06")),
+    ]
+    assert summary["points"] == len(points) and summary["requests"] == 3
+    assert summary["last_date"] == points[-1][0].isoformat()
+
+    # segunda execução: uma janela só, a partir do dia seguinte ao último ponto; 404 = nada novo
+    fake.windows.clear()
+    summary = sgs_store.sync_series(12, fake, str(tmp_path), today=d("2024-09-10"))
+    assert fake.windows == [(points[-1][0] + dt.timedelta(days=1), d("2024-09-10"))]
+    assert summary["added"] == 0 and summary["points"] == len(points)
+
+    # em dia: nenhuma requisição
+    fake.windows.clear()
+    assert sgs_store.sync_series(12, fake, str(tmp_path), today=points[-1][0])["requests"] == 0
+
+
+def test_falha_que_nao_e_404_levanta(tmp_path):
+    with pytest.raises(RuntimeError, match="status=500"):
+        sgs_store.sync_series(12, FakeSGS([], fail_status=500), str(tmp_path), today=d("1986-03-10"))
+
+
+def test_parse_points():
+    assert sgs_store.parse_points([{"data": "02/01/2024", "valor": "0,043739"}]) == [(d("2024-01-02"), 0.043739)]
+    with pytest.raises(RuntimeError):
+        sgs_store.parse_points({"erro": "x"})
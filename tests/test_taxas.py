@@ -0,0 +1,49 @@
+import datetime as dt
+
+from sanida import cassette, sgs_store, taxas
+
+
+def test_sync_sgs_history_pula_series_em_dia(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # SeriesStore usa o SGS_DIR padrão (relativo)
+    monkeypatch.setattr(taxas, "SGS_HISTORY_SERIES", [11, 12])
+    monkeypatch.setattr(cassette, "today", lambda: dt.date(2024, 6, 10))  # segunda-feira
+    # 11 já tem a sexta-feira anterior; 12 está atrasada
+    sgs_store.SeriesStore(11).append([(dt.date(2024, 6, 7), 0.04)])
+    sgs_store.SeriesStore(12).append([(dt.date(2024, 6, 5), 0.04)])
+
+    calls = []
+
+    def fake_sync(code, fetch_json, directory=None, today=None):
+        calls.append((code, today))
+        return {"points": 2, "added": 1, "requests": 1, "last_date": "2024-06-07"}
+
+    monkeypatch.setattr(sgs_store, "sync_series", fake_sync)
+    summary, warnings = taxas.sync_sgs_history()
+    assert calls == [(12, dt.date(2024, 6, 10))]
+    assert summary["11"]["skipped"] and summary["11"]["requests"] == 0
+    assert summary["12"]["added"] == 1 and warnings == []
+
+
+def test_falha_de_serie_vira_warning(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(taxas, "SGS_HISTORY_SERIES", [11])
+
+    def boom(*args, **kwargs):
+        raise RuntimeError("BCB fora")
+
+    monkeypatch.setattr(sgs_store, "sync_series", boom)
+    summary, warnings = taxas.sync_sgs_history()
+    assert summary == {} and warnings == ["sgs_history:11:BCB fora"]
+
+
+def test_serie_opcional_que_falhou_mantem_valor_anterior():
+    extras = {"cdi_diario": 0.05}
+    ok = {"ok": True, "error": None}
+    sgs = {s.key: dict(ok) if s.key in ("selic", "cdi_diario") else {"ok": False, "error": "timeout"} for s in taxas.SGS_SERIES}
+    previous = {"selic": 15.0, "selic_aa": 14.9, "cdi_aa": 999.0, "ipca_12m": "x", "cdi_diario": 0.04}
+
+    warnings = taxas.carry_forward_extras(extras, sgs, previous)
+    # valor novo prevalece; anterior fora de faixa ou não numérico não é reaproveitado
+    assert extras == {"cdi_diario": 0.05, "selic_aa": 14.9}
+    assert sgs["selic_aa"]["carried_forward"] is True
+    assert warnings == ["sgs:1178:valor_anterior_mantido:timeout"]